@@ -0,0 +1,68 @@
+"""Benchmark JsonView rendering on deep and wide documents
+
+Usage: python benchmarks/bench_json_view.py
+
+Renders a deeply nested object and a wide array of records in eager, lazy
+and paged modes and prints render time, HTML size and the number of
+collapsible nodes emitted (each carries a data-level attribute, so the page
+script can expand or collapse a level without walking the DOM). Keep the
+fixtures unchanged so numbers stay comparable across revisions.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataviewer.components import JsonView  # noqa: E402
+
+
+def deep_json(depth=5000):
+    """An object nested depth levels deep with a few scalars on every level"""
+    data = node = {}
+    for i in range(depth):
+        node["id"] = i
+        node["name"] = f"node-{i}"
+        node["child"] = {}
+        node = node["child"]
+    node["leaf"] = True
+    return data
+
+
+def wide_json(width=100_000):
+    """An array of width small records"""
+    return [
+        {"id": i, "name": f"item-{i}", "tags": ["a", "b"], "score": i * 0.5}
+        for i in range(width)
+    ]
+
+
+def time_render(data, repeat=3, **kwargs):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = JsonView(data, **kwargs).to_html()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(html), html.count("data-level=")
+
+
+def main():
+    fixtures = [("deep", deep_json()), ("wide", wide_json())]
+    modes = [
+        ("eager", {"page_size": None}),
+        ("lazy", {"lazy": True, "page_size": None}),
+        ("paged", {"page_size": 100}),
+        ("lazy+paged", {"lazy": True, "page_size": 100}),
+    ]
+    print(f"{'fixture':>8s} {'mode':>11s} {'time':>10s} {'html':>12s} {'nodes':>8s}")
+    for name, data in fixtures:
+        for mode, kwargs in modes:
+            elapsed, size, nodes = time_render(data, **kwargs)
+            print(
+                f"{name:>8s} {mode:>11s} {elapsed * 1e3:8.1f}ms {size:>12,d} {nodes:>8,d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
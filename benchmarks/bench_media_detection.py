@@ -0,0 +1,38 @@
+"""Benchmark media detection on large string cells
+
+Usage: python benchmarks/bench_media_detection.py
+
+Times CellRendererRegistry.get_renderer on strings from 1 KB to 10 MB. With
+bounded probing the per-call time should stay flat as the size grows.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataviewer.components import Table  # noqa: E402,F401  registers the default renderers
+from dataviewer.renderers import CellRendererRegistry  # noqa: E402
+
+
+def time_detection(value, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        CellRendererRegistry.get_renderer(value)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print(f"{'size':>10s} {'text':>10s} {'path':>10s} {'base64':>10s}")
+    for size in [1_000, 100_000, 1_000_000, 10_000_000]:
+        cases = [
+            "lorem ipsum " * (size // 12),
+            "a" * size + ".png",
+            "iVBORw0KGgo" + "A" * size,
+        ]
+        timings = [time_detection(value) * 1e6 for value in cases]
+        print(f"{size:>10d} " + " ".join(f"{t:8.2f}us" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
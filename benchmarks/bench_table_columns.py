@@ -0,0 +1,30 @@
+"""Benchmark column inference on wide tables
+
+Usage: python benchmarks/bench_table_columns.py
+
+Times Table construction for list-of-dict data with 100 to 1000 keys per row.
+Column inference is linear in rows x columns, so the time per cell should
+stay flat as the tables get wider.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataviewer.components import Table  # noqa: E402
+
+
+def main(n_rows=2000):
+    print(f"{'columns':>8s} {'total':>10s} {'per cell':>10s}")
+    for n_cols in [100, 300, 1000]:
+        keys = ["col_%d" % i for i in range(n_cols)]
+        data = [dict.fromkeys(keys, 1) for _ in range(n_rows)]
+        start = time.perf_counter()
+        Table(data=data)
+        elapsed = time.perf_counter() - start
+        print(f"{n_cols:>8d} {elapsed * 1e3:8.1f}ms {elapsed / (n_rows * n_cols) * 1e9:8.1f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark the per-cell cost of building <td> opening tags
+
+Usage: python benchmarks/bench_table_templates.py
+
+Compares assembling each cell's class list and width style on the fly with
+looking up the templates that Table precompiles once per render, and prints
+the per-cell overhead of both.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataviewer.components import Table  # noqa: E402
+
+
+def main():
+    table = Table(data=[{"a": 1}])
+    base_cell_classes = Table._CELL_BASE_CLASSES
+    templates = table._compile_cell_templates(base_cell_classes)
+    col_types = ["default", "long_text", "json", "image"] * 250
+
+    def per_cell_assembly():
+        for i in range(2):
+            for col_type in col_types:
+                cell_classes = base_cell_classes.copy()
+                if table.striped and i % 2 == 1:
+                    cell_classes.append("bg-gray-50")
+                if table.hoverable:
+                    cell_classes.append("hover:bg-gray-100")
+                width_style = table.get_cell_style(col_type)
+                "<td class=\"%s\" %s>%s</td>" % (" ".join(cell_classes), width_style, "x")
+
+    def precompiled():
+        for i in range(2):
+            parity = i % 2
+            for col_type in col_types:
+                "".join((templates[parity, col_type], "x", "</td>"))
+
+    n_cells = 2 * len(col_types)
+    for name, func in [("per-cell", per_cell_assembly), ("precompiled", precompiled)]:
+        per_cell = min(timeit.repeat(func, number=20, repeat=5)) / (20 * n_cells)
+        print(f"{name:>12s} {per_cell * 1e9:8.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark Table rendering with a process pool
+
+Usage: python benchmarks/bench_table_workers.py [rows]
+
+Renders the same table with workers=1, 2, 4, ... up to the number of CPU
+cores and prints the wall time and speedup for each setting.
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataviewer.components import Table  # noqa: E402
+
+
+def make_rows(n_rows):
+    return [
+        {
+            "id": i,
+            "name": f"sample-{i}",
+            "score": i * 0.37,
+            "prompt": "The quick brown fox jumps over the lazy dog. " * 4,
+            "meta": {"split": "eval", "index": i, "tags": ["a", "b", "c"]},
+            "image": f"images/{i}.jpg",
+        }
+        for i in range(n_rows)
+    ]
+
+
+def render(rows, workers):
+    table = Table(data=rows, workers=workers, chunk_size=2000, id="bench")
+    start = time.perf_counter()
+    table.write_html(io.StringIO())
+    return time.perf_counter() - start
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = make_rows(n_rows)
+    cpu_count = os.cpu_count() or 1
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= cpu_count:
+        worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"{n_rows} rows, {cpu_count} CPUs")
+    baseline = None
+    for workers in worker_counts:
+        elapsed = render(rows, workers)
+        baseline = baseline or elapsed
+        print(f"workers={workers:<3d} {elapsed:8.2f}s  speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,73 @@
+import contextlib
+import functools
+import io
+import itertools
 from abc import ABC
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import ClassVar, Dict, List, Optional
+from typing import Any, Callable, ClassVar, Dict, List, Optional, TextIO
+
+_render_cache = None
+_render_tokens = itertools.count(1)
+
+
+def _get_render_cache():
+    """所有组件共享的渲染结果缓存，按容量淘汰最久未使用的条目"""
+    global _render_cache
+    if _render_cache is None:
+        # core 包会导入本模块，这里延迟导入以避免循环导入
+        from ..core.cache import LRUCache
+
+        _render_cache = LRUCache(maxsize=1024)
+    return _render_cache
+
+
+def _cached_render_method(name: str, method: Callable) -> Callable:
+    """包装组件的 write_html / to_html：开启 render_cache 的组件命中缓存时直接输出
+
+    只有最外层的调用（即类上实际解析到的方法）才查缓存，
+    子类通过 super() 调用父类实现时不会把父类的输出当作自己的结果。
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.render_cache or getattr(type(self), name) is not wrapper:
+            return method(self, *args, **kwargs)
+
+        from ..core.assets import AssetStore, referenced_assets
+
+        store = AssetStore.current()
+        key = (name, self._render_state(), store.mode if store is not None else None)
+        cache = _get_render_cache()
+        entry = cache.get(key)
+        if entry is None:
+            # 记录渲染期间登记的资源（包括页面中已输出过的），缓存命中时重新登记
+            recording = store.record() if store is not None else contextlib.nullcontext({})
+            with recording as recorded:
+                if name == "to_html":
+                    html = method(self, *args, **kwargs)
+                else:
+                    buffer = io.StringIO()
+                    method(self, buffer)
+                    html = buffer.getvalue()
+            assets = tuple(
+                (asset, *recorded[asset])
+                for asset in dict.fromkeys(referenced_assets(html))
+                if asset in recorded
+            )
+            cache.put(key, (html, assets))
+        else:
+            html, assets = entry
+            if assets:
+                store.add_entries(assets)
+
+        if name == "to_html":
+            return html
+        out = args[0] if args else kwargs["out"]
+        out.write(html)
+
+    wrapper._render_cached = True
+    return wrapper
 
 
 class ComponentContext:
@@ -49,9 +115,65 @@ class ComponentContext:
 
 
 class Component:
-    """组件基类"""
+    """组件基类
+
+    渲染缓存：把 render_cache 设为 True（类属性或实例属性均可）后，
+    组件的渲染结果会存入全局的 LRU 缓存，组件未变化时再次渲染直接复用。
+    给组件属性赋值会自动标记组件为已修改；原地修改可变属性（如向 data 列表追加行）后
+    需要调用 mark_dirty()。容器的缓存键包含子组件的状态，子组件变化时容器同样失效。
+    """
 
     _id_counter: ClassVar[Dict[str, int]] = defaultdict(int)  # 每个组件类型的计数器
+    render_cache: ClassVar[bool] = False  # 是否缓存渲染结果
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in ("write_html", "to_html"):
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "_render_cached", False):
+                setattr(cls, name, _cached_render_method(name, method))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # 下划线开头的属性是内部状态（如派生数据的缓存），不影响渲染结果
+        if not name.startswith("_"):
+            self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """标记组件已修改，使其缓存的渲染结果失效"""
+        state = self.__dict__
+        state["_render_version"] = state.get("_render_version", 0) + 1
+
+    def _render_state(self) -> tuple:
+        """组件及其子组件当前状态的标识，作为渲染缓存键的一部分"""
+        state = self.__dict__
+        token = state.get("_render_token")
+        if token is None:
+            token = state["_render_token"] = next(_render_tokens)
+        children = getattr(self, "children", None) or ()
+        return (
+            token,
+            state.get("_render_version", 0),
+            tuple(
+                child._render_state() if isinstance(child, Component) else id(child)
+                for child in children
+            ),
+        )
+
+    @staticmethod
+    def render_cache_info() -> Dict[str, int]:
+        """渲染缓存的命中/未命中/淘汰计数"""
+        return _get_render_cache().stats()
+
+    @staticmethod
+    def set_render_cache_size(maxsize: int) -> None:
+        """调整渲染缓存的容量"""
+        _get_render_cache().resize(maxsize)
+
+    @staticmethod
+    def clear_render_cache() -> None:
+        """清空渲染缓存"""
+        _get_render_cache().clear()
 
     def __init__(self, id: Optional[str] = None, **kwargs):
         """初始化组件
@@ -97,8 +219,23 @@ class Component:
         return self._id
 
     def to_html(self) -> str:
-        """将组件渲染为HTML"""
-        raise NotImplementedError("Subclass must implement to_html method")
+        """将组件渲染为HTML
+
+        实现了 write_html 的子类无需重写此方法，这里会把流式输出收集为字符串。
+        """
+        if type(self).write_html is Component.write_html:
+            raise NotImplementedError("Subclass must implement to_html method")
+        buffer = io.StringIO()
+        self.write_html(buffer)
+        return buffer.getvalue()
+
+    def write_html(self, out: TextIO) -> None:
+        """将组件的HTML流式写入 out
+
+        Args:
+            out: 任意带 write 方法的文本流，如文件、gzip 文件或 io.StringIO
+        """
+        out.write(self.to_html())
 
     def __enter__(self):
         """进入上下文"""
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, TextIO
 
 from .base import Component
 
@@ -26,16 +26,28 @@ class Container(Component):
         if component not in self.children:  # Avoid duplicate additions
             self.children.append(component)
 
-    def to_html(self) -> str:
-        if not self.children:
-            return ""
-        children_html = "\n".join(child.to_html() for child in (self.children or []))
-        classes = [f"space-y-{self.gap}", f"p-{self.padding}", f"m-{self.margin}"]
-        return f"""
+    def _write_children(self, out: TextIO, classes: List[str]) -> None:
+        """Write the wrapper div and stream each child into it"""
+        out.write(
+            f"""
         <div id="{self.id}" class="{' '.join(classes)}">
-            {children_html}
+            """
+        )
+        for i, child in enumerate(self.children):
+            if i:
+                out.write("\n")
+            child.write_html(out)
+        out.write(
+            """
         </div>
         """
+        )
+
+    def write_html(self, out: TextIO) -> None:
+        if not self.children:
+            return
+        classes = [f"space-y-{self.gap}", f"p-{self.padding}", f"m-{self.margin}"]
+        self._write_children(out, classes)
 
 
 """Horizontal flex layout"""
@@ -61,9 +73,9 @@ class FlexRow(Container):
         self.wrap = wrap
         super().__init__(id=id, padding=padding, margin=margin, **kwargs)
 
-    def to_html(self) -> str:
+    def write_html(self, out: TextIO) -> None:
         if not self.children:
-            return ""
+            return
 
         justify_map = {
             "start": "justify-start",
@@ -92,12 +104,7 @@ class FlexRow(Container):
         if self.wrap:
             classes.append("flex-wrap")
 
-        children_html = "\n".join(child.to_html() for child in self.children)
-        return f"""
-        <div id="{self.id}" class="{' '.join(classes)}">
-            {children_html}
-        </div>
-        """
+        self._write_children(out, classes)
 
 
 """Vertical flex layout"""
@@ -120,9 +127,9 @@ class FlexColumn(Container):
         self.align = align
         super().__init__(id=id, padding=padding, margin=margin, **kwargs)
 
-    def to_html(self) -> str:
+    def write_html(self, out: TextIO) -> None:
         if not self.children:
-            return ""
+            return
 
         justify_map = {
             "start": "justify-start",
@@ -149,12 +156,7 @@ class FlexColumn(Container):
             f"m-{self.margin}",
         ]
 
-        children_html = "\n".join(child.to_html() for child in self.children)
-        return f"""
-        <div id="{self.id}" class="{' '.join(classes)}">
-            {children_html}
-        </div>
-        """
+        self._write_children(out, classes)
 
 
 """Grid layout"""
@@ -180,9 +182,9 @@ class Grid(Container):
         self.gap = gap
         super().__init__(id=id, padding=padding, margin=margin, **kwargs)
 
-    def to_html(self) -> str:
+    def write_html(self, out: TextIO) -> None:
         if not self.children:
-            return ""
+            return
 
         classes = [
             "grid",
@@ -195,9 +197,4 @@ class Grid(Container):
         if self.rows:
             classes.append(f"grid-rows-{self.rows}")
 
-        children_html = "\n".join(child.to_html() for child in self.children)
-        return f"""
-        <div id="{self.id}" class="{' '.join(classes)}">
-            {children_html}
-        </div>
-        """
+        self._write_children(out, classes)
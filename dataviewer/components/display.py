@@ -1,28 +1,17 @@
 from dataclasses import dataclass, field
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, TextIO
 
 from ..renderers import CellRendererRegistry
 from .base import Component, LabeledComponent
 
 
-def cached_render(func):
-    """渲染结果缓存装饰器"""
-    cache = {}
-
-    def wrapper(self, *args, **kwargs):
-        key = (self.id, str(self.__dict__))
-        if key not in cache:
-            cache[key] = func(self, *args, **kwargs)
-        return cache[key]
-
-    return wrapper
-
-
 @dataclass
 class Header(Component):
     """标题组件"""
 
+    render_cache: ClassVar[bool] = True
+
     text: str
     level: int = 1  # h1-h6
     align: str = "left"  # left, center, right
@@ -71,8 +60,7 @@ class Header(Component):
                 f"不支持的颜色: {self.color}，支持的颜色有: {', '.join(self._COLOR_MAP.keys())}"
             )
 
-    @cached_render
-    def to_html(self) -> str:
+    def write_html(self, out: TextIO) -> None:
         classes = [
             self._ALIGN_MAP.get(self.align, "text-left"),
             self._SIZE_MAP.get(self.level, "text-base"),
@@ -81,12 +69,9 @@ class Header(Component):
         ]
 
         class_str = " ".join(classes)
-        return '<h%d id="%s" class="%s">%s</h%d>' % (
-            self.level,
-            self.id,
-            class_str,
-            self.text,
-            self.level,
+        out.write(
+            '<h%d id="%s" class="%s">%s</h%d>'
+            % (self.level, self.id, class_str, self.text, self.level)
         )
 
 
@@ -94,6 +79,8 @@ class Header(Component):
 class Tag(Component):
     """标签组件"""
 
+    render_cache: ClassVar[bool] = True
+
     text: str
     color: str = "blue"
     size: str = "md"
@@ -123,12 +110,11 @@ class Tag(Component):
         self.size = size
         super().__init__(id=id)
 
-    @cached_render
-    def to_html(self) -> str:
+    def write_html(self, out: TextIO) -> None:
         classes = self._BASE_CLASSES + [
             self._COLOR_MAP.get(self.color, "bg-gray-100 text-gray-800"),
             self._SIZE_MAP.get(self.size, "text-sm px-3 py-1.5"),
         ]
 
         class_str = " ".join(classes)
-        return '<span id="%s" class="%s">%s</span>' % (self.id, class_str, self.text)
+        out.write('<span id="%s" class="%s">%s</span>' % (self.id, class_str, self.text))
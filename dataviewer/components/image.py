@@ -1,9 +1,15 @@
+import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, TextIO
 
+from ..core.assets import AssetStore
 from ..core.page import Page
+from ..renderers.image_probe import image_size
+from ..renderers.thumbnails import ThumbnailCache
 from .base import Component
 
+_BASE64_DATA_URI = re.compile(r"data:([\w.+-]+/[\w.+-]+);base64,")
+
 
 """Image Component"""
 
@@ -15,6 +21,8 @@ class Image(Component):
     alt: str = ""  # Alternative text
     css_class: str = ""  # CSS class name
     lazy_load: bool = True  # Enable lazy loading
+    thumbnails: Optional[ThumbnailCache] = None  # Show a downsized copy of local images
+    probe_size: bool = True  # Emit intrinsic width/height read from the image header
 
     def __init__(self, id: Optional[str] = None, **kwargs):
         super().__init__(id=id, **kwargs)
@@ -86,7 +94,7 @@ class Image(Component):
                     const previewImg = document.getElementById('previewImage');
                     
                     window.openImagePreview = function(img) {
-                        previewImg.src = img.src;
+                        previewImg.src = img.dataset.full || img.src;
                         modal.classList.add('active');
                     };
                     
@@ -98,7 +106,7 @@ class Image(Component):
             """
             )
 
-    def to_html(self) -> str:
+    def write_html(self, out: TextIO) -> None:
         # 处理样式
         style = []
         if self.width:
@@ -106,6 +114,26 @@ class Image(Component):
         if self.height:
             style.append(f"height: {self.height}px")
 
+        data_uri = _BASE64_DATA_URI.match(self.src)
+
+        # 只读取图片头部得到固有尺寸，浏览器在图片加载前即可确定布局
+        size_attr = ""
+        size = None
+        if self.probe_size and not (self.width and self.height):
+            if data_uri:
+                size = image_size(self.src[data_uri.end():], is_base64=True)
+            else:
+                size = image_size(self.src)
+        if size:
+            width, height = size
+            size_attr = f' width="{width}" height="{height}"'
+            if self.width:
+                style.append("height: auto")
+            elif self.height:
+                style.append("width: auto")
+            # "auto" 让图片加载后以其实际比例为准
+            style.append(f"aspect-ratio: auto {width} / {height}")
+
         style_attr = f' style="{"; ".join(style)}"' if style else ""
 
         # 处理类名
@@ -118,4 +146,17 @@ class Image(Component):
         # 添加懒加载属性
         loading_attr = ' loading="lazy"' if self.lazy_load else ""
 
-        return f'<img src="{self.src}" class="cell-image" onclick="openImagePreview(this)" alt="{self.alt}"{style_attr}{class_attr}{loading_attr}>'
+        # 页面渲染时，base64 data URI 交给页面资源表，相同内容只输出一次
+        src_attr = f'src="{self.src}"'
+        thumbnail = self.thumbnails.thumbnail(self.src) if self.thumbnails else None
+        if thumbnail is not None:
+            # 预览弹窗中打开原图
+            src_attr = f'src="{thumbnail}" data-full="{self.src}"'
+        store = AssetStore.current()
+        if data_uri and store is not None and thumbnail is None:
+            src_attr = store.src_attr(self.src[data_uri.end():], data_uri.group(1))
+
+        out.write(
+            f'<img {src_attr}{size_attr} class="cell-image" onclick="openImagePreview(this)" '
+            f'alt="{self.alt}"{style_attr}{class_attr}{loading_attr}>'
+        )
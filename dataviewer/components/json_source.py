@@ -0,0 +1,342 @@
+import codecs
+import json
+import mmap
+import re
+from typing import Any, Iterator, List, Optional, TextIO, Tuple
+
+# 结构字符：括号和引号，结构地跳过容器时只需要看这些字符
+_STRUCTURE = re.compile(rb'[\[\]{}"]')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR = re.compile(rb"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_TEXT_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_TEXT_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# 输出子树时每次从文件读取的字节数
+_CHUNK_SIZE = 1 << 20
+
+# 跳过条目时每次解码的窗口大小，窗口内放不下一个条目时按 4 倍逐步扩大
+_DECODE_WINDOW = 1 << 16
+_MAX_DECODE_WINDOW = 1 << 22
+
+
+class JsonRef:
+    """JSON 文件中尚未解析的一段数据，只记录字节偏移
+
+    kind 为 "object" 或 "array"，count 是其直接子项的数量。
+    bare 为 True 时 [start, end) 只包含容器内的部分条目（不含括号），
+    用于分页时记录容器中未解析的剩余条目。
+    """
+
+    __slots__ = ("path", "start", "end", "kind", "count", "bare")
+
+    def __init__(
+        self, path: str, start: int, end: int, kind: str, count: int, bare: bool = False
+    ):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.kind = kind
+        self.count = count
+        self.bare = bare
+
+    def __repr__(self) -> str:
+        return "JsonRef(%r, %d, %d, %r, count=%d)" % (
+            self.path,
+            self.start,
+            self.end,
+            self.kind,
+            self.count,
+        )
+
+    def _brackets(self) -> Tuple[str, str]:
+        if not self.bare:
+            return "", ""
+        return ("{", "}") if self.kind == "object" else ("[", "]")
+
+    def _iter_text(self) -> Iterator[str]:
+        """按块读取并解码这段数据"""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with open(self.path, "rb") as file:
+            file.seek(self.start)
+            remaining = self.end - self.start
+            while remaining > 0:
+                chunk = file.read(min(_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ValueError(f"JSON 文件 {self.path} 在读取时被截断")
+                remaining -= len(chunk)
+                yield decoder.decode(chunk, final=remaining <= 0)
+
+    def load(self) -> Any:
+        """解析并返回这段数据对应的 Python 对象"""
+        opening, closing = self._brackets()
+        return json.loads(opening + "".join(self._iter_text()) + closing)
+
+    def write_json(self, out: TextIO) -> None:
+        """把这段数据作为 JSON 流式写入可以放进 <script> 标签的输出中"""
+        opening, closing = self._brackets()
+        out.write(opening)
+        for text in self._iter_text():
+            out.write(text.replace("<", "\\u003c"))
+        out.write(closing)
+
+
+class JsonFileDict(dict):
+    """从文件部分解析的对象，remainder 按页记录分页后未解析的剩余条目"""
+
+    remainder: Optional[List[JsonRef]] = None
+
+
+class JsonFileList(list):
+    """从文件部分解析的数组，remainder 按页记录分页后未解析的剩余条目"""
+
+    remainder: Optional[List[JsonRef]] = None
+
+
+class JsonFileScanner:
+    """在内存映射的 JSON 文件上按需解析
+
+    只有层级不超过 max_level 的容器会被解析为 Python 对象，且每个容器最多解析
+    page_size 个条目；更深的子树和剩余条目只用正则跳过并记录为 JsonRef，
+    内存占用只与解析出的部分成正比。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._decoder = json.JSONDecoder()
+
+    def load(self, max_level: int, page_size: Optional[int] = None) -> Any:
+        """解析文件，返回可以交给 JsonView 渲染的数据"""
+        with open(self.path, "rb") as file:
+            if file.seek(0, 2) == 0:
+                raise ValueError(f"JSON 文件 {self.path} 为空")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                self._buffer = buffer
+                try:
+                    return self._parse(max_level, page_size or 0)
+                finally:
+                    self._buffer = None
+
+    def _skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self._buffer, pos).end()
+
+    def _error(self, message: str, pos: int) -> ValueError:
+        return ValueError(f"无效的 JSON 文件 {self.path}：{message}（字节偏移 {pos}）")
+
+    def _expect(self, pos: int, char: bytes) -> int:
+        """跳过空白后要求下一个字符是 char，返回其后的位置"""
+        pos = self._skip_whitespace(pos)
+        if self._buffer[pos : pos + 1] != char:
+            raise self._error(f"缺少 {char.decode()}", pos)
+        return pos + 1
+
+    def _skip_value(self, pos: int) -> int:
+        """只看结构字符跳过 pos 处的值，返回其后的位置"""
+        buffer = self._buffer
+        char = buffer[pos : pos + 1]
+        if char in (b"{", b"["):
+            return self._skip_container(pos)
+        match = (_STRING if char == b'"' else _SCALAR).match(buffer, pos)
+        if match is None:
+            raise self._error("无法识别的值", pos)
+        return match.end()
+
+    def _skip_container(self, pos: int) -> int:
+        """只看括号和字符串跳过 pos 处的容器，返回闭合括号之后的位置"""
+        buffer = self._buffer
+        depth = 0
+        search = _STRUCTURE.search
+        while True:
+            match = search(buffer, pos)
+            if match is None:
+                raise self._error("数据意外结束", len(buffer))
+            char = match.group()
+            index = match.start()
+            if char == b'"':
+                string = _STRING.match(buffer, index)
+                if string is None:
+                    raise self._error("字符串未闭合", index)
+                pos = string.end()
+                continue
+            if char in (b"[", b"{"):
+                depth += 1
+            elif char in (b"]", b"}"):
+                depth -= 1
+                if depth == 0:
+                    return index + 1
+            pos = index + 1
+
+    def _decode_entries(
+        self, text: str, is_object: bool, count: int, truncated: bool, limit: int
+    ) -> Tuple[int, int, bool]:
+        """用 C 实现的 JSON 解码器跳过 text 中完整的条目，最多跳过 limit 个（0 为不限）
+
+        Returns:
+            (最后一个完整条目之后的下标, 跳过的条目数, 是否遇到了闭合括号)，
+            闭合括号的情况下下标指向闭合括号
+        """
+        closing = "}" if is_object else "]"
+        raw_decode = self._decoder.raw_decode
+        consumed = 0
+        skipped = 0
+        try:
+            while not limit or skipped < limit:
+                index = _TEXT_WHITESPACE.match(text, consumed).end()
+                if text[index] == closing:
+                    return index, skipped, True
+                if count + skipped:
+                    if text[index] != ",":
+                        break
+                    index = _TEXT_WHITESPACE.match(text, index + 1).end()
+                if is_object:
+                    key = _TEXT_STRING.match(text, index)
+                    if key is None:
+                        break
+                    index = _TEXT_WHITESPACE.match(text, key.end()).end()
+                    if text[index] != ":":
+                        break
+                    index = _TEXT_WHITESPACE.match(text, index + 1).end()
+                _, index = raw_decode(text, index)
+                # 条目恰好在窗口末尾结束时，可能是被截断的数字
+                if truncated and index == len(text):
+                    break
+                consumed = index
+                skipped += 1
+        except (IndexError, ValueError, RecursionError):
+            pass
+        return consumed, skipped, False
+
+    def _scan_entries(
+        self, pos: int, kind: str, limit: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """从 pos 开始跳过容器内剩余的条目，给出 limit 时最多跳过 limit 个
+
+        文件按窗口解码后交给 C 实现的 JSON 解码器逐个跳过条目；
+        单个条目超过 _MAX_DECODE_WINDOW 时退回到只看结构字符的正则扫描，内存占用保持有界。
+
+        Returns:
+            (闭合括号的位置或第 limit 个条目之后的位置, 跳过的条目数)
+        """
+        buffer = self._buffer
+        is_object = kind == "object"
+        count = 0
+        size = _DECODE_WINDOW
+        while True:
+            if limit and count == limit:
+                return pos, count
+            text = buffer[pos : pos + size].decode("utf-8", "surrogateescape")
+            truncated = pos + size < len(buffer)
+            consumed, skipped, closed = self._decode_entries(
+                text, is_object, count, truncated, (limit - count) if limit else 0
+            )
+            count += skipped
+            if consumed:
+                if text.isascii():
+                    pos += consumed
+                else:
+                    pos += len(text[:consumed].encode("utf-8", "surrogateescape"))
+            if closed:
+                return pos, count
+            if skipped:
+                size = _DECODE_WINDOW
+                continue
+            if truncated and size < _MAX_DECODE_WINDOW:
+                size *= 4
+                continue
+
+            # 窗口内放不下一个完整的条目，逐个字符结构地跳过它
+            pos = self._skip_whitespace(pos)
+            if buffer[pos : pos + 1] == (b"}" if is_object else b"]"):
+                return pos, count
+            if count:
+                pos = self._skip_whitespace(self._expect(pos, b","))
+            if is_object:
+                key = _STRING.match(buffer, pos)
+                if key is None:
+                    raise self._error("缺少字段名", pos)
+                pos = self._skip_whitespace(self._expect(key.end(), b":"))
+            pos = self._skip_value(pos)
+            count += 1
+            size = _DECODE_WINDOW
+
+    def _parse_value(self, pos: int, level: int, max_level: int) -> Tuple[Any, int, bool]:
+        """解析 pos 处的值
+
+        Returns:
+            (值, 值之后的位置, 是否是需要继续填充条目的容器)
+        """
+        buffer = self._buffer
+        char = buffer[pos : pos + 1]
+        if char in (b"{", b"["):
+            kind = "object" if char == b"{" else "array"
+            if level <= max_level:
+                container = JsonFileDict() if kind == "object" else JsonFileList()
+                return container, pos + 1, True
+            close, count = self._scan_entries(pos + 1, kind)
+            if count == 0:
+                return ({} if kind == "object" else []), close + 1, False
+            return JsonRef(self.path, pos, close + 1, kind, count), close + 1, False
+        if char == b'"':
+            match = _STRING.match(buffer, pos)
+            if match is None:
+                raise self._error("字符串未闭合", pos)
+        else:
+            match = _SCALAR.match(buffer, pos)
+            if match is None:
+                raise self._error("无法识别的值", pos)
+        return json.loads(match.group()), match.end(), False
+
+    def _scan_pages(self, pos: int, is_object: bool, page_size: int) -> List[JsonRef]:
+        """把容器中从 pos 开始的剩余条目按每页 page_size 个记录为 JsonRef
+
+        每页单独输出到页面中，浏览器只需在加载到该页时解析它。
+        """
+        kind = "object" if is_object else "array"
+        closing = b"}" if is_object else b"]"
+        pages = []
+        while True:
+            end, count = self._scan_entries(pos, kind, page_size)
+            pages.append(JsonRef(self.path, pos, end, kind, count, bare=True))
+            end = self._skip_whitespace(end)
+            if self._buffer[end : end + 1] == closing:
+                return pages
+            pos = self._skip_whitespace(self._expect(end, b","))
+
+    def _parse(self, max_level: int, page_size: int) -> Any:
+        """用显式栈解析，嵌套层级不受 Python 递归上限的限制"""
+        buffer = self._buffer
+        pos = self._skip_whitespace(3 if buffer[:3] == codecs.BOM_UTF8 else 0)
+        root, pos, is_container = self._parse_value(pos, 0, max_level)
+        # 栈中每一帧是 [容器, 层级, 已解析的条目数]
+        stack = [[root, 0, 0]] if is_container else []
+        while stack:
+            frame = stack[-1]
+            container, level, parsed = frame
+            is_object = isinstance(container, dict)
+            pos = self._skip_whitespace(pos)
+            if buffer[pos : pos + 1] == (b"}" if is_object else b"]"):
+                pos += 1
+                stack.pop()
+                continue
+            if parsed:
+                pos = self._skip_whitespace(self._expect(pos, b","))
+            if page_size and parsed == page_size:
+                container.remainder = self._scan_pages(pos, is_object, page_size)
+                pos = self._skip_whitespace(container.remainder[-1].end) + 1
+                stack.pop()
+                continue
+
+            if is_object:
+                key = _STRING.match(buffer, pos)
+                if key is None:
+                    raise self._error("缺少字段名", pos)
+                pos = self._skip_whitespace(self._expect(key.end(), b":"))
+            value, pos, is_container = self._parse_value(pos, level + 1, max_level)
+            if is_object:
+                container[json.loads(key.group())] = value
+            else:
+                container.append(value)
+            frame[2] = parsed + 1
+            if is_container:
+                stack.append([value, level + 1, 0])
+        return root
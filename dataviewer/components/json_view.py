@@ -1,70 +1,189 @@
+import html
+import itertools
 import json
-from typing import Any, Optional
+import math
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, TextIO
 
+from ..core.page import Page
+from ..renderers.json_elision import (MAX_NUMERIC_ITEMS, MAX_STRING_LENGTH,
+                                      base64_image_payload, format_size,
+                                      is_numeric_array, numeric_preview,
+                                      render_base64_image)
 from .base import Component
+from .json_source import JsonFileScanner, JsonRef
 
 
-class JsonView(Component):
-    """重新设计的JSON视图组件，支持层级显示和折叠功能"""
+# 搜索索引中每个键或值最多保留的字符数
+_MAX_TERM_LENGTH = 100
+# write_node 中表示“没有键”（根节点和数组元素），与值为 None 的键区分
+_NO_KEY = object()
 
-    # 定义主题颜色
-    COLORS = {
-        "dark": {
-            "background": "#1e1e1e",
-            "text": "#d4d4d4",
-            "border": "#333333",
-            "toolbar_bg": "#252526",
-            "button_bg": "#333333",
-            "button_hover": "#404040",
-            "toggle": "#6a9955",
-            "key": "#9cdcfe",
-            "string": "#ce9178",
-            "number": "#b5cea8",
-            "boolean": "#569cd6",
-            "bracket": "#808080",
-            "preview": "#808080",
-        },
-        "light": {
-            "background": "#ffffff",
-            "text": "#333333",
-            "border": "#e8e8e8",
-            "toolbar_bg": "#ffffff",
-            "button_bg": "#f0f0f0",
-            "button_hover": "#e0e0e0",
-            "toggle": "#0b7a3e",
-            "key": "#0451a5",
-            "string": "#a31515",
-            "number": "#098658",
-            "boolean": "#0000ff",
-            "bracket": "#666666",
-            "preview": "#666666",
-        },
-    }
 
-    def __init__(
-        self,
-        data: Any,
-        id: Optional[str] = None,
-        theme: str = "dark",
-        default_expand_level: int = 2,
-    ):
-        """初始化JSON视图组件
-        
-        Args:
-            data: 要显示的JSON数据
-            id: 可选的组件ID
-            theme: 主题，可选 'dark' 或 'light'
-            default_expand_level: 默认展开层级
-        """
-        super().__init__(id=id)
-        self.data = data
-        self.theme = theme.lower()  # 确保主题值是小写的
-        self.default_expand_level = default_expand_level
+def _json_value(value: Any) -> Any:
+    """把 JSON 之外的值转为页面上显示的形式：元组等序列视为数组，其余的值转为字符串"""
+    if value is None or isinstance(value, (dict, list, str, int, float, JsonRef)):
+        return value
+    if isinstance(value, Sequence) and not isinstance(value, (bytes, bytearray)):
+        return list(value)
+    return str(value)
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps 的 default：与 _json_value 的转换一致"""
+    if isinstance(value, Sequence) and not isinstance(value, (bytes, bytearray)):
+        return list(value)
+    return str(value)
+
+
+def _key_text(key: Any) -> str:
+    """对象键在页面上显示的文字，与 json.dumps 转换非字符串键的方式一致"""
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return str(key)
+
+
+class _Literal(str):
+    """_dump_json_iterative 中原样输出的片段"""
+
+
+def _dump_json_iterative(value: Any) -> str:
+    """用显式栈序列化 JSON，嵌套层级不受 Python 递归上限的限制"""
+
+    def dump_scalar(item: Any) -> str:
+        if isinstance(item, float) and not math.isfinite(item):
+            # JSON.parse 不接受 NaN / Infinity，改为与页面上显示一致的字符串
+            item = str(item)
+        return json.dumps(item, ensure_ascii=False, default=_json_default)
+
+    parts = []
+    # 栈中每一项是待序列化的值，或者是需要原样输出的分隔符
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, _Literal):
+            parts.append(item)
+            continue
+        item = _json_value(item)
+        if isinstance(item, dict):
+            stack.append(_Literal("}"))
+            for index, (key, child) in enumerate(reversed(list(item.items()))):
+                stack.append(child)
+                prefix = "" if index == len(item) - 1 else ","
+                stack.append(_Literal(prefix + dump_scalar(_key_text(key)) + ":"))
+            parts.append("{")
+        elif isinstance(item, list):
+            stack.append(_Literal("]"))
+            for index, child in enumerate(reversed(item)):
+                stack.append(child)
+                if index != len(item) - 1:
+                    stack.append(_Literal(","))
+            parts.append("[")
+        else:
+            parts.append(dump_scalar(item))
+    return "".join(parts)
 
-    def to_html(self) -> str:
-        """将JSON数据渲染为HTML"""
-        # 添加必要的CSS样式
-        styles = """
+
+def _dump_script_json(value: Any) -> str:
+    """序列化为可以安全放进 <script> 标签的紧凑 JSON，无法序列化的值转为字符串
+
+    NaN 和 ±Infinity 不是合法的 JSON，会被转为 "nan"、"inf" 等字符串。
+    """
+    try:
+        text = json.dumps(
+            value, ensure_ascii=False, separators=(",", ":"), default=_json_default, allow_nan=False
+        )
+    except (RecursionError, ValueError):
+        # 嵌套过深或含有非有限浮点数时逐个值序列化
+        text = _dump_json_iterative(value)
+    return text.replace("<", "\\u003c")
+
+
+def _entry_count(value: Any) -> int:
+    """容器的条目数，包括从文件部分解析时尚未解析的剩余条目"""
+    if isinstance(value, JsonRef):
+        return value.count
+    remainder = getattr(value, "remainder", None) or ()
+    return len(value) + sum(page.count for page in remainder)
+
+
+def _get_preview(value: Any, max_numeric_items: Optional[int] = None) -> str:
+    """生成预览内容，较长的数字数组显示开头的几个数字"""
+    if is_numeric_array(value, max_numeric_items):
+        return f"[ {numeric_preview(value)}, … 共 {len(value):,} 个数字 ]"
+    if isinstance(value, dict) or getattr(value, "kind", None) == "object":
+        count = _entry_count(value)
+        return f"{{ {count} 个字段 }}"
+    elif isinstance(value, list) or getattr(value, "kind", None) == "array":
+        count = _entry_count(value)
+        return f"[ {count} 个元素 ]"
+    return ""
+
+
+def _build_search_index(data: Any) -> Dict[str, Any]:
+    """按先序遍历为每个节点编号，生成页面搜索用的索引
+
+    parents 和 keys 记录每个节点的父节点和在父节点中的键（数组元素为下标），
+    可以还原出节点的路径；sizes 是以该节点为根的子树的节点数，
+    页面脚本据此在惰性渲染和分页时为新节点计算编号；terms 是小写的键和标量值到节点编号的倒排索引。
+    从文件部分解析时，尚未解析的 JsonRef 子树和剩余条目不在索引中。
+    """
+    parents: List[int] = []
+    keys: List[Any] = []
+    sizes: List[int] = []
+    terms: Dict[str, List[int]] = {}
+
+    def add_term(text: str, node: int) -> None:
+        terms.setdefault(text[:_MAX_TERM_LENGTH].lower(), []).append(node)
+
+    # 栈中是待访问的 (键, 值, 父节点编号)，或者是子树访问完毕、需要记录大小的节点编号
+    stack: List[Any] = [(None, data, -1)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, int):
+            sizes[item] = len(parents) - item
+            continue
+        key, value, parent = item
+        value = _json_value(value)
+        node = len(parents)
+        parents.append(parent)
+        keys.append(key)
+        sizes.append(1)
+        if isinstance(key, str):
+            add_term(key, node)
+
+        if isinstance(value, dict):
+            stack.append(node)
+            stack.extend((k, v, node) for k, v in reversed(list(value.items())))
+        elif isinstance(value, list):
+            stack.append(node)
+            stack.extend((i, v, node) for i, v in reversed(list(enumerate(value))))
+        elif isinstance(value, bool):
+            add_term(str(value).lower(), node)
+        elif value is None:
+            add_term("null", node)
+        elif isinstance(value, (str, int, float)):
+            add_term(str(value), node)
+
+    return {"parents": parents, "keys": keys, "sizes": sizes, "terms": terms}
+
+
+def _page_label(shown: int, total: int) -> str:
+    """分页控件上的文字，如“已显示第 0–99 项，共 1,000,000 项”"""
+    return f"已显示第 0–{shown - 1:,} 项，共 {total:,} 项"
+
+
+def _init_json_view_runtime() -> None:
+    """向页面头部注入一次JSON视图的样式和运行时脚本，各实例只需调用 init"""
+    if "json_view" in Page._init_flags:
+        return
+    Page._init_flags.add("json_view")
+
+    Page._additional_head_content = (
+        Page._additional_head_content
+        + """
         <style>
             .json-view {
                 min-width: 600px;
@@ -242,236 +361,812 @@ class JsonView(Component):
             .json-collapsed .json-preview {
                 display: inline;
             }
-        </style>
-        """
 
-        # 添加JavaScript代码
-        script = f"""
+            .json-more {
+                display: flex;
+                align-items: center;
+                gap: 8px;
+                padding: 4px 0;
+                font-style: italic;
+            }
+
+            .theme-dark .json-more {
+                color: #808080;
+            }
+
+            .theme-light .json-more {
+                color: #666666;
+            }
+
+            .json-more button {
+                padding: 0 8px;
+                border-radius: 4px;
+                border: none;
+                cursor: pointer;
+                font-size: 12px;
+                font-style: normal;
+            }
+
+            .theme-dark .json-more button {
+                background: #333333;
+                color: #d4d4d4;
+            }
+
+            .theme-light .json-more button {
+                background: #f0f0f0;
+                color: #333333;
+            }
+            .json-search {
+                padding: 2px 8px;
+                border-radius: 4px;
+                border: 1px solid;
+                font-size: 12px;
+                width: 180px;
+            }
+
+            .theme-dark .json-search {
+                background: #1e1e1e;
+                color: #d4d4d4;
+                border-color: #404040;
+            }
+
+            .theme-light .json-search {
+                background: #ffffff;
+                color: #333333;
+                border-color: #e0e0e0;
+            }
+
+            .json-search-count {
+                align-self: center;
+                min-width: 48px;
+                font-size: 12px;
+            }
+
+            .json-elided {
+                margin-left: 4px;
+                font-style: italic;
+                cursor: pointer;
+                color: #808080;
+            }
+
+            .json-image img {
+                max-width: 200px;
+                max-height: 200px;
+                vertical-align: middle;
+            }
+
+            .json-match {
+                outline: 2px solid #e5c07b;
+                outline-offset: 1px;
+                border-radius: 3px;
+            }
+        </style>
         <script>
-            (function() {{
-                const container = document.getElementById('{self.id}');
-                
-                function toggleNode(node, collapsed) {{
-                    if (node) {{
-                        if (collapsed) {{
-                            node.classList.add('json-collapsed');
-                            const toggle = node.querySelector(':scope > .json-toggle');
-                            if (toggle) toggle.textContent = '+';
-                        }} else {{
-                            node.classList.remove('json-collapsed');
-                            const toggle = node.querySelector(':scope > .json-toggle');
-                            if (toggle) toggle.textContent = '-';
-                        }}
-                    }}
-                }}
-                
-                function getNodeLevel(node) {{
-                    let level = 0;
-                    let current = node;
-                    while (current && !current.classList.contains('json-content')) {{
-                        const parent = current.parentElement;
-                        if (parent && parent.classList.contains('json-item')) {{
-                            level++;
-                        }}
-                        current = parent;
-                    }}
-                    return level;
-                }}
-                
-                function getNodes() {{
-                    return Array.from(container.querySelectorAll('div')).filter(node => 
-                        node.querySelector(':scope > .json-toggle')
+            window.DataViewerJsonView = window.DataViewerJsonView || {
+                init: function(id, defaultLevel) {
+                    const container = document.getElementById(id);
+                    // 每个惰性值单独放在一个 <script> 中，首次用到时才解析；
+                    // 页面脚本渲染时产生的惰性值追加在后面
+                    const lazyScripts = document.querySelectorAll('script[data-json-lazy="' + id + '"]');
+                    const lazyValues = new Array(lazyScripts.length);
+                    const pageSize = Number(container.dataset.pageSize) || 0;
+                    const maxString = Number(container.dataset.maxString) || 0;
+                    const maxNumbers = Number(container.dataset.maxNumbers) || 0;
+                    const indexData = document.getElementById(id + '-index');
+                    const searchIndex = indexData ? JSON.parse(indexData.textContent) : null;
+                    const sizes = searchIndex ? searchIndex.sizes : null;
+
+                    // JSON.parse 会把整数形式的键排到对象最前面；解析前给每个键加上前缀 "~"，
+                    // 对象仍按原有顺序排列，取出条目时再去掉前缀
+                    const objectKey = /"(?:[^"\\\\]|\\\\.)*"(\\s*:)?/g;
+                    function parseOrdered(text) {
+                        return JSON.parse(text.replace(
+                            objectKey, (string, colon) => colon ? '"~' + string.slice(1) : string
+                        ));
+                    }
+
+                    function objectEntries(value) {
+                        return Object.keys(value).map(key => [key.slice(1), value[key]]);
+                    }
+
+                    function getLazy(index) {
+                        if (lazyValues[index] === undefined) {
+                            lazyValues[index] = parseOrdered(lazyScripts[index].textContent);
+                        }
+                        return lazyValues[index];
+                    }
+
+                    // 惰性值用完后释放解析结果和对应的 <script>
+                    function releaseLazy(index) {
+                        lazyValues[index] = null;
+                        if (index < lazyScripts.length) lazyScripts[index].remove();
+                    }
+
+                    function toEntries(value, kind) {
+                        // 从文件直接输出的剩余字段是一个对象，转换为 [键, 值] 对
+                        return kind === 'object' && !Array.isArray(value) ? objectEntries(value) : value;
+                    }
+
+                    function escapeHtml(text) {
+                        return String(text).replace(/[&<>"']/g, c => ({
+                            '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'
+                        })[c]);
+                    }
+
+                    // 与 Python 端 media_sniff 相同的 base64 图片签名
+                    const base64Image = new RegExp(
+                        '^(?:data:image/([A-Za-z0-9.+-]+);base64,)?(/9j/|iVBORw0KGgo|R0lGOD[dl]h|UklGR[A-Za-z0-9+/]{7}RUJQ)'
                     );
-                }}
-                
-                function getExpandedNodes() {{
-                    return getNodes().filter(node => !node.classList.contains('json-collapsed'));
-                }}
-                
-                function getCollapsedNodes() {{
-                    return getNodes().filter(node => node.classList.contains('json-collapsed'));
-                }}
-                
-                function getNodesAtLevel(level) {{
-                    return getNodes().filter(node => getNodeLevel(node) === level);
-                }}
-                
-                function getExpandedNodesAtLevel(level) {{
-                    return getExpandedNodes().filter(node => getNodeLevel(node) === level);
-                }}
+                    const base64Subtypes = { '/': 'jpeg', 'i': 'png', 'R': 'gif', 'U': 'webp' };
+
+                    // 字符串节点：base64 图片显示为缩略图，过长的字符串截断，完整内容放入 lazyValues
+                    function renderString(value) {
+                        const image = value.length >= 64 && base64Image.exec(value);
+                        if (image) {
+                            const src = image[1] ? value
+                                : 'data:image/' + base64Subtypes[image[2][0]] + ';base64,' + value;
+                            return '<span class="json-image"><img src="' + escapeHtml(src) + '" alt="Image"></span>';
+                        }
+                        if (maxString > 0 && value.length > maxString) {
+                            const index = lazyValues.push(value) - 1;
+                            return '<span class="json-string">"' + escapeHtml(value.slice(0, maxString)) + '…"</span>' +
+                                '<span class="json-elided" data-full="' + index + '">… 共 ' +
+                                value.length.toLocaleString('en-US') + ' 字符，点击显示全部</span>';
+                        }
+                        return '<span class="json-string">"' + escapeHtml(value) + '"</span>';
+                    }
+
+                    // 与 Python 端相同的节点结构；容器节点折叠输出，子节点在展开时才渲染
+                    // nodeId 为节点在搜索索引中的编号，没有索引时为 null
+                    function renderValue(key, value, level, nodeId) {
+                        const keyHtml = key === null ? '' :
+                            '<span class="json-key">"' + escapeHtml(key) + '"</span>: ';
+                        const nodeAttr = nodeId === null ? '' : ' data-node="' + nodeId + '"';
+                        if (value !== null && typeof value === 'object') {
+                            const isArray = Array.isArray(value);
+                            const count = isArray ? value.length : Object.keys(value).length;
+                            const opening = isArray ? '[' : '{';
+                            const closing = isArray ? ']' : '}';
+                            if (count === 0) {
+                                return '<div' + nodeAttr + '>' + keyHtml +
+                                    '<span class="json-bracket">' + opening + closing + '</span></div>';
+                            }
+                            const numeric = isArray && maxNumbers > 0 && count > maxNumbers &&
+                                value.every(item => typeof item === 'number');
+                            const preview = numeric
+                                ? '[ ' + value.slice(0, 8).join(', ') + ', … 共 ' + count.toLocaleString('en-US') + ' 个数字 ]'
+                                : isArray ? '[ ' + count + ' 个元素 ]' : '{ ' + count + ' 个字段 }';
+                            const index = lazyValues.push(value) - 1;
+                            return '<div class="json-collapsed" data-level="' + level + '"' + nodeAttr +
+                                (numeric ? ' data-numeric' : '') + ' data-lazy="' + index + '">' +
+                                '<span class="json-toggle">+</span>' + keyHtml +
+                                '<span class="json-bracket">' + opening + '</span>' +
+                                '<span class="json-preview">' + preview + '</span>' +
+                                '<div class="json-item"></div>' +
+                                '<span class="json-bracket">' + closing + '</span></div>';
+                        }
+                        if (typeof value === 'string') {
+                            return '<div' + nodeAttr + '>' + keyHtml + renderString(value) + '</div>';
+                        }
+                        if (typeof value === 'number') {
+                            return '<div' + nodeAttr + '>' + keyHtml + '<span class="json-number">' + value + '</span></div>';
+                        }
+                        if (typeof value === 'boolean') {
+                            return '<div' + nodeAttr + '>' + keyHtml + '<span class="json-boolean">' + value + '</span></div>';
+                        }
+                        return '<div' + nodeAttr + '>' + keyHtml + '<span class="json-null">null</span></div>';
+                    }
+
+                    function pageLabel(shown, total) {
+                        return '已显示第 0–' + (shown - 1).toLocaleString('en-US') +
+                            ' 项，共 ' + total.toLocaleString('en-US') + ' 项';
+                    }
+
+                    // entries 为数组元素或对象的 [键, 值] 对，entries[0] 对应第 start 项；
+                    // 返回 [HTML, 下一个条目的节点编号]
+                    function renderRange(entries, kind, start, from, end, level, nodeId) {
+                        const parts = [];
+                        for (let i = from; i < end; i++) {
+                            const entry = entries[i - start];
+                            parts.push(kind === 'object'
+                                ? renderValue(entry[0], entry[1], level, nodeId)
+                                : renderValue(null, entry, level, nodeId));
+                            if (nodeId !== null) nodeId += sizes[nodeId];
+                        }
+                        return [parts.join(''), nodeId];
+                    }
+
+                    // 分页控件，尚未渲染的条目保存在 lazyValues[index] 中
+                    function moreControl(index, start, next, total, kind, nodeId) {
+                        return '<div class="json-more" data-more="' + index + '" data-start="' + start +
+                            '" data-next="' + next + '" data-total="' + total + '" data-kind="' + kind + '"' +
+                            (nodeId === null ? '' : ' data-next-node="' + nodeId + '"') + '>' +
+                            '<span class="json-page-label">' + pageLabel(next, total) + '</span>' +
+                            '<button class="json-load-more">加载更多</button>' +
+                            '<button class="json-load-all">全部加载</button></div>';
+                    }
+
+                    // 首次展开惰性节点时渲染其子节点的第一页，返回是否渲染了新节点
+                    function materialize(node) {
+                        if (node.dataset.lazy === undefined) return false;
+                        const index = Number(node.dataset.lazy);
+                        const value = getLazy(index);
+                        releaseLazy(index);
+                        node.removeAttribute('data-lazy');
+                        const kind = Array.isArray(value) ? 'array' : 'object';
+                        const entries = kind === 'array' ? value : objectEntries(value);
+                        const total = entries.length;
+                        const end = pageSize > 0 ? Math.min(total, pageSize) : total;
+                        const level = Number(node.dataset.level) + 1;
+                        // 索引中子树只有一个节点时（如文件中尚未解析的子树），子节点不在索引中
+                        const nodeId = sizes && node.dataset.node !== undefined && sizes[Number(node.dataset.node)] > 1
+                            ? Number(node.dataset.node) + 1 : null;
+                        const [items, nextNode] = renderRange(entries, kind, 0, 0, end, level, nodeId);
+                        let content = items;
+                        if (end < total) {
+                            content += moreControl(lazyValues.push(entries) - 1, 0, end, total, kind, nextNode);
+                        }
+                        node.querySelector(':scope > .json-item').innerHTML = content;
+                        return true;
+                    }
+
+                    // 在分页控件前渲染下一页（或剩余的全部条目）
+                    // 剩余条目按每块 data-chunk 个存放在从 data-more 开始的连续惰性值中，
+                    // 没有 data-chunk 时全部存放在一个惰性值中；只解析用到的块
+                    function loadMore(more, all) {
+                        const index = Number(more.dataset.more);
+                        const kind = more.dataset.kind;
+                        const start = Number(more.dataset.start);
+                        const next = Number(more.dataset.next);
+                        const total = Number(more.dataset.total);
+                        const nodeId = more.dataset.nextNode === undefined ? null : Number(more.dataset.nextNode);
+                        // 分页控件位于容器节点的 .json-item 中
+                        const level = Number(more.parentElement.parentElement.dataset.level) + 1;
+                        const end = all || pageSize <= 0 ? total : Math.min(total, next + pageSize);
+                        const chunk = Number(more.dataset.chunk) || total - start;
+                        const first = Math.floor((next - start) / chunk);
+                        const last = Math.floor((end - 1 - start) / chunk);
+                        const entries = [];
+                        for (let c = first; c <= last; c++) {
+                            for (const entry of toEntries(getLazy(index + c), kind)) entries.push(entry);
+                            // 完整渲染过的块不再需要
+                            if (start + (c + 1) * chunk <= end) releaseLazy(index + c);
+                        }
+                        const [items, nextNode] = renderRange(
+                            entries, kind, start + first * chunk, next, end, level, nodeId
+                        );
+                        more.insertAdjacentHTML('beforebegin', items);
+                        if (end < total) {
+                            more.dataset.next = end;
+                            if (nextNode !== null) more.dataset.nextNode = nextNode;
+                            more.querySelector('.json-page-label').textContent = pageLabel(end, total);
+                        } else {
+                            more.remove();
+                        }
+                    }
+
+                    function toggleNode(node, collapsed) {
+                        if (node) {
+                            if (!collapsed) materialize(node);
+                            if (collapsed) {
+                                node.classList.add('json-collapsed');
+                                const toggle = node.querySelector(':scope > .json-toggle');
+                                if (toggle) toggle.textContent = '+';
+                            } else {
+                                node.classList.remove('json-collapsed');
+                                const toggle = node.querySelector(':scope > .json-toggle');
+                                if (toggle) toggle.textContent = '-';
+                            }
+                        }
+                    }
                 
-                function getMaxExpandedLevel() {{
-                    const expandedNodes = getExpandedNodes();
-                    if (expandedNodes.length === 0) return 0;
-                    return Math.max(...expandedNodes.map(node => getNodeLevel(node)));
-                }}
+                    // 每个可折叠节点都带有 data-level，按层级操作时无需逐个向上查找父节点
+                    function getMaxExpandedLevel() {
+                        let maxLevel = 0;
+                        container.querySelectorAll('[data-level]:not(.json-collapsed)').forEach(node => {
+                            maxLevel = Math.max(maxLevel, Number(node.dataset.level));
+                        });
+                        return maxLevel;
+                    }
                 
-                function expandLevel(level) {{
-                    // 展开到指定层级的所有节点
-                    getNodes().forEach(node => {{
-                        const nodeLevel = getNodeLevel(node);
-                        if (nodeLevel <= level) {{
-                            toggleNode(node, false);  // 展开
-                        }} else {{
-                            toggleNode(node, true);   // 折叠
-                        }}
-                    }});
-                }}
+                    function expandLevel(level, includeNumeric) {
+                        // 展开到指定层级的所有节点，折叠更深的节点；
+                        // 展开惰性节点会渲染出新节点，只需再处理新渲染的子树。
+                        // 较长的数字数组（data-numeric）保持折叠以显示预览，只有“展开全部”会展开它们
+                        let nodes = container.querySelectorAll('[data-level]');
+                        while (nodes.length) {
+                            const rendered = [];
+                            nodes.forEach(node => {
+                                if (Number(node.dataset.level) <= level &&
+                                    (includeNumeric || node.dataset.numeric === undefined)) {
+                                    if (materialize(node)) rendered.push(node);
+                                    toggleNode(node, false);  // 展开
+                                } else {
+                                    toggleNode(node, true);   // 折叠
+                                }
+                            });
+                            nodes = [];
+                            rendered.forEach(node => {
+                                node.querySelectorAll('[data-level]').forEach(child => nodes.push(child));
+                            });
+                        }
+                    }
                 
-                // 折叠/展开单个节点
-                container.addEventListener('click', function(e) {{
-                    const toggle = e.target.closest('.json-toggle');
-                    if (toggle) {{
-                        const parent = toggle.parentElement;
-                        if (parent) {{
-                            toggleNode(parent, !parent.classList.contains('json-collapsed'));
-                        }}
-                    }}
-                }});
+                    // 折叠/展开单个节点
+                    container.addEventListener('click', function(e) {
+                        const elided = e.target.closest('.json-elided[data-full]');
+                        if (elided) {
+                            // 显示被截断字符串的完整内容
+                            const index = Number(elided.dataset.full);
+                            elided.previousElementSibling.textContent = '"' + getLazy(index) + '"';
+                            releaseLazy(index);
+                            elided.remove();
+                            return;
+                        }
+                        const button = e.target.closest('.json-load-more, .json-load-all');
+                        if (button) {
+                            loadMore(button.parentElement, button.classList.contains('json-load-all'));
+                            return;
+                        }
+                        const toggle = e.target.closest('.json-toggle');
+                        if (toggle) {
+                            const parent = toggle.parentElement;
+                            if (parent) {
+                                toggleNode(parent, !parent.classList.contains('json-collapsed'));
+                            }
+                        }
+                    });
                 
-                // 全部折叠按钮
-                document.getElementById('{self.id}-collapse-all').addEventListener('click', function() {{
-                    expandLevel(0);
-                }});
+                    // 全部折叠按钮
+                    document.getElementById(id + '-collapse-all').addEventListener('click', function() {
+                        expandLevel(0);
+                    });
                 
-                // 全部展开按钮
-                document.getElementById('{self.id}-expand-all').addEventListener('click', function() {{
-                    expandLevel(999);
-                }});
+                    // 全部展开按钮
+                    document.getElementById(id + '-expand-all').addEventListener('click', function() {
+                        expandLevel(999, true);
+                    });
                 
-                // 展开一级按钮
-                document.getElementById('{self.id}-expand-one').addEventListener('click', function() {{
-                    const currentMaxLevel = getMaxExpandedLevel();
-                    expandLevel(currentMaxLevel + 1);
-                }});
+                    // 展开一级按钮
+                    document.getElementById(id + '-expand-one').addEventListener('click', function() {
+                        const currentMaxLevel = getMaxExpandedLevel();
+                        expandLevel(currentMaxLevel + 1);
+                    });
                 
-                // 折叠一级按钮
-                document.getElementById('{self.id}-collapse-one').addEventListener('click', function() {{
-                    const currentMaxLevel = getMaxExpandedLevel();
-                    if (currentMaxLevel > 0) {{
-                        expandLevel(currentMaxLevel - 1);
-                    }}
-                }});
+                    // 折叠一级按钮
+                    document.getElementById(id + '-collapse-one').addEventListener('click', function() {
+                        const currentMaxLevel = getMaxExpandedLevel();
+                        if (currentMaxLevel > 0) {
+                            expandLevel(currentMaxLevel - 1);
+                        }
+                    });
                 
-                // 初始化默认展开层级
-                expandLevel({self.default_expand_level});
-            }})();
+                    function findNode(nodeId) {
+                        return container.querySelector('[data-node="' + nodeId + '"]');
+                    }
+
+                    // 节点编号到路径的映射，首次按路径搜索时由 parents 和 keys 逐个拼出
+                    let paths = null;
+                    function getPaths() {
+                        if (paths) return paths;
+                        paths = new Map();
+                        const names = new Array(searchIndex.parents.length);
+                        names[0] = '$';
+                        paths.set('$', 0);
+                        for (let n = 1; n < names.length; n++) {
+                            const key = searchIndex.keys[n];
+                            const step = typeof key === 'number' ? '[' + key + ']'
+                                : /^[A-Za-z_$][A-Za-z0-9_$]*$/.test(key) ? '.' + key : '[' + JSON.stringify(key) + ']';
+                            names[n] = names[searchIndex.parents[n]] + step;
+                            paths.set(names[n], n);
+                        }
+                        return paths;
+                    }
+
+                    let termList = null;
+                    function findMatches(query) {
+                        query = query.trim();
+                        if (!query) return [];
+                        if (query[0] === '$') {
+                            const exact = getPaths().get(query);
+                            if (exact !== undefined) return [exact];
+                            const found = [];
+                            getPaths().forEach((nodeId, path) => {
+                                if (path.startsWith(query)) found.push(nodeId);
+                            });
+                            return found;
+                        }
+                        const text = query.toLowerCase();
+                        const found = new Set();
+                        termList = termList || Object.keys(searchIndex.terms);
+                        termList.forEach(term => {
+                            if (term.includes(text)) searchIndex.terms[term].forEach(nodeId => found.add(nodeId));
+                        });
+                        return Array.from(found).sort((a, b) => a - b);
+                    }
+
+                    // 从根节点开始只展开命中节点的祖先，必要时渲染惰性子树和分页
+                    function revealNode(nodeId) {
+                        const chain = [];
+                        for (let n = nodeId; n >= 0; n = searchIndex.parents[n]) chain.push(n);
+                        chain.reverse();
+                        let element = findNode(chain[0]);
+                        for (let i = 1; element && i < chain.length; i++) {
+                            toggleNode(element, false);
+                            const item = element.querySelector(':scope > .json-item');
+                            let more = item && item.querySelector(':scope > .json-more');
+                            while (more && more.dataset.nextNode !== undefined &&
+                                   Number(more.dataset.nextNode) <= chain[i]) {
+                                loadMore(more, false);
+                                more = item.querySelector(':scope > .json-more');
+                            }
+                            element = findNode(chain[i]);
+                        }
+                        return element;
+                    }
+
+                    const searchInput = document.getElementById(id + '-search');
+                    if (searchInput && searchIndex) {
+                        const countLabel = document.getElementById(id + '-search-count');
+                        let matches = [];
+                        let current = -1;
+                        let highlighted = null;
+                        let timer = null;
+
+                        function runSearch() {
+                            timer = null;
+                            matches = findMatches(searchInput.value);
+                            current = -1;
+                            if (highlighted) highlighted.classList.remove('json-match');
+                            highlighted = null;
+                            countLabel.textContent = !searchInput.value.trim() ? ''
+                                : matches.length ? '0 / ' + matches.length : '无结果';
+                        }
+
+                        function showMatch(step) {
+                            if (timer !== null) {
+                                clearTimeout(timer);
+                                runSearch();
+                            }
+                            if (!matches.length) return;
+                            current = (current + step + matches.length) % matches.length;
+                            if (highlighted) highlighted.classList.remove('json-match');
+                            highlighted = revealNode(matches[current]);
+                            if (highlighted) {
+                                highlighted.classList.add('json-match');
+                                highlighted.scrollIntoView({ block: 'center' });
+                            }
+                            countLabel.textContent = (current + 1) + ' / ' + matches.length;
+                        }
+
+                        searchInput.addEventListener('input', function() {
+                            clearTimeout(timer);
+                            timer = setTimeout(runSearch, 150);
+                        });
+                        searchInput.addEventListener('keydown', function(e) {
+                            if (e.key === 'Enter') showMatch(e.shiftKey ? -1 : 1);
+                        });
+                        document.getElementById(id + '-search-prev').addEventListener('click', () => showMatch(-1));
+                        document.getElementById(id + '-search-next').addEventListener('click', () => showMatch(1));
+                    }
+
+                    // 初始化默认展开层级
+                    expandLevel(defaultLevel);
+                }
+            };
         </script>
         """
+    )
+
+
+class JsonView(Component):
+    """重新设计的JSON视图组件，支持层级显示和折叠功能"""
 
-        def get_preview(value: Any) -> str:
-            """生成预览内容"""
-            if isinstance(value, dict):
-                count = len(value)
-                return f"{{ {count} 个字段 }}"
-            elif isinstance(value, list):
-                count = len(value)
-                return f"[ {count} 个元素 ]"
-            return ""
-
-        def render_value(value: Any, key: Optional[str] = None) -> str:
-            if isinstance(value, dict):
-                if not value:
-                    return (
-                        f'<div><span class="json-key">"{key}"</span>: <span class="json-bracket">{{}}</span></div>'
-                        if key
-                        else '<span class="json-bracket">{{}}</span>'
+    # 定义主题颜色
+    COLORS = {
+        "dark": {
+            "background": "#1e1e1e",
+            "text": "#d4d4d4",
+            "border": "#333333",
+            "toolbar_bg": "#252526",
+            "button_bg": "#333333",
+            "button_hover": "#404040",
+            "toggle": "#6a9955",
+            "key": "#9cdcfe",
+            "string": "#ce9178",
+            "number": "#b5cea8",
+            "boolean": "#569cd6",
+            "bracket": "#808080",
+            "preview": "#808080",
+        },
+        "light": {
+            "background": "#ffffff",
+            "text": "#333333",
+            "border": "#e8e8e8",
+            "toolbar_bg": "#ffffff",
+            "button_bg": "#f0f0f0",
+            "button_hover": "#e0e0e0",
+            "toggle": "#0b7a3e",
+            "key": "#0451a5",
+            "string": "#a31515",
+            "number": "#098658",
+            "boolean": "#0000ff",
+            "bracket": "#666666",
+            "preview": "#666666",
+        },
+    }
+
+    def __init__(
+        self,
+        data: Any,
+        id: Optional[str] = None,
+        theme: str = "dark",
+        default_expand_level: int = 2,
+        lazy: bool = False,
+        page_size: Optional[int] = 100,
+        searchable: bool = False,
+        max_string_length: Optional[int] = MAX_STRING_LENGTH,
+        max_numeric_items: Optional[int] = MAX_NUMERIC_ITEMS,
+    ):
+        """初始化JSON视图组件
+        
+        Args:
+            data: 要显示的JSON数据
+            id: 可选的组件ID
+            theme: 主题，可选 'dark' 或 'light'
+            default_expand_level: 默认展开层级
+            lazy: 惰性渲染，只把默认展开的层级输出为HTML，
+                更深的子树以紧凑 JSON 输出，首次展开时由页面脚本渲染
+            page_size: 数组和对象每页渲染的条目数，超出部分以 JSON 输出，
+                点击“加载更多”时由页面脚本逐页渲染；为 None 或 0 时不分页
+            searchable: 显示搜索框，渲染时生成路径和键/值的倒排索引，
+                搜索命中时只展开命中节点的祖先；以 $ 开头的输入按路径（如 $.a[0].b）查找
+            max_string_length: 超过该长度的字符串只显示开头，点击后显示完整内容；
+                base64 图片总是显示为缩略图。为 None 时不截断
+            max_numeric_items: 超过该长度的数字数组总是折叠输出，预览中只显示开头的几个数字；
+                为 None 时不特殊处理
+        """
+        super().__init__(id=id)
+        self.data = data
+        self.theme = theme.lower()  # 确保主题值是小写的
+        self.default_expand_level = default_expand_level
+        self.lazy = lazy
+        self.page_size = page_size
+        self.searchable = searchable
+        self.max_string_length = max_string_length
+        self.max_numeric_items = max_numeric_items
+
+        _init_json_view_runtime()
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        default_expand_level: int = 2,
+        page_size: Optional[int] = 100,
+        **kwargs,
+    ) -> "JsonView":
+        """从 JSON 文件创建视图，不需要把整个文件加载为 Python 对象
+
+        文件以内存映射的方式按需解析：只有默认展开的层级和每个容器的第一页会被解析，
+        更深的子树和剩余条目只记录字节偏移，渲染时直接从文件分块复制到页面中。
+        因此可以查看远大于内存的文件，渲染前不要修改文件。
+
+        Args:
+            path: JSON 文件路径
+            default_expand_level: 默认展开层级，同时也是解析为 Python 对象的层级
+            page_size: 数组和对象每页渲染的条目数
+            **kwargs: 其他 JsonView 参数
+        """
+        data = JsonFileScanner(path).load(default_expand_level, page_size)
+        return cls(
+            data,
+            default_expand_level=default_expand_level,
+            page_size=page_size,
+            **kwargs,
+        )
+
+    def _string_html(self, value: str, lazy_values: List[Any]) -> str:
+        """字符串节点：base64 图片显示为缩略图，过长的字符串截断，完整内容放入 lazy_values"""
+        payload = base64_image_payload(value)
+        if payload is not None:
+            image = render_base64_image(payload)
+            if image is not None:
+                return f'<span class="json-image">{image}</span>'
+
+        limit = self.max_string_length
+        if limit is None or len(value) <= limit:
+            return f'<span class="json-string">"{html.escape(value)}"</span>'
+        size = format_size(len(value.encode("utf-8", "surrogatepass")))
+        marker = (
+            f'<span class="json-elided" data-full="{len(lazy_values)}">'
+            f"… 共 {len(value):,} 字符（{size}），点击显示全部</span>"
+        )
+        lazy_values.append(value)
+        return f'<span class="json-string">"{html.escape(value[:limit])}…"</span>{marker}'
+
+    def _write_tree(
+        self,
+        out: TextIO,
+        lazy_values: List[Any],
+        sizes: Optional[List[int]] = None,
+    ) -> None:
+        """用显式栈迭代地写出整棵树，深层嵌套不会触及 Python 的递归上限
+
+        惰性模式下，层级超过 default_expand_level 的容器节点只输出折叠的占位，
+        子树追加到 lazy_values 中，占位通过 data-lazy 记录其下标。
+        条目数超过 page_size 的容器只输出第一页，其余条目（对象为 [键, 值] 对）
+        按每页 data-chunk 个依次追加到 lazy_values 中，由分页控件的 data-more 记录第一页的下标。
+        传入搜索索引的 sizes 时，每个节点通过 data-node 记录其在索引中的编号。
+        """
+        page_size = self.page_size or 0
+        # 栈中每一帧是 (子节点迭代器, 容器的闭合HTML, 子节点层级, [下一个子节点的编号])
+        stack = []
+
+        def write_node(key: Any, value: Any, level: int, node: Optional[int]) -> None:
+            key_html = (
+                f'<span class="json-key">"{html.escape(_key_text(key))}"</span>: '
+                if key is not _NO_KEY
+                else ""
+            )
+            value = _json_value(value)
+            node_attr = f' data-node="{node}"' if node is not None else ""
+
+            if isinstance(value, (dict, list, JsonRef)):
+                kind = (
+                    value.kind
+                    if isinstance(value, JsonRef)
+                    else ("object" if isinstance(value, dict) else "array")
+                )
+                opening, closing = ("{", "}") if kind == "object" else ("[", "]")
+                if not _entry_count(value):
+                    out.write(
+                        f'<div{node_attr}>{key_html}<span class="json-bracket">{opening}{closing}</span></div>'
+                        if key is not _NO_KEY
+                        else f'<span class="json-bracket">{opening}{closing}</span>'
                     )
+                    return
 
-                items = []
-                for k, v in value.items():
-                    items.append(render_value(v, k))
-
-                preview = get_preview(value)
-                content = '<div class="json-item">' + "".join(items) + "</div>"
-                if key is not None:
-                    return f"""
-                        <div>
-                            <span class="json-toggle">-</span>
-                            <span class="json-key">"{key}"</span>: 
-                            <span class="json-bracket">{{</span>
-                            <span class="json-preview">{preview}</span>
-                            {content}
-                            <span class="json-bracket">}}</span>
-                        </div>
-                    """
-                return f"""
-                    <div>
-                        <span class="json-toggle">-</span>
-                        <span class="json-bracket">{{</span>
+                # 文件中尚未解析的子树和较长的数字数组总是以惰性占位输出
+                numeric = getattr(value, "remainder", None) is None and is_numeric_array(
+                    value, self.max_numeric_items
+                )
+                if (
+                    isinstance(value, JsonRef)
+                    or numeric
+                    or (self.lazy and level > self.default_expand_level)
+                ):
+                    numeric_attr = " data-numeric" if numeric else ""
+                    preview = _get_preview(value, self.max_numeric_items if numeric else None)
+                    out.write(
+                        f"""
+                    <div class="json-collapsed" data-level="{level}"{node_attr}{numeric_attr} data-lazy="{len(lazy_values)}">
+                        <span class="json-toggle">+</span>
+                        {key_html}
+                        <span class="json-bracket">{opening}</span>
                         <span class="json-preview">{preview}</span>
-                        {content}
-                        <span class="json-bracket">}}</span>
+                        <div class="json-item"></div>
+                        <span class="json-bracket">{closing}</span>
                     </div>
                 """
-
-            elif isinstance(value, list):
-                if not value:
-                    return (
-                        f'<div><span class="json-key">"{key}"</span>: <span class="json-bracket">[]</span></div>'
-                        if key
-                        else '<span class="json-bracket">[]</span>'
                     )
+                    lazy_values.append(value)
+                    return
 
-                items = []
-                for item in value:
-                    items.append(render_value(item))
-
-                preview = get_preview(value)
-                content = '<div class="json-item">' + "".join(items) + "</div>"
-                if key is not None:
-                    return f"""
-                        <div>
-                            <span class="json-toggle">-</span>
-                            <span class="json-key">"{key}"</span>: 
-                            <span class="json-bracket">[</span>
-                            <span class="json-preview">{preview}</span>
-                            {content}
-                            <span class="json-bracket">]</span>
-                        </div>
-                    """
-                return f"""
-                    <div>
+                out.write(
+                    f"""
+                    <div data-level="{level}"{node_attr}>
                         <span class="json-toggle">-</span>
-                        <span class="json-bracket">[</span>
-                        <span class="json-preview">{preview}</span>
-                        {content}
-                        <span class="json-bracket">]</span>
+                        {key_html}
+                        <span class="json-bracket">{opening}</span>
+                        <span class="json-preview">{_get_preview(value)}</span>
+                        <div class="json-item">"""
+                )
+                children = (
+                    iter(value.items())
+                    if kind == "object"
+                    else ((_NO_KEY, item) for item in value)
+                )
+                more = ""
+                first_child = [node + 1] if node is not None else None
+                total = _entry_count(value)
+                remainder = getattr(value, "remainder", None)
+                shown = len(value) if remainder is not None else page_size
+                # 从文件部分解析的容器，剩余条目已经按扫描时的页大小划分
+                chunk = remainder[0].count if remainder else page_size
+                if remainder is not None or 0 < page_size < total:
+                    # 剩余条目中第一个节点的编号，文件中尚未解析的条目不在索引中
+                    next_node = ""
+                    if node is not None and remainder is None:
+                        child = node + 1
+                        for _ in range(page_size):
+                            child += sizes[child]
+                        next_node = f' data-next-node="{child}"'
+                    more = (
+                        f'<div class="json-more" data-more="{len(lazy_values)}" '
+                        f'data-start="{shown}" data-next="{shown}" '
+                        f'data-total="{total}" data-kind="{kind}" data-chunk="{chunk}"{next_node}>'
+                        f'<span class="json-page-label">{_page_label(shown, total)}</span>'
+                        '<button class="json-load-more">加载更多</button>'
+                        '<button class="json-load-all">全部加载</button></div>'
+                    )
+                    if remainder is not None:
+                        # 剩余条目直接从文件输出
+                        lazy_values.extend(remainder)
+                    else:
+                        children = itertools.islice(children, page_size)
+                        rest = (
+                            itertools.islice(value.items(), page_size, None)
+                            if kind == "object"
+                            else itertools.islice(value, page_size, None)
+                        )
+                        while True:
+                            page = [
+                                list(entry) if kind == "object" else entry
+                                for entry in itertools.islice(rest, page_size)
+                            ]
+                            if not page:
+                                break
+                            lazy_values.append(page)
+                stack.append(
+                    (
+                        children,
+                        f"""{more}</div>
+                        <span class="json-bracket">{closing}</span>
                     </div>
-                """
+                """,
+                        level + 1,
+                        first_child,
+                    )
+                )
 
             elif isinstance(value, str):
-                return (
-                    f'<div><span class="json-key">"{key}"</span>: <span class="json-string">"{value}"</span></div>'
-                    if key
-                    else f'<div><span class="json-string">"{value}"</span></div>'
-                )
-            elif isinstance(value, (int, float)):
-                return (
-                    f'<div><span class="json-key">"{key}"</span>: <span class="json-number">{value}</span></div>'
-                    if key
-                    else f'<div><span class="json-number">{value}</span></div>'
+                out.write(
+                    f"<div{node_attr}>{key_html}{self._string_html(value, lazy_values)}</div>"
                 )
             elif isinstance(value, bool):
-                return (
-                    f'<div><span class="json-key">"{key}"</span>: <span class="json-boolean">{str(value).lower()}</span></div>'
-                    if key
-                    else f'<div><span class="json-boolean">{str(value).lower()}</span></div>'
+                out.write(
+                    f'<div{node_attr}>{key_html}<span class="json-boolean">{str(value).lower()}</span></div>'
                 )
-            elif value is None:
-                return (
-                    f'<div><span class="json-key">"{key}"</span>: <span class="json-null">null</span></div>'
-                    if key
-                    else '<div><span class="json-null">null</span></div>'
+            elif isinstance(value, (int, float)):
+                out.write(
+                    f'<div{node_attr}>{key_html}<span class="json-number">{value}</span></div>'
                 )
-            return ""
+            elif value is None:
+                out.write(f'<div{node_attr}>{key_html}<span class="json-null">null</span></div>')
 
-        # 渲染JSON内容
-        content = render_value(self.data)
+        write_node(_NO_KEY, self.data, 0, 0 if sizes is not None else None)
+        while stack:
+            children, closing, level, next_node = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                out.write(closing)
+                continue
+            if next_node is None:
+                write_node(child[0], child[1], level, None)
+            else:
+                node = next_node[0]
+                next_node[0] += sizes[node]
+                write_node(child[0], child[1], level, node)
 
+    def write_html(self, out: TextIO) -> None:
+        """将JSON数据流式渲染为HTML
+
+        样式和交互脚本由页面头部的共享运行时提供，这里只输出数据和一行初始化调用。
+        """
         # 添加工具栏和内容容器
+        search = (
+            f"""
+            <input id="{self.id}-search" class="json-search" type="search" placeholder="搜索键、值或 $.路径">
+            <span id="{self.id}-search-count" class="json-search-count"></span>
+            <button id="{self.id}-search-prev">上一个</button>
+            <button id="{self.id}-search-next">下一个</button>"""
+            if self.searchable
+            else ""
+        )
         toolbar = f"""
-        <div class="json-toolbar">
+        <div class="json-toolbar">{search}
             <button id="{self.id}-expand-all">展开全部</button>
             <button id="{self.id}-expand-one">展开一级</button>
             <button id="{self.id}-collapse-one">折叠一级</button>
@@ -479,13 +1174,44 @@ class JsonView(Component):
         </div>
         """
 
-        return f"""
-        {styles}
-        <div id="{self.id}" class="json-view theme-{self.theme}">
+        limits = (
+            f'data-page-size="{int(self.page_size or 0)}" '
+            f'data-max-string="{int(self.max_string_length or 0)}" '
+            f'data-max-numbers="{int(self.max_numeric_items or 0)}"'
+        )
+        out.write(
+            f"""
+        <div id="{self.id}" class="json-view theme-{self.theme}" {limits}>
             {toolbar}
             <div class="json-content">
-                {content}
+                """
+        )
+        # 渲染JSON内容，惰性模式下折叠的子树和分页未渲染的条目只记录下来，以 JSON 形式输出
+        lazy_values = []
+        search_index = _build_search_index(self.data) if self.searchable else None
+        self._write_tree(
+            out, lazy_values, search_index["sizes"] if search_index else None
+        )
+        out.write(
+            """
             </div>
         </div>
-        {script}
         """
+        )
+        # 每个惰性值单独放在一个 <script> 中，页面脚本在首次用到时才解析它，
+        # 页面中不会出现超过浏览器字符串长度上限的单个 JSON
+        for value in lazy_values:
+            out.write(f'<script type="application/json" data-json-lazy="{self.id}">')
+            if isinstance(value, JsonRef):
+                value.write_json(out)
+            else:
+                out.write(_dump_script_json(value))
+            out.write("</script>")
+        if search_index is not None:
+            out.write(
+                f'<script type="application/json" id="{self.id}-index">'
+                f"{_dump_script_json(search_index)}</script>"
+            )
+        out.write(
+            f"<script>DataViewerJsonView.init('{self.id}', {int(self.default_expand_level)});</script>"
+        )
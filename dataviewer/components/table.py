@@ -1,10 +1,30 @@
+import copy
+import datetime
+import decimal
+import hashlib
+import itertools
 import json
+import random
+import uuid
+from collections import deque
+from collections.abc import Mapping, Sequence, Sized
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import PurePath
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    TextIO, Tuple, Union)
 
+from ..core.assets import AssetStore, referenced_assets
+from ..core.cache import LRUCache
+from ..core.page import Page
 from ..renderers import (CellImageRenderer, CellRendererRegistry,
                          CellVideoRenderer, DefaultRenderer)
+from ..renderers.json_elision import (MAX_NUMERIC_ITEMS, MAX_STRING_LENGTH,
+                                      render_json_html)
 from .base import Component
+from .table_source import (ColumnarRows, StreamingRows, columns_from_arrow,
+                           columns_from_pandas)
 
 _INIT_CELL_RENDERER = False
 if not _INIT_CELL_RENDERER:
@@ -16,11 +36,208 @@ if not _INIT_CELL_RENDERER:
     _INIT_CELL_RENDERER = True
 
 
+# repr 只由内容决定的类型，行指纹中直接使用其 repr
+_STABLE_REPR_TYPES = (
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    uuid.UUID,
+    PurePath,
+)
+# 行指纹最多遍历的容器数，超过时该行不缓存（同时避免循环引用导致死循环）
+_MAX_FINGERPRINT_CONTAINERS = 100_000
+
+
+def _update_fingerprint(hasher: Any, value: Any) -> bool:
+    """把值的内容按类型写入哈希，遇到没有稳定编码的值时返回 False
+
+    NumPy 数组按 dtype、形状和原始字节计入，不受 repr 省略中间元素的影响；
+    repr 中带有内存地址等不稳定内容的对象不计入，调用方不应缓存这样的行。
+    """
+    parts = []
+    append = parts.append
+    containers = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is str:
+            append("s%d:" % len(item))
+            append(item)
+        elif item is None:
+            append("N")
+        elif kind is int or kind is float or kind is bool:
+            append("%s%r;" % (kind.__name__[0], item))
+        elif isinstance(item, (str, int, float, bytes) + _STABLE_REPR_TYPES):
+            text = repr(item)
+            append("r%s:%d:" % (kind.__qualname__, len(text)))
+            append(text)
+        else:
+            containers += 1
+            if containers > _MAX_FINGERPRINT_CONTAINERS:
+                return False
+            dtype = getattr(item, "dtype", None)
+            if isinstance(item, Mapping):
+                append("d%d:" % len(item))
+                for key, child in reversed(list(item.items())):
+                    stack.append(child)
+                    stack.append(key)
+            elif isinstance(item, (list, tuple)):
+                append("%s%d:" % ("l" if isinstance(item, list) else "t", len(item)))
+                stack.extend(reversed(item))
+            elif dtype is not None and hasattr(item, "tobytes") and hasattr(item, "shape"):
+                append("a%s%r:" % (dtype.str, item.shape))
+                if dtype.kind == "O":
+                    # object 数组的字节是指针，逐个计入其中的值
+                    stack.extend(reversed(item.ravel().tolist()))
+                else:
+                    hasher.update("".join(parts).encode("utf-8", "surrogatepass"))
+                    parts.clear()
+                    hasher.update(item.tobytes())
+            else:
+                return False
+    hasher.update("".join(parts).encode("utf-8", "surrogatepass"))
+    return True
+
+
+def _dump_script_json(value: Any) -> str:
+    """序列化为可以安全放进 <script> 标签的 JSON"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).replace(
+        "<", "\\u003c"
+    )
+
+
+def _init_render_worker(renderers: List[Any]) -> None:
+    """进程池初始化：在子进程中按主进程的配置重建单元格渲染器注册表"""
+    CellRendererRegistry.clear()
+    for renderer in renderers:
+        CellRendererRegistry.register(renderer)
+
+
+def _render_row_chunk(
+    table: "Table",
+    rows: List[Tuple[int, Dict[str, Any]]],
+    column_types: Dict[str, str],
+    cell_templates: Dict[Tuple[int, str], str],
+    assets: Optional[AssetStore] = None,
+) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+    """在子进程中渲染一批 (行号, 行)，按输入顺序返回每行的HTML
+
+    assets 为页面资源表的空白副本：base64 图片登记到其中，
+    连同HTML一起返回，由主进程并入页面的资源表。
+    """
+    if assets is None:
+        return table._render_rows(rows, column_types, cell_templates), []
+    with AssetStore.collect(assets) as store:
+        rows_html = table._render_rows(rows, column_types, cell_templates)
+    return rows_html, store.entries()
+
+
+def _init_virtual_table_runtime() -> None:
+    """向页面头部注入一次虚拟滚动表格的运行时脚本"""
+    if "virtual_table" in Page._init_flags:
+        return
+    Page._init_flags.add("virtual_table")
+
+    Page._additional_head_content = (
+        Page._additional_head_content
+        + """
+            <style>
+                .dv-virtual-cell {
+                    overflow: auto;
+                }
+            </style>
+            <script>
+                window.DataViewerVirtualTable = {
+                    overscan: 8,
+                    // 浏览器元素高度的上限约为 1700 万（Firefox）到 3300 万（Chrome）像素，
+                    // 总高度超过 maxHeight 时滚动位置按比例映射到行
+                    maxHeight: 10000000,
+                    init: function(id, rowHeight) {
+                        const viewport = document.getElementById(id + '-viewport');
+                        const table = document.getElementById(id);
+                        const tbody = table.querySelector('tbody');
+                        const payload = JSON.parse(document.getElementById(id + '-data').textContent);
+                        const rows = payload.rows;
+                        // 行数据被图片资源分段时，其余的行在带 data-rows 的脚本中
+                        for (const part of document.querySelectorAll('script[data-rows="' + id + '"]')) {
+                            for (const row of JSON.parse(part.textContent)) {
+                                rows.push(row);
+                            }
+                        }
+                        const cells = payload.cells;
+                        const colCount = table.querySelectorAll('thead th').length;
+                        const overscan = this.overscan;
+                        const totalHeight = rows.length * rowHeight;
+                        const height = Math.min(totalHeight, this.maxHeight);
+                        let scheduled = false;
+
+                        function spacer(height) {
+                            return height > 0
+                                ? '<tr style="height: ' + height + 'px;"><td colspan="' + colCount + '"></td></tr>'
+                                : '';
+                        }
+
+                        function renderRow(index) {
+                            const templates = cells[index % 2];
+                            const row = rows[index];
+                            let html = '<tr style="height: ' + rowHeight + 'px;">';
+                            for (let j = 0; j < row.length; j++) {
+                                html += templates[j]
+                                    + '<div class="dv-virtual-cell" style="max-height: ' + rowHeight + 'px;">'
+                                    + row[j] + '</div></td>';
+                            }
+                            return html + '</tr>';
+                        }
+
+                        function render() {
+                            scheduled = false;
+                            const scrollTop = viewport.scrollTop;
+                            const viewportHeight = viewport.clientHeight;
+                            // 滚动位置对应的内容位置，未超过 maxHeight 时两者相同
+                            const position = height === totalHeight ? scrollTop
+                                : scrollTop / Math.max(1, height - viewportHeight)
+                                    * Math.max(0, totalHeight - viewportHeight);
+                            let first = Math.max(0, Math.floor(position / rowHeight) - overscan);
+                            // 窗口中第一行的顶部：内容位置 position 显示在 scrollTop 处
+                            let top = scrollTop + first * rowHeight - position;
+                            while (top < 0) {
+                                first++;
+                                top += rowHeight;
+                            }
+                            const visible = Math.ceil(viewportHeight / rowHeight) + 2 * overscan;
+                            const last = Math.min(rows.length, first + visible);
+                            const parts = [spacer(top)];
+                            for (let i = first; i < last; i++) {
+                                parts.push(renderRow(i));
+                            }
+                            parts.push(spacer(height - top - (last - first) * rowHeight));
+                            tbody.innerHTML = parts.join('');
+                            if (window.DataViewerAssets) {
+                                window.DataViewerAssets.resolve(tbody);
+                            }
+                        }
+
+                        viewport.addEventListener('scroll', function() {
+                            if (!scheduled) {
+                                scheduled = true;
+                                window.requestAnimationFrame(render);
+                            }
+                        });
+                        render();
+                    }
+                };
+            </script>
+            """
+    )
+
+
 @dataclass
 class Table(Component):
     """表格组件"""
 
-    data: List[Dict[str, Any]]
+    data: Union[List[Dict[str, Any]], ColumnarRows, StreamingRows]
     columns: Optional[List[Dict[str, str]]] = None
     page_size: Optional[int] = None
     current_page: int = 1
@@ -29,6 +246,24 @@ class Table(Component):
     bordered: bool = True
     compact: bool = False
     max_row_height: Optional[int] = None
+    type_sample_size: int = 100
+    virtual: bool = False
+    virtual_height: int = 600
+    virtual_row_height: Optional[int] = None
+    page_url: Optional[Union[str, Callable[[int], str]]] = None
+    workers: Optional[int] = None
+    chunk_size: int = 1000  # 每批按列渲染的行数，也是并行模式的分块大小
+    row_cache_size: Optional[int] = None
+    max_rows: Optional[int] = None
+    batch_size: int = 1000
+    column_sample: str = "full"  # full, first, reservoir
+    column_sample_size: int = 1000
+    sparse_threshold: float = 0.5
+    json_max_string_length: Optional[int] = MAX_STRING_LENGTH
+    json_max_numeric_items: Optional[int] = MAX_NUMERIC_ITEMS
+
+    _COLUMN_SAMPLE_STRATEGIES = ("full", "first", "reservoir")
+    _COLUMN_TYPES = ("default", "long_text", "json", "image", "image_array", "mixed")
 
     # 预计算样式
     _TABLE_BASE_CLASSES = ["table-auto", "divide-y", "divide-gray-200", "bg-white"]
@@ -46,7 +281,7 @@ class Table(Component):
 
     def __init__(
         self,
-        data: List[Dict[str, Any]],
+        data: Union[List[Dict[str, Any]], ColumnarRows, Iterable[Dict[str, Any]]],
         columns: Optional[List[Dict[str, str]]] = None,
         page_size: Optional[int] = None,
         current_page: int = 1,
@@ -55,8 +290,40 @@ class Table(Component):
         bordered: bool = True,
         compact: bool = False,
         max_row_height: Optional[int] = None,
+        type_sample_size: int = 100,
+        virtual: bool = False,
+        virtual_height: int = 600,
+        virtual_row_height: Optional[int] = None,
+        page_url: Optional[Union[str, Callable[[int], str]]] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        row_cache_size: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        batch_size: int = 1000,
+        column_sample: str = "full",
+        column_sample_size: int = 1000,
+        sparse_threshold: float = 0.5,
+        json_max_string_length: Optional[int] = MAX_STRING_LENGTH,
+        json_max_numeric_items: Optional[int] = MAX_NUMERIC_ITEMS,
         id: Optional[str] = None,
     ):
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+        if column_sample not in self._COLUMN_SAMPLE_STRATEGIES:
+            raise ValueError(
+                f"不支持的列采样策略: {column_sample}，"
+                f"支持的策略有: {', '.join(self._COLUMN_SAMPLE_STRATEGIES)}"
+            )
+        self.column_sample = column_sample
+        self.column_sample_size = column_sample_size
+        self.sparse_threshold = sparse_threshold
+        self.sparse_columns: List[str] = []
+        # JSON 单元格中超过长度的字符串和数字数组只显示开头，点击标记显示完整内容（assets_dir 模式下链接到文件）
+        self.json_max_string_length = json_max_string_length
+        self.json_max_numeric_items = json_max_numeric_items
+        if not isinstance(data, (Sequence, StreamingRows)):
+            # 迭代器、生成器或 DB-API 游标：渲染时按批读取
+            data = StreamingRows(data, batch_size=batch_size, max_rows=max_rows)
         self.data = data
         self.columns = columns
         self.page_size = page_size
@@ -66,21 +333,36 @@ class Table(Component):
         self.bordered = bordered
         self.compact = compact
         self.max_row_height = max_row_height
+        self.type_sample_size = type_sample_size
+        self.virtual = virtual
+        self.virtual_height = virtual_height
+        self.virtual_row_height = virtual_row_height
+        self.page_url = page_url
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.row_cache_size = row_cache_size
+        # 可选的行HTML缓存，增量重新渲染时只渲染变化的行
+        self._row_cache = LRUCache(row_cache_size) if row_cache_size else None
+        self._column_types: Dict[str, str] = {}
 
         super().__init__(id=id)
 
+        if self.virtual:
+            _init_virtual_table_runtime()
+
         if self.columns is None:
             self._infer_columns()
 
-    def _get_column_type(self, value: Any) -> Tuple[bool, bool]:
-        """判断列类型"""
-        rendered = CellRendererRegistry.render(value)
-        is_image = rendered and "<img" in rendered
+    @staticmethod
+    def _is_image(value: Any) -> bool:
+        """判断值是否会由图片渲染器处理（只做匹配，不渲染）"""
+        return isinstance(CellRendererRegistry.get_renderer(value), CellImageRenderer)
+
+    def _get_column_type(self, value: Any) -> str:
+        """判断单个值的列类型"""
+        is_image = self._is_image(value)
         is_image_array = isinstance(value, list) and any(
-            isinstance(item, str)
-            and CellRendererRegistry.render(item)
-            and "<img" in CellRendererRegistry.render(item)
-            for item in value
+            isinstance(item, str) and self._is_image(item) for item in value
         )
         is_long_text = isinstance(value, str) and len(value) > 50
         is_json = isinstance(value, dict) or isinstance(value, list)
@@ -96,44 +378,199 @@ class Table(Component):
         else:
             return "default"
 
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any], **kwargs) -> "Table":
+        """从 {列名: 数组} 创建表格，数据保持列式存储，不转换为 list-of-dicts
+
+        Args:
+            columns: 列名到 list / NumPy 数组等可按下标访问序列的映射
+            **kwargs: 其他 Table 参数
+        """
+        return cls(data=ColumnarRows(dict(columns)), **kwargs)
+
+    @classmethod
+    def from_pandas(cls, df: Any, **kwargs) -> "Table":
+        """从 pandas DataFrame 创建表格，直接索引各列的 NumPy 数组"""
+        return cls(data=ColumnarRows(columns_from_pandas(df)), **kwargs)
+
+    @classmethod
+    def from_arrow(cls, table: Any, **kwargs) -> "Table":
+        """从 pyarrow Table 创建表格，尽量零拷贝地访问 Arrow 缓冲区"""
+        return cls(data=ColumnarRows(columns_from_arrow(table)), **kwargs)
+
+    def _sample_rows_for_columns(self) -> Iterable[Dict[str, Any]]:
+        """按 column_sample 策略选取用于推断列的行"""
+        if isinstance(self.data, StreamingRows):
+            rows = self.data.head()
+        else:
+            rows = self.data
+
+        if self.column_sample == "full":
+            return rows
+        if self.column_sample == "first":
+            return itertools.islice(rows, self.column_sample_size)
+
+        # reservoir：在全部数据中均匀随机抽样，随机种子固定以保证列顺序稳定
+        rng = random.Random(0)
+        if isinstance(rows, Sequence):
+            k = min(self.column_sample_size, len(rows))
+            return [rows[i] for i in sorted(rng.sample(range(len(rows)), k))]
+        reservoir = []
+        for i, row in enumerate(rows):
+            if i < self.column_sample_size:
+                reservoir.append(row)
+            else:
+                j = rng.randint(0, i)
+                if j < self.column_sample_size:
+                    reservoir[j] = row
+        return reservoir
+
     def _infer_columns(self) -> None:
-        """从数据中推断列信息"""
+        """从数据中推断列信息
+
+        用有序的 dict 作为所有键的并集，复杂度与 行数×列数 成线性；
+        同时统计每个键出现的行数，出现比例低于 sparse_threshold 的列记入 sparse_columns。
+        """
+        self.sparse_columns = []
         if not self.data:
             self.columns = []
             return
 
-        # 使用列表推导式优化性能
-        all_keys = []
-        for row in self.data:
-            for key in row:
-                if key not in all_keys:
-                    all_keys.append(key)
+        if isinstance(self.data, ColumnarRows) or (
+            isinstance(self.data, StreamingRows) and self.data.is_cursor
+        ):
+            # 列式数据和游标的列名是已知的，无需遍历行
+            all_keys = self.data.keys()
+        else:
+            key_counts: Dict[str, int] = {}
+            n_rows = 0
+            for row in self._sample_rows_for_columns():
+                n_rows += 1
+                for key in row:
+                    key_counts[key] = key_counts.get(key, 0) + 1
+
+            all_keys = list(key_counts)
+            self.sparse_columns = [
+                key
+                for key, count in key_counts.items()
+                if count < n_rows * self.sparse_threshold
+            ]
 
         self.columns = [
             {"key": key, "title": key.replace("_", " ").title()} for key in all_keys
         ]
 
+    def _infer_column_types(self) -> Dict[str, str]:
+        """按列推断类型
+
+        列式数据优先根据 dtype 判断；其余列只根据前 ``type_sample_size`` 行中的
+        非空值判断一次类型；采样值类型不一致的列标记为 ``mixed``，渲染时退化为逐个单元格判断。
+        """
+        if isinstance(self.data, StreamingRows):
+            sample = self.data.head()[: self.type_sample_size]
+        else:
+            sample = self.data[: self.type_sample_size]
+        column_types = {}
+        for col in self.columns:
+            key = col["key"]
+            if isinstance(self.data, ColumnarRows):
+                # 数值等 dtype 的列无需查看具体值
+                hint = self.data.column_type_hint(key)
+                if hint is not None:
+                    column_types[key] = hint
+                    continue
+
+            seen = set()
+            for row in sample:
+                value = row.get(key)
+                if value is None or (isinstance(value, str) and not value):
+                    continue
+                seen.add(self._get_column_type(value))
+                if len(seen) > 1:
+                    break
+
+            if not seen:
+                column_types[key] = "default"
+            elif len(seen) == 1:
+                column_types[key] = seen.pop()
+            else:
+                column_types[key] = "mixed"
+
+        self._column_types = column_types
+        return column_types
+
+    @property
+    def column_types(self) -> Dict[str, str]:
+        """最近一次推断出的列类型"""
+        if not self._column_types and self.data:
+            self._infer_column_types()
+        return self._column_types
+
+    def _render_json_cell(self, value: Dict[str, Any]) -> Optional[str]:
+        """把 dict 渲染为格式化的 JSON，无法序列化时返回 None
+
+        长字符串和大的数字数组会被截断并标注大小，base64 图片显示为缩略图，
+        单元格的 HTML 大小因此有上限。
+        """
+        try:
+            value = render_json_html(
+                value,
+                indent=4,
+                max_string_length=self.json_max_string_length,
+                max_numeric_items=self.json_max_numeric_items,
+            )
+        except Exception:
+            return None
+        value = f"<pre>{value}</pre>"
+        if self.max_row_height:
+            value = f'<div style="max-height: {self.max_row_height}px; overflow: scroll;">{value}</div>'
+        return value
+
+    def _render_json_list(self, value: List[Any]) -> Optional[str]:
+        """按 DefaultRenderer 的格式渲染列表，但使用表格的截断设置，无法序列化时返回 None"""
+        try:
+            return render_json_html(
+                value,
+                indent=2,
+                max_string_length=self.json_max_string_length,
+                max_numeric_items=self.json_max_numeric_items,
+            )
+        except Exception:
+            return None
+
+    def _render_cells(self, values: List[Any], col_types: List[str]) -> List[str]:
+        """按列批量渲染单元格内容，结果顺序与输入一致
+
+        dict 和原本由 DefaultRenderer 处理的列表按表格的 JSON 截断设置渲染，
+        其余值一次性交给 CellRendererRegistry.render_many，
+        渲染器可以在整列上分摊开销（如批量转义 HTML）。
+        """
+        results: List[Optional[str]] = [None] * len(values)
+        pending = []
+        for position, (value, col_type) in enumerate(zip(values, col_types)):
+            if col_type not in ("image", "image_array"):
+                if isinstance(value, dict):
+                    results[position] = self._render_json_cell(value)
+                elif isinstance(value, list) and isinstance(
+                    CellRendererRegistry.get_renderer(value), DefaultRenderer
+                ):
+                    results[position] = self._render_json_list(value)
+            if results[position] is None:
+                pending.append(position)
+
+        rendered = CellRendererRegistry.render_many([values[p] for p in pending])
+        for position, html in zip(pending, rendered):
+            results[position] = html if html is not None else str(values[position])
+        return results
+
     def _render_cell(self, value: Any, col_type: str) -> str:
         """渲染单元格内容"""
-        if col_type in ["image", "image_array"]:
-            return CellRendererRegistry.render(value)
-
-        if isinstance(value, dict):
-            # 优化一下json的显示
-            try:
-                value = json.dumps(value, indent=4, ensure_ascii=False)
-                value = f"<pre>{value}</pre>"
-                if self.max_row_height:
-                    value = f'<div style="max-height: {self.max_row_height}px; overflow: scroll;">{value}</div>'
-                return value
-            except Exception as e:
-                pass
-
-        rendered = CellRendererRegistry.render(value)
-        return rendered if rendered is not None else str(value)
+        return self._render_cells([value], [col_type])[0]
 
     def get_cell_style(self, col_type: str) -> str:
-        if col_type == "image_array":
+        if col_type == "mixed":
+            return 'style="max-width: 1200px;min-width: 300px;"'
+        elif col_type == "image_array":
             return 'style="max-width: 1200px;min-width: 800px;"'
         elif col_type == "image":
             return 'style="max-width: 1200px;min-width: 300px;"'
@@ -144,11 +581,382 @@ class Table(Component):
         else:
             return 'style="max-width: 600px;min-width: 120px;"'
 
-    def to_html(self) -> str:
+    @property
+    def page_count(self) -> int:
+        """分页后的总页数，未设置 page_size 或行数未知（惰性数据源）时为 1"""
+        row_count = self._get_row_count()
+        if not self.page_size or not row_count:
+            return 1
+        return max(1, -(-row_count // self.page_size))
+
+    @property
+    def page_count_known(self) -> bool:
+        """page_count 是否准确；惰性数据源在读完之前不知道总行数"""
+        return not (self.page_size and isinstance(self.data, StreamingRows))
+
+    def _get_row_count(self) -> Optional[int]:
+        """受 max_rows 限制的总行数，惰性数据源的行数未知，返回 None"""
+        if isinstance(self.data, StreamingRows):
+            return None
+        if self.max_rows is not None:
+            return min(len(self.data), self.max_rows)
+        return len(self.data)
+
+    def _get_page_range(self):
+        """当前页在 data 中的起止下标，页码越界时取最近的合法页"""
+        row_count = self._get_row_count()
+        if not self.page_size:
+            return 0, row_count
+        page = min(max(self.current_page, 1), self.page_count)
+        start = (page - 1) * self.page_size
+        return start, min(start + self.page_size, row_count)
+
+    def _get_display_rows(self) -> Iterable[Dict[str, Any]]:
+        """当前页要渲染的行；惰性数据源返回按批读取的迭代器"""
+        if isinstance(self.data, StreamingRows):
+            if not self.page_size:
+                return iter(self.data)
+            start = (max(self.current_page, 1) - 1) * self.page_size
+            return itertools.islice(self.data, start, start + self.page_size)
+        start, end = self._get_page_range()
+        return self.data[start:end]
+
+    def _get_page_href(self, page: int) -> str:
+        if callable(self.page_url):
+            return self.page_url(page)
+        return self.page_url.format(page=page)
+
+    def _write_pagination(self, out: TextIO) -> None:
+        """写出分页导航，只列出当前页附近的页码"""
+        page_count = self.page_count
+        if page_count <= 1 or self.page_url is None:
+            return
+
+        start, end = self._get_page_range()
+        current = start // self.page_size + 1
+        link_classes = "px-3 py-1 rounded border border-gray-300 hover:bg-gray-100"
+        current_classes = "px-3 py-1 rounded border border-blue-500 bg-blue-500 text-white"
+
+        pages = sorted(
+            {1, page_count, *range(max(1, current - 2), min(page_count, current + 2) + 1)}
+        )
+        links = []
+        if current > 1:
+            links.append(
+                '<a class="%s" href="%s">上一页</a>'
+                % (link_classes, self._get_page_href(current - 1))
+            )
+        previous = 0
+        for page in pages:
+            if page - previous > 1:
+                links.append('<span class="px-2">…</span>')
+            if page == current:
+                links.append('<span class="%s">%d</span>' % (current_classes, page))
+            else:
+                links.append(
+                    '<a class="%s" href="%s">%d</a>'
+                    % (link_classes, self._get_page_href(page), page)
+                )
+            previous = page
+        if current < page_count:
+            links.append(
+                '<a class="%s" href="%s">下一页</a>'
+                % (link_classes, self._get_page_href(current + 1))
+            )
+
+        out.write(
+            """
+        <nav id="%s-pagination" class="flex items-center justify-between mt-4 text-sm text-gray-700">
+            <span>第 %d-%d 行，共 %d 行</span>
+            <div class="flex items-center gap-1">%s</div>
+        </nav>"""
+            % (self.id, start + 1, end, self._get_row_count(), "".join(links))
+        )
+
+    def _render_rows(
+        self,
+        rows: List[Tuple[int, Dict[str, Any]]],
+        column_types: Dict[str, str],
+        cell_templates: Dict[Tuple[int, str], str],
+    ) -> List[str]:
+        """按列批量渲染一批 (行号, 行)，按输入顺序返回每行的HTML
+
+        普通模式每行是 <tr>，虚拟滚动模式每行是单元格HTML的 JSON 数组。
+        """
+        rendered_columns = []
+        for col in self.columns:
+            key = col["key"]
+            values = [row.get(key, "") for _, row in rows]
+            col_type = column_types[key]
+            if col_type == "mixed":
+                col_types = [self._get_column_type(value) for value in values]
+            else:
+                col_types = [col_type] * len(values)
+            rendered_columns.append((col_types, self._render_cells(values, col_types)))
+
+        if self.virtual:
+            return [
+                _dump_script_json([cells[index] for _, cells in rendered_columns])
+                for index in range(len(rows))
+            ]
+
+        rows_html = []
+        for index, (i, _) in enumerate(rows):
+            parity = i % 2
+            cells = []
+            for col_types, rendered in rendered_columns:
+                cells.append(cell_templates[parity, col_types[index]])
+                cells.append(rendered[index])
+                cells.append("</td>")
+            rows_html.append("<tr>%s</tr>" % "".join(cells))
+        return rows_html
+
+    def _compile_cell_templates(
+        self, base_cell_classes: List[str]
+    ) -> Dict[Tuple[int, str], str]:
+        """每次渲染预先拼好各 (行奇偶, 列类型) 组合的 <td> 开始标签
+
+        单元格的类名只取决于行的奇偶，样式只取决于列类型，
+        因此逐个单元格渲染时只需查表并填入内容。
+        """
+        templates = {}
+        for parity in (0, 1):
+            cell_classes = base_cell_classes.copy()
+            if self.striped and parity == 1:
+                cell_classes.append("bg-gray-50")
+            if self.hoverable:
+                cell_classes.append("hover:bg-gray-100")
+            class_str = " ".join(cell_classes)
+            for col_type in self._COLUMN_TYPES:
+                templates[parity, col_type] = '<td class="%s" %s>' % (
+                    class_str,
+                    self.get_cell_style(col_type),
+                )
+        return templates
+
+    def _render_row(
+        self,
+        i: int,
+        row: Dict[str, Any],
+        column_types: Dict[str, str],
+        cell_templates: Dict[Tuple[int, str], str],
+    ) -> str:
+        """渲染单独一行"""
+        return self._render_rows([(i, row)], column_types, cell_templates)[0]
+
+    def _get_render_config_key(
+        self, column_types: Dict[str, str], cell_templates: Dict[Tuple[int, str], str]
+    ) -> int:
+        """影响行HTML的列配置和渲染器配置的指纹，作为行缓存键的一部分"""
+        store = AssetStore.current()
+        return hash(
+            (
+                tuple((col["key"], column_types[col["key"]]) for col in self.columns),
+                self.virtual,
+                self.max_row_height,
+                self.json_max_string_length,
+                self.json_max_numeric_items,
+                tuple(sorted(cell_templates.items())),
+                # 页面资源表开启时 base64 图片输出为引用
+                store.mode if store is not None else None,
+                # 单元格渲染器的替换或配置修改（宽度、缩略图目录等）同样改变行HTML
+                CellRendererRegistry.config_key(),
+            )
+        )
+
+    def _get_row_cache_key(
+        self, i: int, row: Dict[str, Any], config_key: int
+    ) -> Optional[Tuple]:
+        """行缓存键：行内容的稳定指纹 + 行奇偶 + 列配置
+
+        行中有无法按内容计入指纹的值时返回 None，该行每次都重新渲染。
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        values = tuple(row.get(col["key"], "") for col in self.columns)
+        if not _update_fingerprint(hasher, values):
+            return None
+        parity = i % 2 if self.striped and not self.virtual else 0
+        return hasher.digest(), parity, config_key
+
+    def _cache_get(self, cache: LRUCache, key: Optional[Tuple]) -> Optional[str]:
+        """读取缓存的行HTML，并把该行引用的资源重新登记到当前页面"""
+        if key is None:
+            return None
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        row_html, assets = entry
+        if assets:
+            AssetStore.current().add_entries(assets)
+        return row_html
+
+    def _cache_put(
+        self,
+        cache: LRUCache,
+        key: Optional[Tuple],
+        row_html: str,
+        recorded: Dict[str, Tuple[str, str]],
+    ) -> None:
+        """缓存行HTML，同时记下它引用的资源，命中时页面仍能输出这些资源
+
+        recorded 为渲染该行时登记的资源 {键: (mime, 内容)}，见 AssetStore.record。
+        key 为 None（行内容没有稳定指纹）时不缓存。
+        """
+        if key is None:
+            return
+        assets = tuple(
+            (asset, *recorded[asset])
+            for asset in dict.fromkeys(referenced_assets(row_html))
+            if asset in recorded
+        )
+        cache.put(key, (row_html, assets))
+
+    def row_cache_info(self) -> Dict[str, int]:
+        """行缓存的命中/未命中/淘汰计数，未开启行缓存时返回空字典"""
+        if self._row_cache is None:
+            return {}
+        return self._row_cache.stats()
+
+    def _iter_rendered_rows(
+        self,
+        display_data: List[Dict[str, Any]],
+        column_types: Dict[str, str],
+        cell_templates: Dict[Tuple[int, str], str],
+    ) -> Iterator[str]:
+        """按顺序逐个返回渲染好的行（并行模式下每次返回一段连续的行）
+
+        串行模式下每 chunk_size 行按列批量渲染一次。
+        """
+        if self.workers and self.workers > 1 and not (
+            isinstance(display_data, Sized) and len(display_data) <= self.chunk_size
+        ):
+            yield from self._iter_rendered_rows_parallel(
+                display_data, column_types, cell_templates
+            )
+            return
+
+        cache = self._row_cache
+        config_key = (
+            self._get_render_config_key(column_types, cell_templates)
+            if cache is not None
+            else None
+        )
+        store = AssetStore.current()
+        rows_iter = iter(display_data)
+        for start in itertools.count(0, self.chunk_size):
+            chunk = list(enumerate(itertools.islice(rows_iter, self.chunk_size), start))
+            if not chunk:
+                break
+            if cache is None:
+                yield from self._render_rows(chunk, column_types, cell_templates)
+                continue
+
+            keys = [self._get_row_cache_key(i, row, config_key) for i, row in chunk]
+            chunk_html = [self._cache_get(cache, key) for key in keys]
+            missing = [pos for pos, html in enumerate(chunk_html) if html is None]
+            if missing:
+                recording = store.record() if store is not None else nullcontext({})
+                with recording as recorded:
+                    rendered = self._render_rows(
+                        [chunk[pos] for pos in missing], column_types, cell_templates
+                    )
+                for pos, row_html in zip(missing, rendered):
+                    chunk_html[pos] = row_html
+                    self._cache_put(cache, keys[pos], row_html, recorded)
+            yield from chunk_html
+
+    def _iter_rendered_rows_parallel(
+        self,
+        display_data: List[Dict[str, Any]],
+        column_types: Dict[str, str],
+        cell_templates: Dict[Tuple[int, str], str],
+    ) -> Iterator[str]:
+        """把行按 chunk_size 分块交给进程池渲染，并按原顺序返回结果
+
+        开启行缓存时只把未命中的行交给子进程。
+        同时在途的分块数量限制为 workers 的两倍，避免结果堆积在内存中。
+        """
+        separator = "," if self.virtual else ""
+        store = AssetStore.current()
+        cache = self._row_cache
+        config_key = (
+            self._get_render_config_key(column_types, cell_templates)
+            if cache is not None
+            else None
+        )
+
+        worker_table = copy.copy(self)
+        worker_table.data = []
+        worker_table.page_url = None
+        worker_table._row_cache = None
+
+        def collect(pending_chunk) -> str:
+            future, chunk_html, keys, missing = pending_chunk
+            rows_html, assets = future.result()
+            if assets:
+                store.add_entries(assets)
+            recorded = {asset: (mime, payload) for asset, mime, payload in assets}
+            for position, row_html in zip(missing, rows_html):
+                chunk_html[position] = row_html
+                if cache is not None:
+                    self._cache_put(cache, keys[position], row_html, recorded)
+            return separator.join(chunk_html)
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_render_worker,
+            initargs=(CellRendererRegistry.get_renderers(),),
+        ) as executor:
+            pending = deque()
+            rows_iter = iter(display_data)
+            for start in itertools.count(0, self.chunk_size):
+                chunk = list(itertools.islice(rows_iter, self.chunk_size))
+                if not chunk:
+                    break
+                keys, chunk_html = [], []
+                for i, row in enumerate(chunk, start):
+                    key = (
+                        self._get_row_cache_key(i, row, config_key)
+                        if cache is not None
+                        else None
+                    )
+                    keys.append(key)
+                    chunk_html.append(
+                        self._cache_get(cache, key) if cache is not None else None
+                    )
+                missing = [pos for pos, html in enumerate(chunk_html) if html is None]
+                rows = []
+                for pos in missing:
+                    row = chunk[pos]
+                    rows.append((start + pos, row if isinstance(row, dict) else dict(row)))
+                future = executor.submit(
+                    _render_row_chunk,
+                    worker_table,
+                    rows,
+                    column_types,
+                    cell_templates,
+                    store.spawn() if store is not None else None,
+                )
+                pending.append((future, chunk_html, keys, missing))
+                if len(pending) >= 2 * self.workers:
+                    yield collect(pending.popleft())
+            while pending:
+                yield collect(pending.popleft())
+
+    def _get_virtual_row_height(self, column_types: Dict[str, str]) -> int:
+        """虚拟滚动模式下的固定行高，未指定时按列类型估算"""
+        if self.virtual_row_height:
+            return self.virtual_row_height
+        if any(t != "default" for t in column_types.values()):
+            return 200
+        return 48
+
+    def write_html(self, out: TextIO) -> None:
         if not self.data:
-            return ""
+            return
 
-        display_data = self.data
+        # 只渲染当前页的数据
+        display_data = self._get_display_rows()
 
         # 构建表格类名
         table_classes = self._TABLE_BASE_CLASSES.copy()
@@ -160,18 +968,17 @@ class Table(Component):
             self._CELL_COMPACT_CLASSES if self.compact else self._CELL_BASE_CLASSES
         )
 
+        # 每次渲染按列推断一次类型
+        column_types = self._infer_column_types()
+
         # 构建表格头部
         header_cells = []
-
-        # 预先获取第一行数据
-        first_row = self.data[0]
         for col in self.columns:
             key = col["key"]
-            value = first_row.get(key)
 
             header_classes = [*self._HEADER_BASE_CLASSES, *base_cell_classes]
 
-            col_type = self._get_column_type(value)
+            col_type = column_types[key]
             style = self.get_cell_style(col_type)
 
             header_cells.append(
@@ -179,45 +986,99 @@ class Table(Component):
                 % (" ".join(header_classes), style, col.get("title", key))
             )
 
-        # 构建表格内容
-        rows_html = []
-        for i, row in enumerate(display_data):
-            cells = []
-            for col in self.columns:
-                key = col["key"]
-                value = row.get(key, "")
-
-                col_type = self._get_column_type(value)
-                rendered_value = self._render_cell(value, col_type)
-
-                cell_classes = base_cell_classes.copy()
-                if self.striped and i % 2 == 1:
-                    cell_classes.append("bg-gray-50")
-                if self.hoverable:
-                    cell_classes.append("hover:bg-gray-100")
-
-                width_style = self.get_cell_style(col_type)
-
-                cells.append(
-                    '<td class="%s" %s>%s</td>'
-                    % (" ".join(cell_classes), width_style, rendered_value)
-                )
-
-            rows_html.append("<tr>%s</tr>" % "".join(cells))
+        if self.virtual:
+            scroll_attrs = (
+                'id="%s-viewport" class="overflow-auto rounded-lg" style="max-height: %dpx;"'
+                % (self.id, self.virtual_height)
+            )
+        else:
+            scroll_attrs = 'class="overflow-x-auto rounded-lg"'
 
-        return """
+        out.write(
+            """
         <div class="relative rounded-lg shadow">
-            <div class="overflow-x-auto rounded-lg">
+            <div %s>
                 <table id="%s" class="%s">
                     <thead class="sticky top-0 z-50 bg-gray-50 shadow-sm backdrop-blur-sm bg-opacity-75">
                         <tr>%s</tr>
                     </thead>
-                    <tbody class="divide-y divide-gray-200 bg-white">%s</tbody>
+                    <tbody class="divide-y divide-gray-200 bg-white">"""
+            % (scroll_attrs, self.id, " ".join(table_classes), "".join(header_cells))
+        )
+
+        cell_templates = self._compile_cell_templates(base_cell_classes)
+        rows_html = self._iter_rendered_rows(display_data, column_types, cell_templates)
+        if self.virtual:
+            self._write_virtual_rows(out, rows_html, column_types, cell_templates)
+            self._write_pagination(out)
+            return
+
+        # 逐行写出表格内容，内存占用与行数无关；
+        # 积累的 base64 图片在行之间分段输出，不会在页面结束前一直占用内存
+        store = AssetStore.current()
+        for row_html in rows_html:
+            out.write(row_html)
+            if store is not None:
+                store.write_pending(out)
+
+        out.write(
+            """</tbody>
                 </table>
             </div>
-        </div>""" % (
-            self.id,
-            " ".join(table_classes),
-            "".join(header_cells),
-            "".join(rows_html),
+        </div>"""
+        )
+        if store is not None:
+            store.write_html(out)
+        self._write_pagination(out)
+
+    def _write_virtual_rows(
+        self,
+        out: TextIO,
+        rows_html: Iterator[str],
+        column_types: Dict[str, str],
+        cell_templates: Dict[Tuple[int, str], str],
+    ) -> None:
+        """虚拟滚动模式：tbody 留空，行数据以紧凑 JSON 写出，由页面脚本只渲染可见窗口
+
+        每行是单元格HTML组成的数组，单元格仍由现有渲染器生成；
+        各列奇偶行的 <td> 开始标签只写一次。
+        积累的 base64 图片需要输出时，行数据在此处截断，
+        剩余的行写入后续带 data-rows 属性的 <script>，由运行时依次拼接。
+        """
+        column_templates = [
+            [cell_templates[parity, column_types[col["key"]]] for col in self.columns]
+            for parity in (0, 1)
+        ]
+
+        out.write(
+            """</tbody>
+                </table>
+            </div>
+        </div>
+        <script type="application/json" id="%s-data">{"cells": %s, "rows": ["""
+            % (self.id, _dump_script_json(column_templates))
+        )
+        store = AssetStore.current()
+        closing = "]}"
+        first = True
+        for row_html in rows_html:
+            if not first:
+                out.write(",")
+            out.write(row_html)
+            first = False
+            if store is not None and store.needs_flush:
+                out.write("%s</script>" % closing)
+                store.write_html(out)
+                out.write(
+                    '\n        <script type="application/json" data-rows="%s">[' % self.id
+                )
+                closing = "]"
+                first = True
+        out.write("%s</script>" % closing)
+        if store is not None:
+            store.write_html(out)
+        out.write(
+            """
+        <script>DataViewerVirtualTable.init("%s", %d);</script>"""
+            % (self.id, self._get_virtual_row_height(column_types))
         )
@@ -0,0 +1,261 @@
+import bisect
+import itertools
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional
+
+# 这些 dtype 的列不可能是图片、视频或 JSON，直接按普通列渲染
+_PLAIN_DTYPE_KINDS = set("biufcmM")
+_PLAIN_ARROW_TYPES = (
+    "int",
+    "uint",
+    "float",
+    "double",
+    "halffloat",
+    "bool",
+    "decimal",
+    "date",
+    "time",
+    "timestamp",
+    "duration",
+)
+
+
+# 比微秒更细的时间单位，datetime / timedelta 无法表示，.item() 会返回整数
+_SUB_MICROSECOND_UNITS = ("ns", "ps", "fs", "as")
+
+
+def _to_python(value: Any) -> Any:
+    """把 NumPy 标量转换为对应的 Python 值，其余值原样返回"""
+    if getattr(value, "shape", None) == () and hasattr(value, "item"):
+        if getattr(value.dtype, "kind", None) in ("m", "M"):
+            return _datetime_to_python(value)
+        return value.item()
+    return value
+
+
+def _datetime_to_python(value: Any) -> Any:
+    """把 datetime64 / timedelta64 标量转换为 datetime / timedelta，NaT 转换为 None
+
+    纳秒等更细的单位先截断到微秒；超出 datetime 表示范围的值转换为字符串。
+    """
+    import numpy as np
+
+    unit, _ = np.datetime_data(value.dtype)
+    if unit in _SUB_MICROSECOND_UNITS:
+        value = value.astype(value.dtype.name.replace(f"[{unit}]", "[us]"))
+    result = value.item()
+    if isinstance(result, int):
+        return str(value)
+    return result
+
+
+class _ArrowColumn:
+    """对 pyarrow ChunkedArray 的零拷贝按下标访问"""
+
+    def __init__(self, chunked: Any):
+        self.chunks = list(chunked.chunks)
+        self.type = chunked.type
+        self.offsets = []
+        offset = 0
+        for chunk in self.chunks:
+            self.offsets.append(offset)
+            offset += len(chunk)
+        self.length = offset
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> Any:
+        chunk_index = bisect.bisect_right(self.offsets, index) - 1
+        return self.chunks[chunk_index][index - self.offsets[chunk_index]].as_py()
+
+
+class ColumnarRow(Mapping):
+    """列式数据中的一行，取值时直接索引对应的列数组"""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: Dict[str, Any], index: int):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return _to_python(self._columns[key][self._index])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        column = self._columns.get(key)
+        if column is None:
+            return default
+        return _to_python(column[self._index])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+
+class ColumnarRows(Sequence):
+    """按列存储的表格数据
+
+    以 {列名: 数组} 的形式保存数据，数组可以是 list、NumPy 数组或 pyarrow 列，
+    取行时只返回轻量的 ColumnarRow 视图，不会转换成 list-of-dicts；切片同样返回视图。
+    """
+
+    def __init__(
+        self, columns: Dict[str, Any], start: int = 0, stop: Optional[int] = None
+    ):
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"所有列的长度必须一致，实际长度: {sorted(lengths)}")
+        self._columns = columns
+        total = lengths.pop() if lengths else 0
+        self._start = start
+        self._stop = total if stop is None else stop
+
+    def keys(self) -> List[str]:
+        """列名列表"""
+        return list(self._columns)
+
+    def column_type_hint(self, key: str) -> Optional[str]:
+        """根据列的 dtype 推断列类型，无法仅凭 dtype 判断时返回 None"""
+        column = self._columns.get(key)
+        dtype = getattr(column, "dtype", None)
+        if dtype is not None and getattr(dtype, "kind", None) in _PLAIN_DTYPE_KINDS:
+            return "default"
+        if isinstance(column, _ArrowColumn) and str(column.type).startswith(
+            _PLAIN_ARROW_TYPES
+        ):
+            return "default"
+        return None
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return ColumnarRows(
+                self._columns, self._start + start, self._start + max(start, stop)
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return ColumnarRow(self._columns, self._start + index)
+
+    def __iter__(self) -> Iterator[ColumnarRow]:
+        columns = self._columns
+        for index in range(self._start, self._stop):
+            yield ColumnarRow(columns, index)
+
+
+def columns_from_pandas(df: Any) -> Dict[str, Any]:
+    """取出 DataFrame 各列底层的 NumPy 数组（数值列不复制）
+
+    可空的扩展类型（``string``、``Int64``、``boolean`` 等）转换为 object 数组，
+    其中的 ``pd.NA`` 替换为 None，整数列也不会因空值变成浮点数。
+    """
+    import numpy as np
+
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, np.dtype):
+            columns[str(name)] = series.to_numpy()
+        else:
+            columns[str(name)] = series.to_numpy(dtype=object, na_value=None)
+    return columns
+
+
+def columns_from_arrow(table: Any) -> Dict[str, Any]:
+    """把 pyarrow Table 的各列包装为可按下标访问的列
+
+    单块且无空值的数值列直接使用零拷贝的 NumPy 视图，其余列按块索引取值。
+    """
+    columns = {}
+    for name in table.column_names:
+        chunked = table.column(name)
+        column = None
+        if chunked.num_chunks == 1:
+            try:
+                column = chunked.chunk(0).to_numpy(zero_copy_only=True)
+            except Exception:
+                column = None
+        columns[name] = column if column is not None else _ArrowColumn(chunked)
+    return columns
+
+
+def is_cursor(source: Any) -> bool:
+    """判断是否为 DB-API 游标（如 sqlite3.Cursor）"""
+    return hasattr(source, "fetchmany") and hasattr(source, "description")
+
+
+class StreamingRows:
+    """惰性数据源：任意可迭代对象或 DB-API 游标，渲染时按批读取
+
+    首批数据会被提前读取，用于推断列名和列类型；其余数据在流式渲染时才读取，
+    因此整个数据集不会同时存在于内存中。数据源只能完整遍历一次。
+    """
+
+    def __init__(
+        self, source: Any, batch_size: int = 1000, max_rows: Optional[int] = None
+    ):
+        if batch_size <= 0:
+            raise ValueError("batch_size 必须大于 0")
+        self._source = source
+        self._batch_size = batch_size
+        self._max_rows = max_rows
+        self._batches = self._iter_batches()
+        self._head: Optional[List[Dict[str, Any]]] = None
+        self._consumed = False
+
+    def _iter_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        remaining = self._max_rows
+        cursor = is_cursor(self._source)
+        iterator = None if cursor else iter(self._source)
+        names = None
+        while remaining is None or remaining > 0:
+            size = self._batch_size if remaining is None else min(self._batch_size, remaining)
+            if cursor:
+                rows = self._source.fetchmany(size)
+                if names is None and rows:
+                    names = [column[0] for column in self._source.description]
+                batch = [dict(zip(names, row)) for row in rows]
+            else:
+                batch = list(itertools.islice(iterator, size))
+            if not batch:
+                return
+            if remaining is not None:
+                remaining -= len(batch)
+            yield batch
+
+    @property
+    def is_cursor(self) -> bool:
+        """数据源是否为 DB-API 游标"""
+        return is_cursor(self._source)
+
+    def head(self) -> List[Dict[str, Any]]:
+        """首批数据（只读取一次）"""
+        if self._head is None:
+            self._head = next(self._batches, [])
+        return self._head
+
+    def keys(self) -> List[str]:
+        """列名：游标取自 description，其他数据源取首批数据中出现过的键"""
+        if self.is_cursor and self._source.description:
+            return [column[0] for column in self._source.description]
+        return list(dict.fromkeys(key for row in self.head() for key in row))
+
+    def __bool__(self) -> bool:
+        return bool(self.head())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._consumed:
+            raise RuntimeError("惰性数据源只能遍历一次")
+        self._consumed = True
+        yield from self.head()
+        for batch in self._batches:
+            yield from batch
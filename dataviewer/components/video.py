@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, TextIO
 
 from .base import Component
 
@@ -16,7 +16,7 @@ class Video(Component):
     def __init__(self, id: Optional[str] = None, **kwargs):
         super().__init__(id=id, **kwargs)
 
-    def to_html(self) -> str:
+    def write_html(self, out: TextIO) -> None:
         # Handle styles
         style = []
         if self.width:
@@ -34,7 +34,7 @@ class Video(Component):
 
         width = f' width="{self.width}px"' if self.width else ""
         height = f' height="{self.height}px"' if self.height else ""
-        return (
+        out.write(
             f'<video{width}{height} controls loading="lazy">'
             f'<source src="{self.src}" type="video/mp4"></video>'
         )
@@ -0,0 +1,331 @@
+import base64
+import binascii
+import contextvars
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from contextlib import contextmanager
+from typing import (Dict, Hashable, Iterable, Iterator, List, Optional, Set,
+                    TextIO, Tuple)
+from urllib.parse import quote
+
+# Also matches the JSON-escaped form (data-asset=\"...\") of virtual table rows
+_ASSET_REF = re.compile(r'data-(?:text-)?asset=\\?"([0-9a-f]{32})')
+_BASE64_PAYLOAD = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+# Runtime written once per page: turns the embedded payloads into blob URLs
+# and points every <img data-asset> (or <a data-asset> link) at them.
+# Payloads arrive in several chunks as the page streams; references to a
+# payload written by an earlier chunk are resolved by the next chunk or
+# once the document has loaded. Components that insert HTML after load
+# (e.g. the virtual table) call DataViewerAssets.resolve(root).
+_ASSETS_RUNTIME = """
+    <script>
+        window.DataViewerAssets = window.DataViewerAssets || {
+            urls: {},
+            load: function(assets) {
+                for (const key in assets) {
+                    const mime = assets[key][0];
+                    try {
+                        const bytes = atob(assets[key][1]);
+                        const buffer = new Uint8Array(bytes.length);
+                        for (let i = 0; i < bytes.length; i++) {
+                            buffer[i] = bytes.charCodeAt(i);
+                        }
+                        this.urls[key] = URL.createObjectURL(new Blob([buffer], {type: mime}));
+                    } catch (e) {
+                        // Not valid base64, let the browser decode the data URI itself
+                        this.urls[key] = 'data:' + mime + ';base64,' + assets[key][1];
+                    }
+                }
+                this.resolve(document);
+            },
+            resolve: function(root) {
+                const elements = root.querySelectorAll('[data-asset]');
+                for (const element of elements) {
+                    const url = this.urls[element.dataset.asset];
+                    if (url) {
+                        if (element.tagName === 'A') {
+                            element.href = url;
+                        } else {
+                            element.src = url;
+                        }
+                        element.removeAttribute('data-asset');
+                    }
+                }
+            }
+        };
+        document.addEventListener('DOMContentLoaded', function() {
+            window.DataViewerAssets.resolve(document);
+        });
+    </script>"""
+# Runtime written once per page before the first text asset: markers call
+# DataViewerText.expand(marker) to swap the element wrapping them for the
+# full value, parsed from its text asset only then
+_TEXT_RUNTIME = """
+    <script>
+        window.DataViewerText = window.DataViewerText || {
+            expand: function(marker) {
+                const script = document.getElementById('dv-text-' + marker.dataset.textAsset);
+                const value = JSON.parse(script.textContent);
+                marker.parentElement.textContent = typeof value === 'string'
+                    ? JSON.stringify(value) : '[' + value.join(', ') + ']';
+            }
+        };
+    </script>"""
+_ASSETS_CHUNK_END = (
+    "}</script>\n    <script>window.DataViewerAssets.load(JSON.parse("
+    "document.currentScript.previousElementSibling.textContent));</script>"
+)
+
+
+# Stores made active by AssetStore.collect, innermost last. A context variable
+# rather than a class attribute so pages rendered concurrently in different
+# threads (or asyncio tasks) each see only their own store.
+_active_stores: contextvars.ContextVar[Tuple["AssetStore", ...]] = contextvars.ContextVar(
+    "dataviewer_active_asset_stores", default=()
+)
+
+
+def asset_key(payload: str) -> str:
+    """Content hash identifying a base64 payload"""
+    return hashlib.blake2b(payload.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def referenced_assets(html: str) -> List[str]:
+    """Keys of the assets referenced by a piece of rendered HTML"""
+    if "asset=" not in html:
+        return []
+    return _ASSET_REF.findall(html)
+
+
+class AssetStore:
+    """Page-level store of base64 payloads, deduplicated by content hash
+
+    While a store is active (see ``collect``), renderers pass base64 images
+    to ``src_attr`` (and links to large content to ``href_attr``) instead of
+    inlining the data URI. By default each distinct payload is held only
+    until the next ``write_html`` call writes it into the page, after which
+    the store keeps just its key; images reference it as
+    ``<img data-asset="<key>">``. Components streaming many rows call
+    ``write_pending`` between rows so memory stays bounded by
+    ``flush_size`` rather than by the total size of the page's images.
+
+    ``add_text`` registers JSON text the same way (e.g. the full value behind
+    an elided JSON string). It is written once per page, unencoded, as
+    ``<script type="application/json" id="dv-text-<key>">`` that the browser
+    only parses when a script looks it up; such entries have mime None.
+
+    With ``directory`` set, payloads are instead decoded into content-hashed
+    files in that directory (existing files are never rewritten) and images
+    reference them as ``src="<base_url>/<key><ext>"``.
+
+    ``html_dir`` is the directory of the HTML file being written, if any;
+    ``local_url`` makes links to other local files (e.g. thumbnails) relative
+    to it.
+    """
+
+    # Pending payload characters after which write_pending writes them out
+    flush_size = 1 << 20
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        base_url: Optional[str] = None,
+        html_dir: Optional[str] = None,
+    ):
+        self.directory = directory
+        self.base_url = base_url if base_url is not None else directory
+        self.html_dir = html_dir
+        self.files_written = 0
+        # key -> (mime, payload) not yet written; mime is None for text from add_text
+        self._assets: Dict[str, Tuple[Optional[str], str]] = {}
+        self._pending_size = 0
+        self._written: Set[str] = set()  # keys already written into the page
+        self._runtime_written = False
+        self._text_runtime_written = False
+        self._recordings: List[Dict[str, Tuple[Optional[str], str]]] = []
+        self._files: Dict[str, str] = {}  # key -> file name, directory mode only
+
+    @classmethod
+    def current(cls) -> Optional["AssetStore"]:
+        """The store collecting assets for the page being rendered, if any"""
+        stores = _active_stores.get()
+        return stores[-1] if stores else None
+
+    @classmethod
+    @contextmanager
+    def collect(cls, store: Optional["AssetStore"] = None) -> Iterator["AssetStore"]:
+        """Make store (a new one by default) the active store for the block"""
+        store = store if store is not None else cls()
+        token = _active_stores.set(_active_stores.get() + (store,))
+        try:
+            yield store
+        finally:
+            _active_stores.reset(token)
+
+    @property
+    def mode(self) -> Hashable:
+        """What src_attr output depends on; rendered HTML is only reusable with equal modes"""
+        mode = "inline" if self.directory is None else ("directory", self.base_url)
+        return mode if self.html_dir is None else (mode, self.html_dir)
+
+    def spawn(self) -> "AssetStore":
+        """An empty store with the same settings, e.g. for a worker process"""
+        return AssetStore(self.directory, self.base_url, self.html_dir)
+
+    def local_url(self, path: str) -> str:
+        """URL of a local file as seen from the page, relative to html_dir when it is known"""
+        if self.html_dir is not None:
+            path = os.path.relpath(os.path.abspath(path), self.html_dir)
+        return quote(path.replace(os.sep, "/"))
+
+    @contextmanager
+    def record(self) -> Iterator[Dict[str, Tuple[Optional[str], str]]]:
+        """Record every payload registered in the block as {key: (mime, payload)}
+
+        Payloads already written into the page are recorded too, so cached
+        HTML can carry the assets it references into later pages. Nothing
+        is written while a recording is active.
+        """
+        recording: Dict[str, Tuple[Optional[str], str]] = {}
+        self._recordings.append(recording)
+        try:
+            yield recording
+        finally:
+            self._recordings.remove(recording)
+
+    def _register(self, key: str, mime: Optional[str], payload: str) -> None:
+        for recording in self._recordings:
+            recording[key] = (mime, payload)
+        if key not in self._assets and key not in self._written:
+            self._assets[key] = (mime, payload)
+            self._pending_size += len(payload)
+
+    def add(self, payload: str, mime: str) -> str:
+        """Register a base64 payload and return its key"""
+        key = asset_key(payload)
+        self._register(key, mime, payload)
+        return key
+
+    def add_text(self, text: str) -> str:
+        """Register a JSON text, e.g. a JSON-encoded string, and return its key
+
+        text must be valid JSON: it is written as is, except that "<" (which
+        JSON only allows inside strings) is escaped for the <script> element.
+        """
+        key = asset_key(text)
+        self._register(key, None, text)
+        return key
+
+    def src_attr(self, payload: str, mime: str) -> str:
+        """The attribute an <img> should use to show a base64 payload"""
+        return self._url_attr("src", payload, mime)
+
+    def href_attr(self, payload: str, mime: str) -> str:
+        """The attribute an <a> should use to link to a base64 payload"""
+        return self._url_attr("href", payload, mime)
+
+    def _url_attr(self, name: str, payload: str, mime: str) -> str:
+        if self.directory is None:
+            return f'data-asset="{self.add(payload, mime)}"'
+        filename = self._write_file(payload, mime)
+        if filename is None:
+            return f'{name}="data:{mime};base64,{payload}"'
+        return f'{name}="{quote(self.base_url.rstrip("/") + "/" + filename)}"'
+
+    def _write_file(self, payload: str, mime: str) -> Optional[str]:
+        """Decode payload into <key><ext> unless that file already exists"""
+        key = asset_key(payload)
+        filename = self._files.get(key)
+        if filename is not None:
+            return filename
+
+        try:
+            data = base64.b64decode(payload)
+        except (binascii.Error, ValueError):
+            return None
+        # Parameters such as ";charset=utf-8" are not part of the type
+        base_mime = mime.split(";", 1)[0]
+        ext = mimetypes.guess_extension(base_mime) or "." + base_mime.rsplit("/", 1)[-1]
+        filename = key + ext
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+            self.files_written += 1
+        self._files[key] = filename
+        return filename
+
+    def entries(
+        self, keys: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, Optional[str], str]]:
+        """(key, mime, payload) for the given keys, or for every asset not yet written"""
+        if keys is None:
+            keys = self._assets
+        return [(key, *self._assets[key]) for key in keys if key in self._assets]
+
+    def add_entries(self, entries: Iterable[Tuple[str, Optional[str], str]]) -> None:
+        """Register entries previously returned by ``entries`` or ``record``"""
+        for key, mime, payload in entries:
+            self._register(key, mime, payload)
+
+    @property
+    def needs_flush(self) -> bool:
+        """Whether the pending payloads add up to ``flush_size`` characters and can be written"""
+        return self._pending_size >= self.flush_size and not self._recordings
+
+    def write_pending(self, out: TextIO) -> None:
+        """Write the pending payloads once ``needs_flush``"""
+        if self.needs_flush:
+            self.write_html(out)
+
+    def write_html(self, out: TextIO) -> None:
+        """Write the payloads registered since the last call, then forget them
+
+        The resolver runtime is written before the first payloads, and the
+        runtime expanding text assets before the first text. The output
+        is a pair of <script> elements for the base64 payloads plus one per
+        text, valid anywhere in the body including between table rows.
+        """
+        if not self._assets or self._recordings:
+            return
+        payloads = [(key, mime, payload) for key, (mime, payload) in self._assets.items() if mime is not None]
+        if payloads:
+            if not self._runtime_written:
+                out.write(_ASSETS_RUNTIME)
+                self._runtime_written = True
+            out.write('\n    <script type="application/json" class="dataviewer-assets">{')
+            first = True
+            for key, mime, payload in payloads:
+                if not first:
+                    out.write(",")
+                if _BASE64_PAYLOAD.fullmatch(payload):
+                    # Plain base64 never needs JSON escaping
+                    encoded = f'"{payload}"'
+                else:
+                    encoded = json.dumps(payload).replace("<", "\\u003c")
+                out.write(f'"{key}":[{json.dumps(mime)},{encoded}]')
+                first = False
+            out.write(_ASSETS_CHUNK_END)
+        for key, (mime, text) in self._assets.items():
+            if mime is None:
+                if not self._text_runtime_written:
+                    out.write(_TEXT_RUNTIME)
+                    self._text_runtime_written = True
+                text = text.replace("<", "\\u003c")
+                out.write(f'\n    <script type="application/json" id="dv-text-{key}">{text}</script>')
+        self._written.update(self._assets)
+        self._assets.clear()
+        self._pending_size = 0
+
+    def __len__(self) -> int:
+        return len(self._assets) + len(self._written)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._assets or key in self._written
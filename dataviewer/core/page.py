@@ -1,8 +1,24 @@
-from typing import List, Set
+import gzip
+import io
+import os
+from typing import List, Optional, Set, TextIO
 
 from ..components.base import Component, ComponentContext
+from .assets import AssetStore
 from dataviewer import logger
 
+
+def _shard_filename(filename: str, page: int) -> str:
+    """File name of a shard: page 1 keeps filename, page N becomes <name>-N<ext>"""
+    if page == 1:
+        return filename
+    root, ext = os.path.splitext(filename)
+    if ext == ".gz":
+        root, inner_ext = os.path.splitext(root)
+        ext = inner_ext + ext
+    return f"{root}-{page}{ext}"
+
+
 class Page:
     """Page class, used to organize the rendering interface"""
 
@@ -34,18 +50,113 @@ class Page:
             ComponentContext.clear()  # Clear all contexts
             raise RuntimeError("Page context management error")
 
-    def save(self, filename: str) -> None:
-        """Save the page to an HTML file"""
+    def save(
+        self,
+        filename: str,
+        compress: Optional[bool] = None,
+        shard: bool = False,
+        assets_dir: Optional[str] = None,
+    ) -> None:
+        """Save the page to an HTML file
+
+        The page is streamed straight into the file component by component, so
+        the full document never has to exist in memory as one string.
+
+        Args:
+            filename: Output path
+            compress: Write gzip-compressed output. Defaults to True when
+                filename ends with ".gz"
+            shard: Write one file per page of every paginated component (for
+                example a Table with page_size) instead of a single file. The
+                first page keeps filename, page N is written next to it as
+                "<name>-N<ext>", and each page links to the others.
+                Components whose page count is not known up front (a Table
+                over a lazy iterable or cursor) cannot be sharded and raise
+                ValueError.
+            assets_dir: Write base64 images to content-hashed files in this
+                directory and reference them by relative URL instead of
+                embedding them. Files that already exist are not rewritten,
+                so the directory can be shared across pages and runs.
+        """
+        if compress is None:
+            compress = filename.endswith(".gz")
+
+        # Links to local files (assets, thumbnails) are made relative to the saved file
+        html_dir = os.path.dirname(os.path.abspath(filename))
+        if assets_dir is not None:
+            base_url = os.path.relpath(os.path.abspath(assets_dir), html_dir)
+            assets = AssetStore(assets_dir, base_url.replace(os.sep, "/"), html_dir)
+        else:
+            assets = AssetStore(html_dir=html_dir)
+
+        paginated = self._find_paginated_components() if shard else []
+        unknown = [c for c in paginated if not getattr(c, "page_count_known", True)]
+        if unknown:
+            raise ValueError(
+                f"Cannot shard component '{unknown[0].id}': its data source is lazy, "
+                "so the number of pages is unknown. Load the rows into a list first"
+            )
+        page_count = max((c.page_count for c in paginated), default=1)
+        if page_count <= 1:
+            self._save_file(filename, compress, assets)
+            return
+
+        def shard_href(n: int) -> str:
+            return os.path.basename(_shard_filename(filename, n))
+
+        original = [(c, c.current_page, c.page_url) for c in paginated]
+        try:
+            for n in range(1, page_count + 1):
+                for component in paginated:
+                    component.current_page = min(n, component.page_count)
+                    component.page_url = shard_href
+                # Every file embeds its own inline payloads; an assets directory is shared
+                shard_assets = assets if assets.directory is not None else assets.spawn()
+                self._save_file(_shard_filename(filename, n), compress, shard_assets)
+        finally:
+            for component, current_page, page_url in original:
+                component.current_page = current_page
+                component.page_url = page_url
+
+    def _save_file(
+        self, filename: str, compress: bool, assets: Optional[AssetStore] = None
+    ) -> None:
         logger.info(f"Saving page to {filename}")
-        with open(filename, "w", encoding="utf-8") as file:
-            file.write(self.render())
+        if compress:
+            with gzip.open(filename, "wt", encoding="utf-8") as file:
+                self.write_html(file, assets)
+        else:
+            with open(filename, "w", encoding="utf-8") as file:
+                self.write_html(file, assets)
+
+    def _find_paginated_components(self) -> List[Component]:
+        """Collect components (including nested children) that render by page"""
+        found = []
+        stack = list(reversed(self.components))
+        while stack:
+            component = stack.pop()
+            if getattr(component, "page_size", None) and hasattr(component, "page_count"):
+                found.append(component)
+            stack.extend(reversed(getattr(component, "children", None) or []))
+        return found
 
     def render(self) -> str:
         """Generate the HTML content of the page"""
-        components_html = "\n".join(
-            component.to_html() for component in self.components if component
-        )
-        return f"""<!DOCTYPE html>
+        buffer = io.StringIO()
+        self.write_html(buffer)
+        return buffer.getvalue()
+
+    def write_html(self, out: TextIO, assets: Optional[AssetStore] = None) -> None:
+        """Stream the HTML content of the page into out
+
+        Args:
+            out: Writable text stream
+            assets: Store collecting the base64 images of the page. Defaults to
+                a new in-memory store; each distinct payload is embedded once,
+                after the component that first uses it
+        """
+        out.write(
+            f"""<!DOCTYPE html>
 <html>
 <head>
     <title>{self.title}</title>
@@ -73,7 +184,23 @@ class Page:
 </head>
 <body>
     <div class="p-{self.padding}">
-        {components_html}
+        """
+        )
+        # Base64 images rendered below are collected here and each is written
+        # once, after the component that registered it
+        with AssetStore.collect(assets) as assets:
+            first = True
+            for component in self.components:
+                if not component:
+                    continue
+                if not first:
+                    out.write("\n")
+                component.write_html(out)
+                assets.write_html(out)
+                first = False
+        out.write(
+            """
     </div>
 </body>
 </html>"""
+        )
@@ -2,10 +2,12 @@ from .cell_image_renderer import CellImageRenderer
 from .cell_renderer import DefaultRenderer
 from .cell_video_render import CellVideoRenderer
 from .registry import CellRendererRegistry
+from .thumbnails import ThumbnailCache
 
 __all__ = [
     "CellImageRenderer",
     "CellRendererRegistry",
     "DefaultRenderer",
     "CellVideoRenderer",
+    "ThumbnailCache",
 ]
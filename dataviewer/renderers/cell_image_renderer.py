@@ -2,9 +2,14 @@ import base64
 import os
 import re
 from dataclasses import dataclass, field
-from typing import Any, List, Optional, Union
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
 
+from ..core.assets import AssetStore
 from ..core.page import Page
+from .media_sniff import (BASE64_IMAGE_SIGNATURES, matches_any,
+                          sniff_base64_image)
+from .image_probe import image_size
+from .thumbnails import ThumbnailCache
 
 _IMAGE_PREVIEW_INITIALIZED = False
 
@@ -18,6 +23,9 @@ class CellImageRenderer:
     height: Optional[str] = None  # Image height (optional)
     lazy_load: bool = True  # Enable lazy loading
     level: int = 1
+    thumbnails: Optional[ThumbnailCache] = None  # Show downsized local images
+    probe_size: bool = True  # Emit intrinsic width/height read from image headers
+    accepts: ClassVar[Tuple[type, ...]] = (str, list)  # Value types this renderer handles
 
     def __repr__(self) -> str:
         return "CellImageRenderer()"
@@ -89,7 +97,7 @@ class CellImageRenderer:
                     const previewImg = document.getElementById('previewImage');
                     
                     window.openImagePreview = function(img) {
-                        previewImg.src = img.src;
+                        previewImg.src = img.dataset.full || img.src;
                         modal.classList.add('active');
                     };
                     
@@ -107,17 +115,21 @@ class CellImageRenderer:
                 re.compile(r".*\.(?:png|jpg|jpeg|gif|webp|svg)$"),
             ]
         )
-        self.base64_patterns = [re.compile(r"^/9j")]
+        self.base64_patterns = [pattern for pattern, _ in BASE64_IMAGE_SIGNATURES]
+
+    def string_patterns(self) -> List[re.Pattern]:
+        """Patterns deciding whether a string can be rendered (merged by the registry)"""
+        return self.patterns + self.base64_patterns
 
     def has_valid_base64_pattern(self, path: str) -> bool:
-        return isinstance(path, str) and any(
-            pattern.match(path) for pattern in self.base64_patterns
-        )
+        if not isinstance(path, str):
+            return False
+        return matches_any(self.base64_patterns, path)
 
     def has_valid_pattern(self, path: str) -> bool:
-        return isinstance(path, str) and any(
-            pattern.match(path) for pattern in self.patterns
-        )
+        if not isinstance(path, str):
+            return False
+        return matches_any(self.patterns, path)
 
     def can_render(self, value: Any) -> bool:
         """Check if the value can be rendered"""
@@ -130,22 +142,74 @@ class CellImageRenderer:
             )
         return False
 
-    def render(self, value: Union[str, List[str]]) -> str:
-        """Render image or image list"""
+    def _image_tag_parts(self) -> Tuple[str, str, str]:
+        """The <img> tag split around its per-image attributes and style
 
-        def render_single_image(img_path: str) -> str:
-            # Add lazy loading attribute
-            loading_attr = ' loading="lazy"' if self.lazy_load else ""
-            if self.has_valid_base64_pattern(img_path):
-                img_path = f"data:image/jpeg;base64,{img_path}"
-
-            return f"""
-            <img src="{img_path}" 
-                 style="width: {self.width};"
+        Shared by a whole batch: an image is parts[0] + src/size attributes
+        + parts[1] + size style + parts[2].
+        """
+        # Add lazy loading attribute
+        loading_attr = ' loading="lazy"' if self.lazy_load else ""
+        return (
+            """
+            <img """,
+            f""" 
+                 style="width: {self.width};""",
+            f""""
                  class="cell-image"
                  onclick="openImagePreview(this)"{loading_attr}
                  alt="Image" />
-            """
+            """,
+        )
+
+    def _get_thumbnails(self, values: List[Union[str, List[str]]]) -> Dict[str, str]:
+        """Thumbnail src of every local image path in values (made in parallel)"""
+        if self.thumbnails is None:
+            return {}
+        paths = []
+        for value in values:
+            for img_path in value if isinstance(value, list) else [value]:
+                if isinstance(img_path, str) and not self.has_valid_base64_pattern(img_path):
+                    paths.append(img_path)
+        return self.thumbnails.thumbnail_many(paths)
+
+    def _render_value(
+        self,
+        value: Union[str, List[str]],
+        tag_parts: Tuple[str, str, str],
+        images: dict,
+        thumbnails: Dict[str, str],
+    ) -> str:
+        def render_single_image(img_path: str) -> str:
+            image_html = images.get(img_path)
+            if image_html is None:
+                is_base64 = self.has_valid_base64_pattern(img_path)
+                src_attr = f'src="{img_path}"'
+                if img_path in thumbnails:
+                    # The preview modal opens the original image
+                    src_attr = f'src="{thumbnails[img_path]}" data-full="{img_path}"'
+                elif is_base64:
+                    subtype = sniff_base64_image(img_path) or "jpeg"
+                    store = AssetStore.current()
+                    if store is not None:
+                        # Written once per page (or file) and shared by every reference
+                        src_attr = store.src_attr(img_path, f"image/{subtype}")
+                    else:
+                        src_attr = f'src="data:image/{subtype};base64,{img_path}"'
+
+                size_attrs = size_style = ""
+                size = image_size(img_path, is_base64) if self.probe_size else None
+                if size:
+                    # Intrinsic size lets the browser lay the table out before images load
+                    width, height = size
+                    size_attrs = f' width="{width}" height="{height}"'
+                    # "auto" lets the loaded image's own ratio win over the probed one
+                    size_style = f" height: auto; aspect-ratio: auto {width} / {height};"
+
+                image_html = images[img_path] = "".join(
+                    (tag_parts[0], src_attr, size_attrs, tag_parts[1], size_style, tag_parts[2])
+                )
+            return image_html
 
         if isinstance(value, list):
             images_html = [render_single_image(img_path) for img_path in value]
@@ -156,3 +220,22 @@ class CellImageRenderer:
                 return f'<div style="display: grid; grid-template-columns: repeat(5, 1fr); gap: 10px;">{"".join(images_html)}</div>'
         else:
             return render_single_image(value)
+
+    def render(self, value: Union[str, List[str]]) -> str:
+        """Render image or image list"""
+        return self._render_value(
+            value, self._image_tag_parts(), {}, self._get_thumbnails([value])
+        )
+
+    def render_batch(self, values: List[Union[str, List[str]]]) -> List[str]:
+        """Render several images or image lists
+
+        The tag template is built once, an image repeated within the batch is
+        only encoded once, and thumbnails for the batch are made in a thread pool.
+        """
+        tag_parts = self._image_tag_parts()
+        images = {}
+        thumbnails = self._get_thumbnails(values)
+        return [
+            self._render_value(value, tag_parts, images, thumbnails) for value in values
+        ]
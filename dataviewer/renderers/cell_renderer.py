@@ -1,11 +1,29 @@
 import html
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, ClassVar, List, Tuple
+
+from .json_elision import render_json_html
+
+_BATCH_SEPARATOR = "\x00"
+
+
+def escape_many(texts: List[str]) -> List[str]:
+    """HTML-escape a list of strings with a single html.escape call
+
+    The strings are joined with a NUL separator, escaped once and split
+    again; falls back to escaping one by one if any string contains NUL.
+    """
+    if not texts:
+        return []
+    if any(_BATCH_SEPARATOR in text for text in texts):
+        return [html.escape(text) for text in texts]
+    return html.escape(_BATCH_SEPARATOR.join(texts)).split(_BATCH_SEPARATOR)
 
 
 @dataclass
 class DefaultRenderer:
     level: int = -1
+    accepts: ClassVar[Tuple[type, ...]] = (object,)
 
     def __repr__(self) -> str:
         return "DefaultRenderer()"
@@ -13,16 +31,31 @@ class DefaultRenderer:
     def can_render(self, value: Any) -> bool:
         return True
 
-    def render(self, value: Any) -> str:
+    def _to_text(self, value: Any) -> str:
+        """Plain text shown for value, before HTML escaping"""
         if value is None:
             return ""
         elif isinstance(value, bool):
             return "Yes" if value else "No"
-        elif isinstance(value, (list, dict)):
-            import json
-
-            formatted = json.dumps(value, ensure_ascii=False, indent=2)
-            return html.escape(formatted)
         elif isinstance(value, str):
-            return html.escape(value)
-        return html.escape(str(value))
+            return value
+        return str(value)
+
+    def render(self, value: Any) -> str:
+        if isinstance(value, (list, dict)):
+            # Already escaped, with long strings and numeric arrays elided
+            return render_json_html(value, indent=2)
+        return html.escape(self._to_text(value))
+
+    def render_batch(self, values: List[Any]) -> List[str]:
+        """Render several values at once, escaping them in bulk"""
+        results = escape_many(
+            [
+                "" if isinstance(value, (list, dict)) else self._to_text(value)
+                for value in values
+            ]
+        )
+        for position, value in enumerate(values):
+            if isinstance(value, (list, dict)):
+                results[position] = render_json_html(value, indent=2)
+        return results
@@ -1,6 +1,8 @@
 import re
 from dataclasses import dataclass, field
-from typing import Any, List, Optional
+from typing import Any, ClassVar, List, Optional, Tuple
+
+from .media_sniff import matches_any
 
 
 @dataclass
@@ -10,6 +12,7 @@ class CellVideoRenderer:
     height: Optional[int] = None
     lazy_load: bool = True
     level: int = 2
+    accepts: ClassVar[Tuple[type, ...]] = (str,)
 
     def __repr__(self) -> str:
         return "CellVideoRenderer()"
@@ -17,17 +20,30 @@ class CellVideoRenderer:
     def __post_init__(self):
         self.patterns.extend([re.compile(r".*\.(?:mp4|avi|mov|mkv|webm)$")])
 
+    def string_patterns(self) -> List[re.Pattern]:
+        """Patterns deciding whether a string can be rendered (merged by the registry)"""
+        return self.patterns
+
     def can_render(self, value: Any) -> bool:
-        return isinstance(value, str) and any(
-            pattern.match(value) for pattern in self.patterns
-        )
+        if not isinstance(value, str):
+            return False
+        return matches_any(self.patterns, value)
 
-    def render(self, value: Any) -> str:
-        # Generate HTML code to play video
+    def _video_tag_parts(self) -> Tuple[str, str]:
+        """The <video> tag split around its src"""
         width = f' width="{self.width}px"' if self.width else ""
         height = f' height="{self.height}px"' if self.height else ""
-
         return (
-            f'<video{width}{height} controls loading="lazy">'
-            f'<source src="{value}" type="video/mp4"></video>'
+            f'<video{width}{height} controls loading="lazy"><source src="',
+            '" type="video/mp4"></video>',
         )
+
+    def render(self, value: Any) -> str:
+        # Generate HTML code to play video
+        prefix, suffix = self._video_tag_parts()
+        return f"{prefix}{value}{suffix}"
+
+    def render_batch(self, values: List[Any]) -> List[str]:
+        """Render several videos, building the tag template once"""
+        prefix, suffix = self._video_tag_parts()
+        return [f"{prefix}{value}{suffix}" for value in values]
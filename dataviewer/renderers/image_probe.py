@@ -0,0 +1,187 @@
+import base64
+import binascii
+import os
+import struct
+from typing import Callable, Optional, Tuple
+
+from ..core.cache import LRUCache
+
+# Prefix sizes (bytes) read while looking for the header, JPEG metadata
+# segments can push the frame header well past the first few kilobytes
+_READ_STEPS = (4096, 65536, 1 << 20)
+
+# JPEG start-of-frame markers (SOF0-SOF15 except DHT, JPG and DAC)
+_JPEG_SOF = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+_size_cache = LRUCache(maxsize=65536)
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+def _exif_orientation(segment: bytes) -> int:
+    """EXIF Orientation (1-8) from the body of an APP1 segment, 1 when absent"""
+    if not segment.startswith(b"Exif\x00\x00"):
+        return 1
+    tiff = segment[6:]
+    if tiff[:2] == b"II":
+        order = "<"
+    elif tiff[:2] == b"MM":
+        order = ">"
+    else:
+        return 1
+    try:
+        (ifd,) = struct.unpack(order + "I", tiff[4:8])
+        (count,) = struct.unpack(order + "H", tiff[ifd : ifd + 2])
+        for entry in range(ifd + 2, ifd + 2 + 12 * count, 12):
+            tag, kind = struct.unpack(order + "HH", tiff[entry : entry + 4])
+            if tag == 0x0112 and kind == 3:  # Orientation, SHORT
+                (orientation,) = struct.unpack(order + "H", tiff[entry + 8 : entry + 10])
+                return orientation
+    except struct.error:
+        pass
+    return 1
+
+
+def _parse_jpeg(data: bytes) -> Optional[Tuple[int, int]]:
+    orientation = 1
+    pos = 2
+    while True:
+        # Skip fill bytes before the marker
+        while pos < len(data) and data[pos] == 0xFF:
+            pos += 1
+        if pos + 3 > len(data):
+            raise _NeedMoreData
+        marker = data[pos]
+        pos += 1
+        if marker == 0xD8 or 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            continue
+        if marker in (0xD9, 0xDA):
+            # End of image or start of scan before any frame header
+            return None
+        (length,) = struct.unpack(">H", data[pos : pos + 2])
+        if marker == 0xE1 and data[pos + 2 : pos + 8] == b"Exif\x00\x00":
+            if pos + length > len(data):
+                raise _NeedMoreData
+            orientation = _exif_orientation(data[pos + 2 : pos + length])
+        if marker in _JPEG_SOF:
+            if pos + 7 > len(data):
+                raise _NeedMoreData
+            height, width = struct.unpack(">HH", data[pos + 3 : pos + 7])
+            # Orientations 5-8 are rotated by 90 degrees: browsers show the image upright
+            if 5 <= orientation <= 8:
+                return height, width
+            return width, height
+        pos += length
+
+
+def _parse_webp(data: bytes) -> Optional[Tuple[int, int]]:
+    if len(data) < 30:
+        raise _NeedMoreData
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = int.from_bytes(data[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def parse_image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """(width, height) from the first bytes of a PNG, GIF, JPEG or WebP image
+
+    Only the header is parsed, the image is never decoded. For JPEGs the
+    size is as displayed, i.e. swapped when the EXIF orientation rotates the
+    image by 90 degrees. Raises
+    _NeedMoreData when data ends before the size is reached.
+    """
+    if len(data) < 10:
+        raise _NeedMoreData
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        if len(data) < 24:
+            raise _NeedMoreData
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", data[6:10])
+    if data.startswith(b"\xff\xd8"):
+        return _parse_jpeg(data)
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return _parse_webp(data)
+    return None
+
+
+def _probe(read_prefix: Callable[[int], bytes]) -> Optional[Tuple[int, int]]:
+    for size in _READ_STEPS:
+        data = read_prefix(size)
+        try:
+            return parse_image_size(data)
+        except _NeedMoreData:
+            if len(data) < size:
+                # The whole image is already in data
+                return None
+        except struct.error:
+            return None
+    return None
+
+
+def image_size_from_file(path: str) -> Optional[Tuple[int, int]]:
+    """Dimensions of a local image file, cached by path, mtime and size"""
+    try:
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    key = ("file", os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key in _size_cache:
+        return _size_cache.get(key)
+
+    try:
+        with open(path, "rb") as file:
+
+            def read_prefix(size: int) -> bytes:
+                file.seek(0)
+                return file.read(size)
+
+            size = _probe(read_prefix)
+    except OSError:
+        size = None
+    _size_cache.put(key, size)
+    return size
+
+
+def image_size_from_base64(payload: str) -> Optional[Tuple[int, int]]:
+    """Dimensions of a base64 encoded image, decoding only its first bytes
+
+    Cached by a hash of the whole payload: a JPEG's frame header can sit past
+    large metadata, so images sharing their leading bytes may differ in size.
+    Python caches a string's hash, so repeated lookups of the same payload
+    object do not rehash it.
+    """
+    key = ("base64", len(payload), hash(payload))
+    if key in _size_cache:
+        return _size_cache.get(key)
+
+    def read_prefix(size: int) -> bytes:
+        chars = payload[: (size + 2) // 3 * 4]
+        try:
+            return base64.b64decode(chars[: len(chars) // 4 * 4])
+        except (binascii.Error, ValueError):
+            return b""
+
+    size = _probe(read_prefix)
+    _size_cache.put(key, size)
+    return size
+
+
+def image_size(value: str, is_base64: bool = False) -> Optional[Tuple[int, int]]:
+    """Dimensions of a local image path or base64 payload, None if unknown"""
+    if is_base64:
+        return image_size_from_base64(value)
+    if "://" in value or value.startswith("data:"):
+        return None
+    return image_size_from_file(value)
@@ -0,0 +1,180 @@
+import base64
+import html
+import json
+import re
+from typing import Any, List, Optional
+
+from ..core.assets import AssetStore
+from .media_sniff import sniff_base64_image
+
+# Strings longer than this many characters are cut
+MAX_STRING_LENGTH = 500
+# Arrays of more than this many numbers are shown as a short preview
+MAX_NUMERIC_ITEMS = 32
+# Leading numbers kept in the preview of an elided array
+NUMERIC_PREVIEW_ITEMS = 8
+# Shorter base64 strings are left as text even if they sniff as an image
+MIN_BASE64_IMAGE_LENGTH = 64
+
+_DATA_URI = re.compile(r"data:image/[A-Za-z0-9.+-]+;base64,")
+_ELIDED_STYLE = "color: #888888; font-style: italic;"
+
+
+def format_size(num_bytes: int) -> str:
+    """Human readable size, e.g. "512 B" or "1.2 MB" """
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def base64_image_payload(value: str) -> Optional[str]:
+    """The base64 payload of an image string (bare or data URI), None otherwise"""
+    match = _DATA_URI.match(value)
+    payload = value[match.end() :] if match else value
+    if len(payload) < MIN_BASE64_IMAGE_LENGTH or not sniff_base64_image(payload):
+        return None
+    return payload
+
+
+def is_numeric_array(value: Any, limit: Optional[int]) -> bool:
+    """Whether value is a list of more than limit numbers"""
+    if limit is None or not isinstance(value, list) or len(value) <= limit:
+        return False
+    return all(type(item) in (int, float) for item in value)
+
+
+def numeric_preview(value: List[Any]) -> str:
+    """The first few numbers of an array, e.g. "0.1, 0.2, 0.3" """
+    return ", ".join(json.dumps(item) for item in value[:NUMERIC_PREVIEW_ITEMS])
+
+
+def render_base64_image(payload: str) -> Optional[str]:
+    """Render a base64 image through the registered image renderer"""
+    from .registry import CellRendererRegistry
+
+    renderer = CellRendererRegistry.get_renderer(payload)
+    if renderer is None or not hasattr(renderer, "has_valid_base64_pattern"):
+        return None
+    return renderer.render(payload)
+
+
+def elision_marker(label: str, full_text: str, mime: str, json_text: str) -> str:
+    """The marker shown in place of elided content
+
+    full_text is the content as a file (for a string, the string itself) and
+    json_text the elided value encoded as JSON. When the page writes its
+    assets to a directory (``Page.save(assets_dir=...)``) full_text goes to a
+    file there and the marker links to it. In other pages json_text is
+    registered with the page's asset store, which writes each distinct text
+    once, and clicking the marker replaces the element wrapping the marker
+    and its preview with the parsed value. Outside a page the marker is
+    plain text.
+    """
+    store = AssetStore.current()
+    label = html.escape(label)
+    if store is None:
+        return f'<span class="json-elided" style="{_ELIDED_STYLE}">{label}</span>'
+    if store.directory is not None:
+        payload = base64.b64encode(full_text.encode("utf-8", "surrogatepass")).decode("ascii")
+        return (
+            f'<a class="json-elided" style="{_ELIDED_STYLE}" target="_blank" '
+            f'title="打开完整内容" {store.href_attr(payload, mime)}>{label}</a>'
+        )
+    return (
+        f'<span class="json-elided" style="{_ELIDED_STYLE} cursor: pointer;" title="点击显示全部" '
+        f'data-text-asset="{store.add_text(json_text)}" onclick="DataViewerText.expand(this)">{label}</span>'
+    )
+
+
+def _json_key(key: Any) -> str:
+    """The object key json.dumps would write for key"""
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def render_json_html(
+    value: Any,
+    indent: Optional[int] = 4,
+    max_string_length: Optional[int] = MAX_STRING_LENGTH,
+    max_numeric_items: Optional[int] = MAX_NUMERIC_ITEMS,
+) -> str:
+    """Format value as HTML-escaped JSON with large parts elided
+
+    The layout matches json.dumps(value, indent=indent, ensure_ascii=False).
+    Strings longer than max_string_length are cut and arrays of more than
+    max_numeric_items numbers show only their first items, both followed by
+    a marker giving the full size (see elision_marker). Base64 images are
+    shown through the image renderer. None disables a limit. Raises
+    TypeError like json.dumps for values that are not JSON serializable.
+    """
+    parts: List[str] = []
+    write = parts.append
+    item_separator = ", " if indent is None else ","
+
+    def escaped(item: Any) -> str:
+        return html.escape(json.dumps(item, ensure_ascii=False), quote=False)
+
+    def write_string(item: str) -> None:
+        payload = base64_image_payload(item)
+        if payload is not None:
+            image = render_base64_image(payload)
+            if image is not None:
+                write(image)
+                return
+        if max_string_length is None or len(item) <= max_string_length:
+            write(escaped(item))
+            return
+        size = format_size(len(item.encode("utf-8", "surrogatepass")))
+        head = json.dumps(item[:max_string_length], ensure_ascii=False)[:-1]
+        marker = elision_marker(
+            f"… 共 {len(item):,} 字符（{size}）",
+            item,
+            "text/plain;charset=utf-8",
+            json.dumps(item, ensure_ascii=False),
+        )
+        write(f'<span>{html.escape(head, quote=False)}…"{marker}</span>')
+
+    def write_value(item: Any, level: int) -> None:
+        if isinstance(item, str):
+            write_string(item)
+            return
+        if isinstance(item, dict):
+            entries = [(_json_key(key), child) for key, child in item.items()]
+            opening, closing = "{", "}"
+        elif isinstance(item, (list, tuple)):
+            if is_numeric_array(item, max_numeric_items):
+                full_text = json.dumps(item)
+                marker = elision_marker(
+                    f"… 共 {len(item):,} 个数字", full_text, "application/json", full_text
+                )
+                write(f"<span>[{numeric_preview(item)}, {marker}]</span>")
+                return
+            entries = [(None, child) for child in item]
+            opening, closing = "[", "]"
+        else:
+            write(escaped(item))
+            return
+
+        if not entries:
+            write(opening + closing)
+            return
+        newline = "" if indent is None else "\n" + " " * (indent * (level + 1))
+        write(opening)
+        for position, (key, child) in enumerate(entries):
+            if position:
+                write(item_separator)
+            write(newline)
+            if key is not None:
+                write(escaped(key) + ": ")
+            write_value(child, level + 1)
+        write("" if indent is None else "\n" + " " * (indent * level))
+        write(closing)
+
+    write_value(value, 0)
+    return "".join(parts)
@@ -0,0 +1,73 @@
+import re
+from typing import Iterable, Optional, Tuple
+
+# Number of characters inspected at each end of a string
+PROBE_SIZE = 256
+
+# Base64 encodings of the leading magic bytes of common image formats
+BASE64_IMAGE_SIGNATURES = [
+    (re.compile(r"^/9j/"), "jpeg"),  # FF D8 FF
+    (re.compile(r"^iVBORw0KGgo"), "png"),  # 89 50 4E 47 0D 0A 1A 0A
+    (re.compile(r"^R0lGOD[dl]h"), "gif"),  # GIF87a / GIF89a
+    (re.compile(r"^UklGR[A-Za-z0-9+/]{7}RUJQ"), "webp"),  # RIFF....WEBP
+]
+
+
+def is_end_anchored(pattern: re.Pattern) -> bool:
+    """Whether pattern ends with a ``$`` anchor, like ``.*\\.png$``"""
+    source = pattern.pattern
+    if isinstance(source, bytes) or not source.endswith("$"):
+        return False
+    # An odd number of backslashes before "$" escapes it
+    backslashes = len(source) - 1 - len(source[:-1].rstrip("\\"))
+    return backslashes % 2 == 0
+
+
+def probe_parts(value: str, size: int = PROBE_SIZE) -> Tuple[str, str]:
+    """The (head, tail) of value that media detection looks at
+
+    Short strings are returned whole as both parts. For long strings the
+    head is the first ``size`` characters, which patterns anchored at the
+    start (``^img://``, base64 signatures) are matched against, and the tail
+    the last ``size`` characters, which end-anchored patterns such as
+    ``.*\\.png$`` are matched against. The two are never joined, so no
+    pattern sees text that is not in value.
+    """
+    if len(value) <= 2 * size:
+        return value, value
+    return value[:size], value[-size:]
+
+
+def newline_before_tail(value: str, size: int = PROBE_SIZE) -> bool:
+    """Whether value has a newline before the tail returned by probe_parts
+
+    A pattern like ``.*\\.png$`` only matches a whole string if ``.`` runs
+    from its start to the suffix, so a tail match does not count when this
+    is True. Call it only after a tail match: it is a str.find over the
+    string, while everything else stays O(size).
+    """
+    return len(value) > 2 * size and value.find("\n", 0, len(value) - size) != -1
+
+
+def matches_any(patterns: Iterable[re.Pattern], value: str) -> bool:
+    """Whether any of patterns matches value as re.match would, looking at its head or tail only"""
+    head, tail = probe_parts(value)
+    for pattern in patterns:
+        if is_end_anchored(pattern):
+            if pattern.match(tail) and not newline_before_tail(value):
+                return True
+        elif pattern.match(head):
+            return True
+    return False
+
+
+def sniff_base64_image(value: str) -> Optional[str]:
+    """Return the image subtype ("jpeg", "png", ...) of a base64 payload, if any
+
+    Only the first few characters are checked.
+    """
+    head = value[:PROBE_SIZE]
+    for pattern, subtype in BASE64_IMAGE_SIGNATURES:
+        if pattern.match(head):
+            return subtype
+    return None
@@ -1,14 +1,77 @@
-from typing import Any, List, Optional
+import re
+from typing import Any, Dict, List, Optional, Set
 
 from dataviewer import logger
 
 from .cell_image_renderer import CellImageRenderer
+from .media_sniff import is_end_anchored, newline_before_tail, probe_parts
+
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+def _config_value(value: Any) -> Any:
+    """Hashable snapshot of a renderer setting, used by config_key"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_config_value(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _config_value(item)) for key, item in value.items())
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        # Renderers and their helpers (e.g. ThumbnailCache); underscore attributes are internal state
+        return (type(value),) + tuple(
+            (key, _config_value(item))
+            for key, item in vars(value).items()
+            if not key.startswith("_")
+        )
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _patterns_decide_strings(renderer: Any) -> bool:
+    """Whether renderer's string_patterns() fully describe its can_render on strings
+
+    That holds when can_render comes from the class that defines
+    string_patterns (or one of its bases). A subclass or instance overriding
+    only can_render, e.g. to require that the file exists, may reject strings
+    the patterns accept, so it has to keep going through can_render.
+    """
+    if "can_render" in vars(renderer):
+        return False
+    for klass in type(renderer).__mro__:
+        if "string_patterns" in vars(klass):
+            return True
+        if "can_render" in vars(klass):
+            return False
+    return False
 
 
 class CellRendererRegistry:
-    """Cell Renderer Registry"""
+    """Cell Renderer Registry
+
+    Renderers declare the Python types they accept through an ``accepts``
+    tuple (default: every type). The registry keeps a per-type dispatch table,
+    so e.g. ints and None only ever consult renderers that accept them.
+
+    Renderers that expose ``string_patterns()`` are matched against strings
+    through merged regular expressions, one for patterns anchored at the
+    start and one for end-anchored ones, so a string cell pays at most two
+    matches no matter how many pattern-based renderers are registered. Only
+    the head and tail of long strings are inspected (see media_sniff). Subclasses
+    that override ``can_render`` without ``string_patterns`` are asked
+    through ``can_render`` instead.
+    Both caches are rebuilt after register/unregister/clear; call
+    invalidate_cache() after changing a registered renderer's patterns.
+    """
 
     _renderers: List[CellImageRenderer] = []
+    _dispatch: Dict[type, List[CellImageRenderer]] = {}
+    # (merged regex, [(group name, renderer index, renderer)]) for the head and the tail
+    _head_matcher: Optional[tuple] = None
+    _tail_matcher: Optional[tuple] = None
+    _pattern_renderers: Set[int] = set()
+    _matcher_ready: bool = False
 
     @classmethod
     def register(cls, renderer: CellImageRenderer) -> None:
@@ -16,6 +79,7 @@ class CellRendererRegistry:
         logger.info(f"Registering Renderer: {renderer}")
         cls._renderers.append(renderer)
         cls._renderers.sort(key=lambda x: x.level, reverse=True)
+        cls.invalidate_cache()
 
     @classmethod
     def unregister(cls, renderer: CellImageRenderer) -> None:
@@ -23,22 +87,187 @@ class CellRendererRegistry:
         logger.info(f"Unregistering Renderer: {renderer}")
         if renderer in cls._renderers:
             cls._renderers.remove(renderer)
+        cls.invalidate_cache()
 
     @classmethod
     def clear(cls) -> None:
         """Clear all Renderers"""
         logger.info("Clearing all Renderers")
         cls._renderers.clear()
+        cls.invalidate_cache()
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Drop the per-type dispatch table and the merged string matcher"""
+        cls._dispatch = {}
+        cls._head_matcher = None
+        cls._tail_matcher = None
+        cls._pattern_renderers = set()
+        cls._matcher_ready = False
+
+    @classmethod
+    def config_key(cls) -> tuple:
+        """Fingerprint of the registered renderers and their settings
+
+        Caches of rendered cells include it in their keys, so reconfiguring,
+        swapping or reordering renderers invalidates them.
+        """
+        return tuple(_config_value(renderer) for renderer in cls._renderers)
+
+    @classmethod
+    def get_renderers(cls) -> List[CellImageRenderer]:
+        """Return the registered Renderers in priority order"""
+        return list(cls._renderers)
 
     @classmethod
     def show_renderers(cls) -> None:
         """Show all Renderers"""
         logger.info(f"Registered Renderers: {cls._renderers}")
 
+    @classmethod
+    def _get_candidates(cls, value_type: type) -> List[CellImageRenderer]:
+        """Renderers accepting value_type, in priority order (cached per type)"""
+        candidates = cls._dispatch.get(value_type)
+        if candidates is None:
+            candidates = [
+                renderer
+                for renderer in cls._renderers
+                if issubclass(value_type, getattr(renderer, "accepts", (object,)))
+            ]
+            cls._dispatch[value_type] = candidates
+        return candidates
+
+    @classmethod
+    def _build_matcher(cls) -> None:
+        """Merge the string patterns of all pattern-based renderers into two regexes
+
+        End-anchored patterns go into the tail matcher, all others into the
+        head matcher (see media_sniff.probe_parts). Alternatives are ordered
+        by renderer priority, and ``match`` tries them in order, so the first
+        matching group of each matcher is the renderer that would have won
+        when checking renderers one by one.
+        """
+        sources = {False: [], True: []}
+        groups = {False: [], True: []}
+        pattern_renderers = set()
+        for index, renderer in enumerate(cls._renderers):
+            get_patterns = getattr(renderer, "string_patterns", None)
+            if get_patterns is None or not _patterns_decide_strings(renderer):
+                continue
+            patterns = get_patterns()
+            if any(pattern.flags != _DEFAULT_FLAGS for pattern in patterns):
+                # Flags cannot be merged safely, fall back to can_render
+                continue
+            for tail in (False, True):
+                alternatives = "|".join(
+                    f"(?:{pattern.pattern})" for pattern in patterns if is_end_anchored(pattern) == tail
+                )
+                if alternatives:
+                    name = f"r{index}"
+                    sources[tail].append(f"(?P<{name}>{alternatives})")
+                    groups[tail].append((name, index, renderer))
+            pattern_renderers.add(id(renderer))
+
+        try:
+            head, tail = (
+                (re.compile("|".join(sources[side])), groups[side]) if sources[side] else None
+                for side in (False, True)
+            )
+        except re.error:
+            logger.warning("Failed to merge renderer patterns, falling back to can_render")
+            head, tail, pattern_renderers = None, None, set()
+
+        cls._head_matcher = head
+        cls._tail_matcher = tail
+        cls._pattern_renderers = pattern_renderers
+        cls._matcher_ready = True
+
+    @staticmethod
+    def _first_match(matcher: Optional[tuple], probe: str) -> Optional[tuple]:
+        """(renderer index, renderer) of the first group of matcher matching probe"""
+        if matcher is None:
+            return None
+        pattern, groups = matcher
+        match = pattern.match(probe)
+        if match is None:
+            return None
+        for name, index, renderer in groups:
+            if match.group(name) is not None:
+                return index, renderer
+        return None
+
+    @classmethod
+    def _match_string(cls, value: str) -> Optional[CellImageRenderer]:
+        """Return the highest priority pattern-based renderer matching value"""
+        head, tail = probe_parts(value)
+        head_match = cls._first_match(cls._head_matcher, head)
+        tail_match = cls._first_match(cls._tail_matcher, tail)
+        if tail_match is not None and newline_before_tail(value):
+            tail_match = None
+        if head_match is None or (tail_match is not None and tail_match[0] < head_match[0]):
+            head_match = tail_match
+        return head_match[1] if head_match is not None else None
+
+    @classmethod
+    def get_renderer(cls, value: Any) -> Optional[CellImageRenderer]:
+        """Return the renderer that would handle value, without rendering it"""
+        candidates = cls._get_candidates(type(value))
+        if not candidates:
+            return None
+
+        if isinstance(value, str):
+            if not cls._matcher_ready:
+                cls._build_matcher()
+            matched = cls._match_string(value)
+            pattern_renderers = cls._pattern_renderers
+            for renderer in candidates:
+                if id(renderer) in pattern_renderers:
+                    if renderer is matched:
+                        return renderer
+                elif renderer.can_render(value):
+                    return renderer
+            return None
+
+        for renderer in candidates:
+            if renderer.can_render(value):
+                return renderer
+        return None
+
     @classmethod
     def render(cls, value: Any) -> Optional[str]:
         """Render value using registered renderer"""
-        for renderer in cls._renderers:
-            if renderer.can_render(value):
-                return renderer.render(value)
+        renderer = cls.get_renderer(value)
+        if renderer is not None:
+            return renderer.render(value)
         return None
+
+    @classmethod
+    def render_many(cls, values: List[Any]) -> List[Optional[str]]:
+        """Render a batch of values (typically one column), preserving order
+
+        Values are grouped by the renderer that handles them and each group is
+        passed to the renderer's ``render_batch`` when it has one, so
+        renderers can amortize work across the batch. Values without a
+        renderer yield None, like render().
+        """
+        results: List[Optional[str]] = [None] * len(values)
+        groups: Dict[int, tuple] = {}
+        for position, value in enumerate(values):
+            renderer = cls.get_renderer(value)
+            if renderer is None:
+                continue
+            group = groups.get(id(renderer))
+            if group is None:
+                group = groups[id(renderer)] = (renderer, [], [])
+            group[1].append(position)
+            group[2].append(value)
+
+        for renderer, positions, group_values in groups.values():
+            render_batch = getattr(renderer, "render_batch", None)
+            if render_batch is not None:
+                rendered = render_batch(group_values)
+            else:
+                rendered = [renderer.render(value) for value in group_values]
+            for position, html in zip(positions, rendered):
+                results[position] = html
+        return results
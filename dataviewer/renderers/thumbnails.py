@@ -0,0 +1,153 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from dataviewer import logger
+
+from ..core.assets import AssetStore
+
+try:
+    from PIL import Image as PILImage
+    from PIL import ImageOps
+except ImportError:
+    PILImage = None
+
+# Part of every thumbnail's file name hash; bumped when thumbnails are made
+# differently (2: EXIF orientation applied), so stale files are not reused
+_THUMBNAIL_VERSION = 2
+
+
+class ThumbnailCache:
+    """Downsized copies of local images, cached on disk
+
+    Thumbnails are stored as ``<hash><ext>`` in ``directory``, where the hash
+    covers the absolute path, mtime and file size of the source image and the
+    thumbnail size, so an edited image gets a new thumbnail and an unchanged
+    one is never re-encoded. Requires Pillow; without it (or for anything
+    that is not a readable local image) no thumbnail is produced and callers
+    keep using the original path.
+
+    Args:
+        directory: Where thumbnails are written
+        size: Maximum (width, height) of a thumbnail, aspect ratio is kept
+        base_url: Prefix used in ``src`` for thumbnails. Defaults to the path
+            of directory relative to the HTML file being saved (relative to
+            the current directory when rendering to a string)
+        workers: Threads used by ``thumbnail_many``
+        quality: JPEG quality of thumbnails
+    """
+
+    def __init__(
+        self,
+        directory: str = ".thumbnails",
+        size: Tuple[int, int] = (400, 400),
+        base_url: Optional[str] = None,
+        workers: Optional[int] = None,
+        quality: int = 85,
+    ):
+        self.directory = directory
+        self.size = tuple(size)
+        self.base_url = base_url.replace(os.sep, "/") if base_url is not None else None
+        self.workers = workers
+        self.quality = quality
+        self._known: Dict[Tuple, Optional[str]] = {}
+
+    @staticmethod
+    def available() -> bool:
+        """Whether Pillow is installed"""
+        return PILImage is not None
+
+    def _source_key(self, path: str) -> Optional[Tuple]:
+        if "://" in path or path.startswith("data:"):
+            return None
+        try:
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, self.size)
+
+    def thumbnail(self, path: str) -> Optional[str]:
+        """Return the src of the thumbnail of path, creating it if needed
+
+        Returns None when no thumbnail can be made, e.g. for remote URLs,
+        missing files, non-images, or when Pillow is not installed.
+        """
+        filename = self._thumbnail_file(path)
+        return self._src(filename) if filename is not None else None
+
+    def _thumbnail_file(self, path: str) -> Optional[str]:
+        """File name of the thumbnail of path in directory, creating it if needed"""
+        if PILImage is None:
+            return None
+        source_key = self._source_key(path)
+        if source_key is None:
+            return None
+        if source_key in self._known:
+            return self._known[source_key]
+
+        digest = hashlib.blake2b(
+            repr((_THUMBNAIL_VERSION,) + source_key).encode("utf-8"), digest_size=16
+        )
+        filename = self._make_thumbnail(path, digest.hexdigest())
+        self._known[source_key] = filename
+        return filename
+
+    def _src(self, filename: str) -> str:
+        if self.base_url is not None:
+            return f"{self.base_url.rstrip('/')}/{filename}"
+        path = os.path.join(self.directory, filename)
+        store = AssetStore.current()
+        if store is not None:
+            return store.local_url(path)
+        return path.replace(os.sep, "/")
+
+    def _make_thumbnail(self, path: str, key: str) -> Optional[str]:
+        for ext in (".jpg", ".png"):
+            if os.path.exists(os.path.join(self.directory, key + ext)):
+                return key + ext
+
+        try:
+            with PILImage.open(path) as img:
+                # Let the JPEG decoder downscale while decoding; the bound is
+                # square because the EXIF orientation may still swap the sides
+                img.draft("RGB", (max(self.size),) * 2)
+                # Saving drops EXIF, so apply its orientation to the pixels
+                img = ImageOps.exif_transpose(img)
+                has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+                img = img.convert("RGBA" if has_alpha else "RGB")
+                img.thumbnail(self.size)
+                ext = ".png" if has_alpha else ".jpg"
+                os.makedirs(self.directory, exist_ok=True)
+                target = os.path.join(self.directory, key + ext)
+                tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+                if has_alpha:
+                    img.save(tmp_path, format="PNG", optimize=True)
+                else:
+                    img.save(tmp_path, format="JPEG", quality=self.quality)
+                os.replace(tmp_path, target)
+        except Exception as e:
+            logger.debug(f"Cannot create thumbnail for {path}: {e}")
+            return None
+        return key + ext
+
+    def thumbnail_many(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Thumbnails for several paths, made in a thread pool
+
+        Returns {path: thumbnail src} for the paths that have a thumbnail.
+        """
+        if PILImage is None:
+            return {}
+        paths = list(dict.fromkeys(paths))
+        if len(paths) <= 1 or self.workers == 1:
+            results = [self._thumbnail_file(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(self._thumbnail_file, paths))
+        # src depends on the active asset store, which the pool threads do not see
+        return {
+            path: self._src(filename)
+            for path, filename in zip(paths, results)
+            if filename is not None
+        }
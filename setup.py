@@ -5,6 +5,7 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=["pytest>=7.0.0",],
+    extras_require={"thumbnails": ["Pillow"]},
     python_requires=">=3.7",
     author="suizongbuhenatie",
     description="A Python library for creating nested visualizations",
@@ -44,3 +44,82 @@ def test_component_kwargs():
     component = Component(custom_attr="test")
     assert hasattr(component, "custom_attr")
     assert component.custom_attr == "test"
+
+
+def test_render_cache_hits_and_dirty_tracking():
+    """测试渲染缓存：未修改时命中，属性赋值后失效"""
+    from dataviewer.components import Header
+
+    Component.clear_render_cache()
+    header = Header("标题")
+    first = header.to_html()
+    assert header.to_html() == first
+    assert Component.render_cache_info()["hits"] == 1
+
+    header.text = "新标题"
+    assert "新标题" in header.to_html()
+    assert Component.render_cache_info()["misses"] == 2
+
+
+def test_render_cache_opt_in_and_mark_dirty():
+    """测试任意组件都可以开启渲染缓存，原地修改后需要 mark_dirty"""
+    from dataviewer.components import Table
+
+    Component.clear_render_cache()
+    data = [{"id": 1}]
+    table = Table(data=data)
+    table.to_html()
+    table.to_html()
+    assert Component.render_cache_info()["hits"] == 0
+
+    table.render_cache = True
+    first = table.to_html()
+    assert table.to_html() == first
+    assert Component.render_cache_info()["hits"] == 1
+
+    data.append({"id": 2})
+    assert table.to_html() == first
+    table.mark_dirty()
+    assert ">2</td>" in table.to_html()
+
+
+def test_render_cache_containers_and_bound():
+    """测试容器的缓存随子组件变化失效，缓存容量有上限"""
+    from dataviewer.components import Container, Header
+
+    Component.clear_render_cache()
+    child = Header("子组件")
+    container = Container(children=[child])
+    container.render_cache = True
+    container.to_html()
+    child.color = "red"
+    assert "text-red-600" in container.to_html()
+
+    Component.set_render_cache_size(2)
+    try:
+        for i in range(5):
+            Header(f"标题{i}").to_html()
+        info = Component.render_cache_info()
+        assert info["size"] == 2 and info["evictions"] >= 3
+    finally:
+        Component.set_render_cache_size(1024)
+
+
+def test_write_html_accepts_out_keyword():
+    """测试 write_html 可以用关键字参数 out 调用，缓存命中时同样如此"""
+    import io
+
+    from dataviewer.components import Table
+
+    Component.clear_render_cache()
+    table = Table(data=[{"a": 1}])
+    buffer = io.StringIO()
+    table.write_html(out=buffer)
+    assert ">1</td>" in buffer.getvalue()
+
+    table.render_cache = True
+    first, second = io.StringIO(), io.StringIO()
+    table.write_html(out=first)
+    table.write_html(out=second)
+    assert second.getvalue() == first.getvalue() == buffer.getvalue()
+    assert Component.render_cache_info()["hits"] == 1
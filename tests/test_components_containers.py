@@ -78,3 +78,14 @@ def test_nested_containers():
     assert isinstance(column.children[1], Button)
     assert column.children[0].children[0].text == "按钮1"
     assert column.children[1].text == "按钮2"
+
+
+def test_container_write_html_matches_to_html():
+    """测试容器流式渲染与 to_html 一致"""
+    import io
+
+    row = FlexRow(children=[Button(text="按钮1"), Grid(children=[Button(text="按钮2")])])
+    buffer = io.StringIO()
+    row.write_html(buffer)
+    assert buffer.getvalue() == row.to_html()
+    assert "按钮1" in buffer.getvalue() and "按钮2" in buffer.getvalue()
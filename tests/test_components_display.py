@@ -1,6 +1,8 @@
 import pytest
 
 from dataviewer.components import Header, Table, Tag
+from dataviewer.core import Page
+from dataviewer.renderers import CellRendererRegistry
 
 
 def test_header_basic():
@@ -122,3 +124,502 @@ def test_table_column_width():
     table = Table(data=[], min_column_width=100, max_column_width=300)
     assert table.min_column_width == 100
     assert table.max_column_width == 300
+
+
+def test_table_column_types_inferred_once_per_column(monkeypatch):
+    """测试按列推断类型，不在每个单元格上重复渲染判断"""
+    data = [{"id": i, "image": f"img_{i}.png", "text": "x" * 60} for i in range(50)]
+    table = Table(data=data, type_sample_size=10)
+
+    calls = []
+    original = CellRendererRegistry.get_renderer.__func__
+
+    def counting_get_renderer(cls, value):
+        calls.append(value)
+        return original(cls, value)
+
+    monkeypatch.setattr(
+        CellRendererRegistry, "get_renderer", classmethod(counting_get_renderer)
+    )
+    table._infer_column_types()
+    assert table.column_types == {"id": "default", "image": "image", "text": "long_text"}
+    # 每列最多检查 type_sample_size 个值
+    assert len(calls) <= 3 * 10
+
+
+def test_table_mixed_column_falls_back_to_cell_detection():
+    """测试类型不一致的列会被标记为 mixed 并逐个单元格判断"""
+    data = [{"value": "photo.png"}, {"value": {"a": 1}}, {"value": 3}]
+    table = Table(data=data)
+    assert table.column_types["value"] == "mixed"
+
+    html = table.to_html()
+    assert "<img" in html
+    assert "<pre>" in html
+
+
+def test_table_column_types_skip_missing_values():
+    """测试缺失值不影响列类型推断"""
+    data = [{"id": 1}, {"id": 2, "image": "a.jpg"}, {"id": 3, "image": None}]
+    table = Table(data=data)
+    assert table.column_types["image"] == "image"
+
+
+def test_table_column_types_with_array_cells():
+    """测试单元格为 NumPy 数组时可以推断类型并渲染"""
+    np = pytest.importorskip("numpy")
+    table = Table(data=[{"v": np.zeros(5)}, {"v": ""}, {"v": np.arange(3)}])
+    assert table.column_types["v"] == "default"
+    html = table.to_html()
+    assert "[0. 0. 0. 0. 0.]" in html and "[0 1 2]" in html
+
+
+def test_table_virtual_mode_emits_payload_instead_of_rows():
+    """测试虚拟滚动模式只输出行数据，不输出 <tr> 行"""
+    import json
+    import re
+
+    from dataviewer.core import Page
+
+    data = [{"id": i, "name": f"<b>{i}</b>", "image": "a.png"} for i in range(1000)]
+    table = Table(data=data, virtual=True)
+    html = table.to_html()
+
+    assert "virtual_table" in Page._init_flags
+    assert "DataViewerVirtualTable" in Page._additional_head_content
+    assert html.count("<tr>") == 1  # 只有表头
+    assert 'DataViewerVirtualTable.init("%s"' % table.id in html
+
+    payload = re.search(
+        r'<script type="application/json" id="%s-data">(.*?)</script>' % table.id,
+        html,
+        re.S,
+    ).group(1)
+    assert "</" not in payload
+    decoded = json.loads(payload)
+    assert len(decoded["rows"]) == 1000
+    assert len(decoded["cells"]) == 2
+    # 单元格内容复用现有渲染器的输出
+    assert decoded["rows"][0][1] == "&lt;b&gt;0&lt;/b&gt;"
+    assert "<img" in decoded["rows"][0][2]
+
+
+def test_table_renders_only_current_page():
+    """测试分页时只渲染当前页的数据"""
+    data = [{"id": i} for i in range(25)]
+    table = Table(data=data, page_size=10, current_page=3)
+    assert table.page_count == 3
+
+    html = table.to_html()
+    assert html.count("<tr>") == 1 + 5
+    assert ">20</td>" in html and ">24</td>" in html
+    assert ">19</td>" not in html
+    # 未设置 page_url 时不输出导航
+    assert "pagination" not in html
+
+
+def test_table_pagination_links():
+    """测试分页导航链接"""
+    data = [{"id": i} for i in range(100)]
+    table = Table(data=data, page_size=10, current_page=5, page_url="rows-{page}.html")
+    html = table.to_html()
+    assert 'href="rows-4.html">上一页' in html
+    assert 'href="rows-6.html">下一页' in html
+    assert 'href="rows-10.html">10' in html
+    assert 'href="rows-8.html"' not in html
+
+
+def test_page_save_shards_paginated_table(tmp_path):
+    """测试按表格分页把页面保存为多个文件"""
+    from dataviewer.components import FlexColumn, Header
+    from dataviewer.core import Page
+
+    page = Page("分页")
+    table = Table(data=[{"id": i} for i in range(25)], page_size=10)
+    page.add(Header(text="报告"))
+    page.add(FlexColumn(children=[table]))
+
+    output_file = tmp_path / "report.html"
+    page.save(str(output_file), shard=True)
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["report-2.html", "report-3.html", "report.html"]
+    third = (tmp_path / "report-3.html").read_text(encoding="utf-8")
+    assert "报告" in third
+    assert ">24</td>" in third and ">0</td>" not in third
+    assert 'href="report.html">1' in third
+    # 保存后恢复表格原有状态
+    assert table.current_page == 1
+    assert table.page_url is None
+
+
+def test_table_json_limits_apply_to_list_cells():
+    """测试列表单元格同样使用表格的 JSON 截断设置"""
+    data = [{"tags": ["x" * 1000, "y"], "info": {"text": "x" * 1000}}]
+    elided = Table(data=data).to_html()
+    assert elided.count('class="json-elided"') == 2 and "x" * 1000 not in elided
+
+    # 页面中两个单元格的完整内容相同，只输出一次；行缓存命中时同样输出
+    page = Page("截断")
+    page.add(Table(data=data, row_cache_size=10))
+    for _ in range(2):
+        assert page.render().count("x" * 1000) == 1
+
+    full = Table(data=data, json_max_string_length=None).to_html()
+    assert "json-elided" not in full and full.count("x" * 1000) == 2
+    assert '[\n  "' in full  # 列表保持 DefaultRenderer 的缩进
+
+    images = Table(data=[{"tags": ["a.png", "b.jpg"]}]).to_html()
+    assert images.count("<img") == 2
+
+
+def test_page_save_shard_rejects_lazy_table(tmp_path):
+    """测试惰性数据源的分页表格无法分片保存时报错，而不是只写出第一页"""
+    from dataviewer.core import Page
+
+    page = Page("分页")
+    table = Table(data=({"id": i} for i in range(25)), page_size=10)
+    page.add(table)
+    assert not table.page_count_known
+
+    with pytest.raises(ValueError, match="lazy"):
+        page.save(str(tmp_path / "report.html"), shard=True)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_table_from_columns():
+    """测试从列式数据创建表格"""
+    table = Table.from_columns(
+        {"id": [1, 2, 3], "image": ["a.png", "b.png", "c.png"]}, page_size=2
+    )
+    assert table.columns == [{"key": "id", "title": "Id"}, {"key": "image", "title": "Image"}]
+    assert len(table.data) == 3
+    assert table.data[2]["image"] == "c.png"
+    assert table.column_types == {"id": "default", "image": "image"}
+
+    html = table.to_html()
+    assert html.count("<img") == 2
+    assert ">1</td>" in html and ">3</td>" not in html
+
+
+def test_table_from_columns_length_mismatch():
+    """测试列长度不一致时报错"""
+    with pytest.raises(ValueError):
+        Table.from_columns({"a": [1, 2], "b": [1]})
+
+
+def test_table_from_pandas_uses_dtypes():
+    """测试从 DataFrame 创建表格时按 dtype 推断列类型"""
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"score": [0.5, 1.5], "flag": [True, False], "path": ["a.jpg", "b.jpg"]})
+    table = Table.from_pandas(df)
+    assert table.column_types == {"score": "default", "flag": "default", "path": "image"}
+    assert table.data[1]["flag"] is False
+    assert "1.5" in table.to_html()
+
+
+def test_table_from_pandas_datetime_columns():
+    """测试纳秒精度的时间列渲染为日期时间而不是整数"""
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(
+        {
+            "when": pd.to_datetime(["2024-01-01 00:00:00", "2024-01-02 03:04:05", None]),
+            "took": pd.to_timedelta(["1 day", "2h", None]),
+        }
+    ).astype({"when": "datetime64[ns]", "took": "timedelta64[ns]"})
+    table = Table.from_pandas(df)
+    assert table.column_types == {"when": "default", "took": "default"}
+    assert str(table.data[1]["when"]) == "2024-01-02 03:04:05"
+    assert str(table.data[0]["took"]) == "1 day, 0:00:00"
+    assert table.data[2]["when"] is None and table.data[2]["took"] is None
+    html = table.to_html()
+    assert "2024-01-01 00:00:00" in html and "1704067200000000000" not in html
+
+
+def test_table_from_pandas_nullable_columns():
+    """测试可空扩展类型的空值转换为 None，整数不变成浮点数"""
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(
+        {
+            "s": pd.array(["a", None], dtype="string"),
+            "n": pd.array([1, None], dtype="Int64"),
+            "b": pd.array([True, None], dtype="boolean"),
+        }
+    )
+    table = Table.from_pandas(df)
+    assert table.data[0]["n"] == 1 and isinstance(table.data[0]["n"], int)
+    assert [table.data[1][key] for key in ("s", "n", "b")] == [None, None, None]
+    assert table.column_types == {"s": "default", "n": "default", "b": "default"}
+    assert ">a</td>" in table.to_html()
+
+
+def test_table_from_pandas_array_column():
+    """测试 object 列中的 NumPy 数组可以渲染"""
+    pd = pytest.importorskip("pandas")
+    np = pytest.importorskip("numpy")
+    df = pd.DataFrame({"id": [1, 2]})
+    df["emb"] = [np.zeros(4), np.arange(4)]
+    html = Table.from_pandas(df).to_html()
+    assert "[0. 0. 0. 0.]" in html and "[0 1 2 3]" in html
+
+
+def test_table_from_arrow():
+    """测试从 pyarrow Table 创建表格"""
+    pa = pytest.importorskip("pyarrow")
+    arrow_table = pa.table({"id": [1, 2], "name": ["x", None]})
+    table = Table.from_arrow(arrow_table)
+    assert table.column_types["id"] == "default"
+    assert table.data[1]["name"] is None
+    assert table.data[1]["id"] == 2
+
+
+@pytest.mark.parametrize("virtual", [False, True])
+def test_table_parallel_render_matches_serial(virtual):
+    """测试进程池并行渲染的结果与单进程一致且顺序不变"""
+    data = [{"id": i, "text": "row %d" % i, "info": {"n": i}} for i in range(230)]
+    serial = Table(data=data, virtual=virtual, id="serial").to_html()
+    parallel = Table(
+        data=data, virtual=virtual, workers=2, chunk_size=50, id="serial"
+    ).to_html()
+    assert parallel == serial
+
+
+def test_table_parallel_render_columnar():
+    """测试列式数据也可以并行渲染"""
+    table = Table.from_columns(
+        {"id": list(range(120)), "name": ["n%d" % i for i in range(120)]},
+        workers=2,
+        chunk_size=40,
+    )
+    html = table.to_html()
+    assert html.count("<tr>") == 121
+    assert html.index(">n39</td>") < html.index(">n40</td>") < html.index(">n119</td>")
+
+
+def test_table_cell_templates_compiled_once_per_render(monkeypatch):
+    """测试单元格的 <td> 模板每次渲染只拼接一次，与行数无关"""
+    data = [{"id": i, "text": "x" * 60, "info": {"n": i}} for i in range(200)]
+    table = Table(data=data, page_size=200)
+
+    calls = []
+    original = Table.get_cell_style
+
+    def counting_get_cell_style(self, col_type):
+        calls.append(col_type)
+        return original(self, col_type)
+
+    monkeypatch.setattr(Table, "get_cell_style", counting_get_cell_style)
+    html = table.to_html()
+    assert html.count("<tr>") == 201
+    # 模板按 (行奇偶, 列类型) 预编译，表头每列一次，不随行数增长
+    assert len(calls) <= 2 * len(Table._COLUMN_TYPES) + len(table.columns)
+
+    # 模板与逐个拼接的结果一致
+    templates = table._compile_cell_templates(Table._CELL_BASE_CLASSES)
+    assert templates[1, "json"] == (
+        '<td class="px-4 py-3 bg-gray-50 hover:bg-gray-100" %s>' % table.get_cell_style("json")
+    )
+
+
+def test_table_row_cache_renders_only_changed_rows(monkeypatch):
+    """测试行缓存：追加行后重新渲染只渲染新增的行"""
+    data = [{"id": i, "name": "n%d" % i} for i in range(10)]
+    table = Table(data=data, row_cache_size=100)
+    first = table.to_html()
+    assert table.row_cache_info()["misses"] == 10
+
+    rendered = []
+    original = Table._render_rows
+
+    def counting_render_rows(self, rows, *args):
+        rendered.extend(row["id"] for _, row in rows)
+        return original(self, rows, *args)
+
+    monkeypatch.setattr(Table, "_render_rows", counting_render_rows)
+    data.append({"id": 10, "name": "n10"})
+    data[3] = {"id": 3, "name": "changed"}
+    second = table.to_html()
+
+    assert sorted(rendered) == [3, 10]
+    assert table.row_cache_info()["hits"] == 9
+    assert "changed" in second and ">n3<" in first
+
+
+def test_table_row_cache_keys_on_content():
+    """测试行缓存按内容计算指纹：repr 相同的不同数组不会命中，repr 含地址的值不缓存"""
+    np = pytest.importorskip("numpy")
+    vector = np.zeros(5000)
+    data = [{"id": 0, "vec": vector}, {"id": 1, "vec": np.zeros(5000)}]
+    table = Table(data=data, row_cache_size=100)
+    table.to_html()
+    table.to_html()
+    assert table.row_cache_info()["hits"] == 2
+
+    changed = vector.copy()
+    changed[2500] = 1
+    assert repr(changed) == repr(vector)
+    data[0] = {"id": 0, "vec": changed}
+    table.to_html()
+    info = table.row_cache_info()
+    assert info["hits"] == 3 and info["misses"] == 3
+
+    class Opaque:
+        pass
+
+    opaque = Table(data=[{"id": 0, "obj": Opaque()}], row_cache_size=100)
+    assert "Opaque object" in opaque.to_html() and "Opaque object" in opaque.to_html()
+    assert opaque.row_cache_info()["size"] == 0
+
+
+def test_table_row_cache_follows_renderer_config():
+    """测试单元格渲染器的配置修改后，行缓存不再返回旧的HTML"""
+    from dataviewer.renderers import CellImageRenderer
+
+    renderer = next(
+        r for r in CellRendererRegistry.get_renderers() if isinstance(r, CellImageRenderer)
+    )
+    table = Table(data=[{"id": i, "image": "a%d.png" % i} for i in range(3)], row_cache_size=100)
+    width = renderer.width
+    try:
+        assert table.to_html().count("width: 200px;") == 3
+        renderer.width = "50px"
+        html = table.to_html()
+        assert html.count("width: 50px;") == 3 and "width: 200px;" not in html
+        assert table.row_cache_info()["hits"] == 0
+    finally:
+        renderer.width = width
+
+
+def test_table_row_cache_bounded():
+    """测试行缓存有容量上限，并在列配置变化时失效"""
+    table = Table(data=[{"id": i} for i in range(20)], row_cache_size=5)
+    table.to_html()
+    info = table.row_cache_info()
+    assert info["size"] == 5
+    assert info["evictions"] == 15
+
+    table.compact = True
+    assert 'class="px-2 py-2' in table.to_html()
+    assert Table(data=[{"id": 1}]).row_cache_info() == {}
+
+
+def test_table_row_cache_with_workers():
+    """测试并行渲染时行缓存同样生效"""
+    data = [{"id": i} for i in range(120)]
+    table = Table(data=data, workers=2, chunk_size=40, row_cache_size=1000)
+    first = table.to_html()
+    second = table.to_html()
+    assert first == second
+    assert table.row_cache_info()["hits"] == 120
+
+
+def test_table_from_generator_streams_in_batches():
+    """测试惰性可迭代数据源按批读取"""
+    consumed = []
+
+    def rows():
+        for i in range(25):
+            consumed.append(i)
+            yield {"id": i, "name": "n%d" % i}
+
+    table = Table(data=rows(), batch_size=10, max_rows=22)
+    # 构造时只读取首批数据用于推断列
+    assert len(consumed) == 10
+    assert table.columns == [{"key": "id", "title": "Id"}, {"key": "name", "title": "Name"}]
+
+    html = table.to_html()
+    assert html.count("<tr>") == 1 + 22
+    assert ">n21</td>" in html and ">n22</td>" not in html
+    assert len(consumed) == 22
+
+
+def test_table_from_sqlite_cursor():
+    """测试直接从 DB-API 游标渲染"""
+    import sqlite3
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (id INTEGER, image TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?, ?)", [(i, f"{i}.png") for i in range(30)])
+    cursor = conn.execute("SELECT id, image FROM t ORDER BY id")
+
+    table = Table(data=cursor, batch_size=8, page_size=5, current_page=2)
+    assert [c["key"] for c in table.columns] == ["id", "image"]
+    assert table.column_types == {"id": "default", "image": "image"}
+
+    html = table.to_html()
+    assert html.count("<img") == 5
+    assert 'src="5.png"' in html and 'src="10.png"' not in html
+
+
+def test_table_streaming_parallel():
+    """测试惰性数据源也可以并行渲染"""
+    table = Table(data=({"id": i} for i in range(90)), workers=2, chunk_size=25)
+    html = table.to_html()
+    assert html.count("<tr>") == 91
+    assert html.index(">24</td>") < html.index(">25</td>") < html.index(">89</td>")
+
+
+def test_table_infer_columns_keeps_first_seen_order_and_sparse_columns():
+    """测试列推断保持键首次出现的顺序，并识别稀疏列"""
+    data = [{"id": i, "name": "n%d" % i} for i in range(10)]
+    data[4]["note"] = "稀疏"
+    table = Table(data=data)
+    assert [c["key"] for c in table.columns] == ["id", "name", "note"]
+    assert table.sparse_columns == ["note"]
+
+
+def test_table_infer_columns_sampling_strategies():
+    """测试列推断的采样策略"""
+    data = [{"a": i} for i in range(100)] + [{"a": 100, "late": 1}]
+
+    assert [c["key"] for c in Table(data=data).columns] == ["a", "late"]
+    first = Table(data=data, column_sample="first", column_sample_size=10)
+    assert [c["key"] for c in first.columns] == ["a"]
+
+    reservoir = Table(data=data, column_sample="reservoir", column_sample_size=101)
+    assert [c["key"] for c in reservoir.columns] == ["a", "late"]
+    sampled = Table(data=iter(data), column_sample="reservoir", column_sample_size=5)
+    assert [c["key"] for c in sampled.columns][0] == "a"
+
+    with pytest.raises(ValueError):
+        Table(data=data, column_sample="random")
+
+
+def test_table_infer_columns_wide_rows_linear():
+    """测试宽表列推断为线性复杂度"""
+
+    class CountingKey(str):
+        comparisons = 0
+
+        def __eq__(self, other):
+            CountingKey.comparisons += 1
+            return str.__eq__(self, other)
+
+        __hash__ = str.__hash__
+
+    n_rows, n_cols = 200, 300
+    # 每行使用新的键对象，与解析 JSON 得到的数据一致
+    data = [
+        {CountingKey("col_%d" % i): 1 for i in range(n_cols)} for _ in range(n_rows)
+    ]
+    table = Table(data=data)
+    assert len(table.columns) == n_cols
+    assert [c["key"] for c in table.columns[:2]] == ["col_0", "col_1"]
+    # 每个单元格的键只做常数次比较；旧实现在列表上做 in 判断，需要约 行数×列数²/2 次
+    assert CountingKey.comparisons <= 4 * n_rows * n_cols
+
+
+def test_table_renders_cells_per_column(monkeypatch):
+    """测试表格按列批量调用渲染器"""
+    calls = []
+    original = CellRendererRegistry.render_many
+
+    def counting_render_many(values):
+        calls.append(len(values))
+        return original(values)
+
+    monkeypatch.setattr(CellRendererRegistry, "render_many", counting_render_many)
+    data = [{"id": i, "name": "<n%d>" % i} for i in range(30)]
+    html = Table(data=data, chunk_size=20).to_html()
+    assert calls == [20, 20, 10, 10]
+    assert "&lt;n29&gt;" in html
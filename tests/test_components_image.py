@@ -78,3 +78,48 @@ def test_image_html_rendering(tmp_path):
     assert 'alt="测试图片"' in html
     assert 'class="rounded zoomable-image"' in html
     assert "data:image/png;base64," in html
+
+
+def test_image_thumbnail(tmp_path):
+    """测试图片组件使用缩略图，预览时打开原图"""
+    PIL = pytest.importorskip("PIL.Image")
+    from dataviewer.renderers.thumbnails import ThumbnailCache
+
+    source = tmp_path / "big.png"
+    PIL.new("RGBA", (800, 400)).save(source)
+    image = Image(src=str(source), thumbnails=ThumbnailCache(str(tmp_path / "thumbs"), size=(80, 80)))
+    html = image.to_html()
+    assert f'data-full="{source}"' in html
+    assert ".png" in html and str(tmp_path / "thumbs") in html
+    assert 'src="missing.png"' in Image(src="missing.png", thumbnails=image.thumbnails).to_html()
+
+
+def test_image_thumbnail_relative_to_saved_page(tmp_path, monkeypatch):
+    """测试保存到子目录的页面中，缩略图地址相对于 HTML 文件所在目录"""
+    PIL = pytest.importorskip("PIL.Image")
+    from dataviewer.core import Page
+    from dataviewer.renderers.thumbnails import ThumbnailCache
+
+    monkeypatch.chdir(tmp_path)
+    PIL.new("RGB", (800, 400)).save("big.jpg")
+    (tmp_path / "reports").mkdir()
+    page = Page("缩略图")
+    page.add(Image(src="big.jpg", thumbnails=ThumbnailCache("thumbs", size=(80, 80))))
+    page.save("reports/page.html")
+
+    (thumb,) = (tmp_path / "thumbs").iterdir()
+    content = (tmp_path / "reports" / "page.html").read_text(encoding="utf-8")
+    assert f'src="../thumbs/{thumb.name}"' in content
+    assert f'src="thumbs/{thumb.name}"' in page.render()
+
+
+def test_image_intrinsic_size(tmp_path):
+    """测试图片组件输出从文件头读取的固有尺寸"""
+    PIL = pytest.importorskip("PIL.Image")
+
+    source = tmp_path / "photo.jpg"
+    PIL.new("RGB", (300, 200)).save(source)
+    assert 'width="300" height="200"' in Image(src=str(source)).to_html()
+    html = Image(src=str(source), width=150).to_html()
+    assert "width: 150px; height: auto; aspect-ratio: auto 300 / 200" in html
+    assert "aspect-ratio" not in Image(src=str(source), width=150, height=50).to_html()
@@ -0,0 +1,263 @@
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from dataviewer.components import JsonView
+from dataviewer.core import Page
+
+
+def _lazy_values(html, view_id):
+    """取出惰性模式输出的子树数据，每个值在单独的 <script> 中"""
+    return [
+        json.loads(payload)
+        for payload in re.findall(
+            r'<script type="application/json" data-json-lazy="%s">(.*?)</script>' % view_id,
+            html,
+            re.S,
+        )
+    ]
+
+
+def _strip_scripts(html):
+    return re.sub(r"<script.*?</script>", "", html, flags=re.S)
+
+
+def test_json_view_basic():
+    """测试JSON视图的基本渲染"""
+    html = JsonView({"name": "<b>", "ok": True, "n": 1, "none": None}, id="basic").to_html()
+    assert '<span class="json-string">"&lt;b&gt;"</span>' in html
+    assert '<span class="json-boolean">true</span>' in html
+    assert '<span class="json-number">1</span>' in html
+    assert '<span class="json-null">null</span>' in html
+
+
+def test_json_view_deep_nesting_is_iterative():
+    """测试深层嵌套不会触及递归上限"""
+    data = leaf = {}
+    for _ in range(5000):
+        leaf["child"] = {}
+        leaf = leaf["child"]
+    leaf["value"] = 1
+    html = _strip_scripts(JsonView(data, id="deep").to_html())
+    assert html.count('<span class="json-toggle">') == 5001
+
+
+def test_json_view_lazy_mode():
+    """测试惰性模式只输出默认展开的层级，折叠的子树以 JSON 输出"""
+    data = {"a": {"b": {"c": [1, 2, {"d": "x"}]}}, "e": [{"f": 1}], "g": 3}
+    eager = JsonView(data, id="eager", default_expand_level=1).to_html()
+    lazy = JsonView(data, id="lazy", default_expand_level=1, lazy=True).to_html()
+
+    assert 'json-number">3<' in lazy
+    assert _strip_scripts(lazy).count('data-lazy="') == 2
+    assert '"d"' not in _strip_scripts(lazy)
+    assert _lazy_values(lazy, "lazy") == [{"c": [1, 2, {"d": "x"}]}, {"f": 1}]
+    assert _lazy_values(eager, "eager") == []
+    assert "data-lazy" not in _strip_scripts(eager)
+
+
+def test_json_view_shared_runtime():
+    """测试样式和脚本只在页面头部输出一次，每个实例只有一行初始化调用"""
+    from dataviewer.core import Page
+
+    page = Page("JSON")
+    for i in range(20):
+        page.add(JsonView({"i": i}, id=f"view-{i}", default_expand_level=1))
+    html = page.render()
+    assert html.count("window.DataViewerJsonView = ") == 1
+    assert html.count(".json-view {") == 1
+    assert "DataViewerJsonView.init('view-19', 1);" in html
+    assert "<style>" not in JsonView({"a": 1}).to_html()
+
+
+def test_json_view_paging():
+    """测试大数组和大对象只渲染第一页，其余条目以 JSON 输出"""
+    data = {"items": list(range(1000)), "fields": {f"k{i}": i for i in range(250)}}
+    html = JsonView(data, id="paged", page_size=100, max_numeric_items=None).to_html()
+    body = _strip_scripts(html)
+
+    assert body.count('class="json-number"') == 200
+    assert 'data-page-size="100"' in html
+    assert "已显示第 0–99 项，共 1,000 项" in body
+    assert "已显示第 0–99 项，共 250 项" in body
+    assert 'data-more="0" data-start="100" data-next="100" data-total="1000"' in body
+    assert 'data-kind="object"' in body
+    # 剩余条目按页分块，每块单独输出
+    remaining = _lazy_values(html, "paged")
+    assert 'data-chunk="100"' in body and 'data-more="9"' in body
+    assert remaining[:9] == [list(range(n, n + 100)) for n in range(100, 1000, 100)]
+    assert remaining[9][0] == ["k100", 100] and len(remaining[9]) == 100
+    assert remaining[10][-1] == ["k249", 249] and len(remaining) == 11
+
+    unpaged = _strip_scripts(
+        JsonView(data, id="unpaged", page_size=None, max_numeric_items=None).to_html()
+    )
+    assert unpaged.count('class="json-number"') == 1250
+    assert "json-more" not in unpaged
+
+
+def test_json_view_non_finite_floats_in_scripts():
+    """测试 NaN / Infinity 不会写进 <script> 中的 JSON，浏览器的 JSON.parse 不接受它们"""
+
+    def reject_constant(name):
+        raise ValueError(name)
+
+    data = [float("nan")] + list(range(200)) + [float("inf"), float("-inf")]
+    html = JsonView(data, id="nan", page_size=100).to_html()
+    payloads = re.findall(
+        r'<script type="application/json" data-json-lazy="nan">(.*?)</script>', html, re.S
+    )
+    assert payloads
+    values = [json.loads(payload, parse_constant=reject_constant) for payload in payloads]
+    assert values[0][0] == "nan" and values[0][-2:] == ["inf", "-inf"]
+
+
+def test_json_view_non_json_values():
+    """测试元组等序列按数组渲染，其余非 JSON 值按 str() 渲染，惰性模式与直接渲染一致"""
+    import datetime
+    from decimal import Decimal
+
+    data = {"pair": (1, "a"), "range": range(2), "when": datetime.date(2024, 1, 2), None: Decimal("1.5")}
+    html = _strip_scripts(JsonView(data, id="extra", searchable=True).to_html())
+    assert html.count('<span class="json-number">1</span>') == 2
+    assert '<span class="json-string">"a"</span>' in html
+    assert '<span class="json-string">"2024-01-02"</span>' in html
+    assert '<span class="json-key">"null"</span>: <span class="json-string">"1.5"</span>' in html
+
+    lazy = JsonView({"root": data}, id="extra-lazy", lazy=True, default_expand_level=0).to_html()
+    assert _lazy_values(lazy, "extra-lazy") == [
+        {"pair": [1, "a"], "range": [0, 1], "when": "2024-01-02", "null": "1.5"}
+    ]
+
+
+def test_json_view_node_levels():
+    """测试可折叠节点带有 data-level，惰性占位同样带有层级"""
+    data = {"a": {"b": [1, {"c": 2}]}, "d": [3]}
+    html = _strip_scripts(JsonView(data, id="levels").to_html())
+    levels = [int(level) for level in re.findall(r'data-level="(\d+)"', html)]
+    assert levels == [0, 1, 2, 3, 1]
+
+    lazy = _strip_scripts(JsonView(data, id="lazy-levels", lazy=True, default_expand_level=1).to_html())
+    assert '<div class="json-collapsed" data-level="2" data-lazy="0">' in lazy
+
+
+def test_json_view_deep_lazy_subtree():
+    """测试惰性模式下很深的子树也能序列化"""
+    data = leaf = {}
+    for _ in range(5000):
+        leaf["child"] = {}
+        leaf = leaf["child"]
+    html = JsonView(data, id="deep-lazy", lazy=True, default_expand_level=1).to_html()
+    payload = re.search(r'data-json-lazy="deep-lazy">(.*?)</script>', html).group(1)
+    assert payload == '{"child":' * 4998 + "{}" + "}" * 4998
+
+
+def test_json_view_from_file(tmp_path):
+    """测试从文件创建视图时只解析默认展开的层级和第一页，其余部分按字节偏移从文件输出"""
+    from dataviewer.components.json_source import JsonRef
+
+    data = {
+        "name": "run <1>",
+        "records": [{"id": i, "tags": ["é", {"deep": [i]}]} for i in range(250)],
+        "fields": {f"k{i}": i for i in range(150)},
+        "empty": {},
+    }
+    path = tmp_path / "run.json"
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    view = JsonView.from_file(str(path), id="file", default_expand_level=2, page_size=100)
+    records = view.data["records"]
+    assert len(records) == 100
+    # 剩余条目按页记录，每页单独输出
+    assert [page.count for page in records.remainder] == [100, 50]
+    assert records.remainder[0].load() == data["records"][100:200]
+    assert records.remainder[1].load() == data["records"][200:]
+    assert isinstance(records[0]["tags"], JsonRef)
+    assert records[0]["tags"].load() == data["records"][0]["tags"]
+    assert [page.load() for page in view.data["fields"].remainder] == [
+        {f"k{i}": i for i in range(100, 150)}
+    ]
+
+    html = view.to_html()
+    body = _strip_scripts(html)
+    assert "已显示第 0–99 项，共 250 项" in body
+    assert "[ 2 个元素 ]" in body
+    assert "\\u003c1>" not in body and "run &lt;1&gt;" in body
+    lazy = _lazy_values(html, "file")
+    assert data["records"][0]["tags"] in lazy
+    assert data["records"][100:200] in lazy and data["records"][200:] in lazy
+    assert {f"k{i}": i for i in range(100, 150)} in lazy
+    assert 'data-total="250" data-kind="array" data-chunk="100"' in body
+    assert JsonView.from_file(str(path), default_expand_level=999, page_size=None).data == data
+
+
+def test_json_view_search_index():
+    """测试搜索索引的节点编号、子树大小和倒排索引与渲染出的 data-node 一致"""
+    from dataviewer.components.json_view import _build_search_index
+
+    data = {"user": {"Name": "Alice", "tags": ["x", "y"]}, "ok": True, "list": list(range(5))}
+    index = _build_search_index(data)
+    assert index["parents"][:5] == [-1, 0, 1, 1, 3]
+    assert index["keys"][:5] == [None, "user", "Name", "tags", 0]
+    assert index["sizes"][:2] == [13, 5]
+    assert index["terms"]["alice"] == [2]
+    assert index["terms"]["true"] == [6]
+
+    view = JsonView(data, id="search", searchable=True, page_size=3)
+    html = view.to_html()
+    assert 'id="search-search"' in html
+    assert json.loads(
+        re.search(r'id="search-index">(.*?)</script>', html).group(1)
+    ) == index
+    body = _strip_scripts(html)
+    assert '<div data-node="2"><span class="json-key">"Name"</span>' in body
+    assert 'data-next-node="11"' in body
+    assert "data-node" not in JsonView(data, id="plain").to_html()
+
+
+def test_json_view_lazy_keys_keep_order():
+    """测试惰性子树中整数形式的键保持原有顺序，与搜索索引的节点编号一致"""
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("需要 node 运行页面脚本")
+    data = {"outer": {"b": 1, "10": {"2": "x", "a": "y"}, "2": 3}}
+    html = JsonView(data, id="ordered", lazy=True, default_expand_level=0, searchable=True).to_html()
+    index = json.loads(re.search(r'id="ordered-index">(.*?)</script>', html).group(1))
+    assert index["keys"][2:7] == ["b", "10", "2", "a", "2"]
+
+    # 用页面脚本中的解析函数取出惰性子树的条目
+    runtime = Page._additional_head_content
+    helpers = runtime[runtime.index("const objectKey") : runtime.index("function getLazy")]
+    script = helpers + (
+        "const value = parseOrdered(require('fs').readFileSync(0, 'utf8'));"
+        "const entries = objectEntries(value);"
+        "console.log(JSON.stringify([entries.map(e => e[0]), objectEntries(entries[1][1]).map(e => e[0])]));"
+    )
+    payload = re.search(r'data-json-lazy="ordered">(.*?)</script>', html, re.S).group(1)
+    result = subprocess.run(
+        [node, "-e", script], input=payload, capture_output=True, text=True, check=True
+    )
+    assert json.loads(result.stdout) == [["b", "10", "2"], ["2", "a"]]
+
+
+def test_json_view_elides_large_values():
+    """测试长字符串截断后可以点击显示全部，长数字数组折叠为预览"""
+    data = {"text": "<" * 1000, "vec": [0.5] * 100, "short": [1, 2, 3]}
+    html = JsonView(data, id="elide", max_string_length=10).to_html()
+    body = _strip_scripts(html)
+    assert '<span class="json-string">"' + "&lt;" * 10 + '…"</span>' in body
+    assert "… 共 1,000 字符（1000 B），点击显示全部" in body
+    assert "[ 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, … 共 100 个数字 ]" in body
+    # 数字数组带有 data-numeric，初始展开时保持折叠
+    assert '<div class="json-collapsed" data-level="1" data-numeric data-lazy="1">' in body
+    assert "data-numeric" not in body.split('"short"')[1]
+    assert '<span class="json-number">3</span>' in body
+    lazy = _lazy_values(html, "elide")
+    assert "<" * 1000 in lazy and [0.5] * 100 in lazy
+    assert 'data-max-string="10"' in html and 'data-max-numbers="32"' in html
+
+    html = JsonView(data, id="full", max_string_length=None, max_numeric_items=None).to_html()
+    assert "json-elided" not in _strip_scripts(html) and "个数字" not in _strip_scripts(html)
@@ -0,0 +1,33 @@
+import pytest
+
+from dataviewer.core.cache import LRUCache
+
+
+def test_lru_cache_hits_and_misses():
+    """测试命中与未命中计数"""
+    cache = LRUCache(maxsize=2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1, "maxsize": 2}
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """测试超出容量时淘汰最久未使用的条目"""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.evictions == 1
+
+    cache.resize(1)
+    assert len(cache) == 1 and "c" in cache
+
+
+def test_lru_cache_invalid_size():
+    """测试非法容量"""
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
@@ -91,3 +91,207 @@ def test_additional_head_content():
 
     html = page.render()
     assert "<style>.custom { color: red; }</style>" in html
+
+
+def test_page_write_html_streams(tmp_path):
+    """测试页面流式写出与 render 结果一致"""
+    import io
+
+    page = Page("测试页面")
+    page.add(FlexRow(children=[Header(text="标题"), Button(text="按钮")]))
+
+    buffer = io.StringIO()
+    page.write_html(buffer)
+    assert buffer.getvalue() == page.render()
+    assert "标题" in buffer.getvalue()
+
+
+def test_page_save_gzip(tmp_path):
+    """测试页面压缩保存"""
+    import gzip
+
+    output_file = tmp_path / "test.html.gz"
+    page = Page("测试页面")
+    page.add(Header(text="压缩标题"))
+    page.save(str(output_file))
+
+    with gzip.open(output_file, "rt", encoding="utf-8") as f:
+        content = f.read()
+    assert "压缩标题" in content
+    assert content == page.render()
+
+
+def test_page_deduplicates_base64_images():
+    """测试页面中重复的 base64 图片只输出一次"""
+    import base64
+
+    from dataviewer.components import Image, Table
+
+    payload = base64.b64encode(b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 40).decode()
+    page = Page("资源去重")
+    page.add(Table(data=[{"id": i, "image": [payload, payload]} for i in range(5)], id="t"))
+    page.add(Image(src="data:image/png;base64," + payload))
+    html = page.render()
+
+    assert html.count(payload) == 1
+    assert html.count("data-asset=") == 11
+    assert "DataViewerAssets.load" in html
+
+    # 页面之外单独渲染时仍然内联 data URI
+    assert "data:image/png;base64," + payload in Table(data=[{"image": payload}]).to_html()
+
+
+def test_page_assets_with_row_cache_and_workers():
+    """测试行缓存命中和并行渲染时资源仍会输出到页面"""
+    import base64
+
+    from dataviewer.components import Table
+
+    payloads = [
+        base64.b64encode(b"\xff\xd8\xff" + bytes([i]) * 64).decode() for i in range(3)
+    ]
+    data = [{"id": i, "image": payloads[i % 3]} for i in range(60)]
+    for kwargs in ({"row_cache_size": 100}, {"workers": 2, "chunk_size": 20}):
+        page = Page("资源")
+        page.add(Table(data=data, id="t", **kwargs))
+        for _ in range(2):
+            html = page.render()
+            assert all(html.count(payload) == 1 for payload in payloads)
+
+
+def test_page_assets_with_cached_virtual_rows():
+    """测试虚拟滚动模式下行缓存和渲染缓存命中时资源仍会输出到页面"""
+    import base64
+
+    from dataviewer.components import Table
+    from dataviewer.core.assets import referenced_assets
+
+    payloads = [
+        base64.b64encode(b"\xff\xd8\xff" + bytes([i]) * 64).decode() for i in range(3)
+    ]
+    data = [{"id": i, "image": payloads[i % 3]} for i in range(6)]
+
+    row_cached = Table(data=data, id="rows", virtual=True, row_cache_size=100)
+    render_cached = Table(data=data, id="whole", virtual=True)
+    render_cached.render_cache = True
+    for table in (row_cached, render_cached):
+        page = Page("资源")
+        page.add(table)
+        for _ in range(2):
+            html = page.render()
+            assert len(set(referenced_assets(html))) == 3
+            assert all(html.count(payload) == 1 for payload in payloads)
+
+
+def test_page_streams_assets_between_rows(monkeypatch):
+    """测试图片资源在行之间分段输出，已输出的内容不再保留在资源表中"""
+    import base64
+    import io
+    import json
+    import re
+
+    from dataviewer.components import Table
+    from dataviewer.core.assets import AssetStore
+
+    monkeypatch.setattr(AssetStore, "flush_size", 1)
+    payloads = [
+        base64.b64encode(b"\xff\xd8\xff" + bytes([i]) * 64).decode() for i in range(10)
+    ]
+    for kwargs in ({}, {"virtual": True}, {"row_cache_size": 100}):
+        page = Page("流式资源")
+        rows = ({"id": i, "image": payloads[i % 10]} for i in range(30))
+        data = rows if not kwargs else list(rows)
+        page.add(Table(data=data, id="t", chunk_size=1, **kwargs))
+        for _ in range(2 if "row_cache_size" in kwargs else 1):
+            store = AssetStore()
+            buffer = io.StringIO()
+            page.write_html(buffer, store)
+            html = buffer.getvalue()
+
+            assert len(store) == 10 and store.entries() == []
+            assert html.count('class="dataviewer-assets"') == 10
+            assert html.count("window.DataViewerAssets = ") == 1
+            assert all(html.count(payload) == 1 for payload in payloads)
+            if kwargs.get("virtual"):
+                parts = re.findall(
+                    r'<script type="application/json" (?:id="t-data"|data-rows="t")>(.*?)</script>',
+                    html,
+                )
+                assert len(parts) == 11
+                assert len(json.loads(parts[0])["rows"]) + sum(
+                    len(json.loads(part)) for part in parts[1:]
+                ) == 30
+
+
+def test_page_assets_with_concurrent_pages():
+    """测试多个线程同时渲染页面时，各页面的图片资源互不串用"""
+    import base64
+    import json
+    import re
+    import sys
+    import threading
+
+    from dataviewer.components import Table
+    from dataviewer.core.assets import referenced_assets
+
+    barrier = threading.Barrier(4)
+    results = {}
+
+    def render(n):
+        payloads = [
+            base64.b64encode(b"\xff\xd8\xff" + bytes([n, i % 256, i // 256]) * 32).decode()
+            for i in range(200)
+        ]
+        page = Page(f"页面{n}")
+        page.add(Table(data=[{"id": i, "image": p} for i, p in enumerate(payloads)], id="t"))
+        barrier.wait()
+        results[n] = (payloads, page.render())
+
+    # 频繁切换线程，让各页面的渲染过程交错
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=render, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    for payloads, html in results.values():
+        embedded = {}
+        for chunk in re.findall(r'class="dataviewer-assets">(.*?)</script>', html):
+            embedded.update(json.loads(chunk))
+        assert set(referenced_assets(html)) == set(embedded)
+        assert sorted(payload for _, payload in embedded.values()) == sorted(payloads)
+
+
+def test_page_save_assets_dir(tmp_path):
+    """测试 assets_dir 模式：图片写入按内容哈希命名的文件，已存在的文件不重复写入"""
+    import base64
+
+    from dataviewer.components import Image, Table
+    from dataviewer.core.assets import asset_key
+
+    payload = base64.b64encode(b"\x89PNG\r\n\x1a\n" + bytes(512)).decode()
+    assets_dir = tmp_path / "assets"
+    page = Page("外部资源")
+    page.add(Table(data=[{"id": i, "image": payload} for i in range(4)], id="t"))
+    page.add(Image(src="data:image/png;base64," + payload))
+
+    filename = tmp_path / "reports" / "page.html"
+    filename.parent.mkdir()
+    page.save(str(filename), assets_dir=str(assets_dir))
+
+    asset_file = assets_dir / (asset_key(payload) + ".png")
+    assert asset_file.read_bytes() == base64.b64decode(payload)
+    content = filename.read_text(encoding="utf-8")
+    assert payload not in content
+    assert content.count('src="../assets/%s"' % asset_file.name) == 5
+
+    mtime = asset_file.stat().st_mtime_ns
+    os.utime(asset_file, ns=(mtime - 10**9, mtime - 10**9))
+    page.save(str(filename), assets_dir=str(assets_dir))
+    assert asset_file.stat().st_mtime_ns == mtime - 10**9
+    assert list(assets_dir.iterdir()) == [asset_file]
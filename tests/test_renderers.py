@@ -0,0 +1,351 @@
+import base64
+import json
+import os
+import re
+
+import pytest
+
+from dataviewer.renderers import (CellImageRenderer, CellRendererRegistry,
+                                  CellVideoRenderer, DefaultRenderer)
+from dataviewer.renderers.media_sniff import PROBE_SIZE, sniff_base64_image
+
+
+@pytest.fixture
+def registry():
+    """使用默认渲染器的干净注册表，测试结束后恢复原状"""
+    saved = CellRendererRegistry.get_renderers()
+    CellRendererRegistry.clear()
+    CellRendererRegistry.register(CellImageRenderer())
+    CellRendererRegistry.register(DefaultRenderer())
+    CellRendererRegistry.register(CellVideoRenderer())
+    yield CellRendererRegistry
+    CellRendererRegistry.clear()
+    for renderer in saved:
+        CellRendererRegistry.register(renderer)
+
+
+def test_registry_type_dispatch(registry):
+    """测试非字符串值只经过接受该类型的渲染器"""
+    assert isinstance(registry.get_renderer(42), DefaultRenderer)
+    assert isinstance(registry.get_renderer(None), DefaultRenderer)
+    assert registry._get_candidates(int) == [
+        r for r in registry.get_renderers() if isinstance(r, DefaultRenderer)
+    ]
+    assert isinstance(registry.get_renderer(["a.png", "b.jpg"]), CellImageRenderer)
+    assert isinstance(registry.get_renderer(["a.png", "b.txt"]), DefaultRenderer)
+
+
+def test_registry_merged_matcher_priority(registry):
+    """测试合并后的正则仍按渲染器优先级选择"""
+    assert isinstance(registry.get_renderer("clip.mp4"), CellVideoRenderer)
+    assert isinstance(registry.get_renderer("photo.png"), CellImageRenderer)
+    assert isinstance(registry.get_renderer("img://cat"), CellImageRenderer)
+    assert isinstance(registry.get_renderer("/9j/4AAQSkZJRg"), CellImageRenderer)
+    assert isinstance(registry.get_renderer("plain text"), DefaultRenderer)
+
+    for value in ["clip.mp4", "photo.png", "plain text", "a.png.mp4", "x.mp4.png"]:
+        expected = next(r for r in registry.get_renderers() if r.can_render(value))
+        assert registry.get_renderer(value) is expected
+
+
+def test_registry_respects_overridden_can_render(registry, tmp_path):
+    """测试子类只重写 can_render 时，字符串仍由其 can_render 判断"""
+
+    class ExistingImageRenderer(CellImageRenderer):
+        def can_render(self, value):
+            return super().can_render(value) and os.path.exists(value)
+
+    image = next(r for r in registry.get_renderers() if type(r) is CellImageRenderer)
+    registry.unregister(image)
+    existing = ExistingImageRenderer()
+    registry.register(existing)
+
+    path = tmp_path / "photo.png"
+    path.write_bytes(b"")
+    assert not existing.can_render("missing.png")
+    assert isinstance(registry.get_renderer("missing.png"), DefaultRenderer)
+    assert registry.get_renderer(str(path)) is existing
+    # 未重写 can_render 的渲染器仍然合并进同一个正则
+    assert isinstance(registry.get_renderer("clip.mp4"), CellVideoRenderer)
+    assert len(registry._pattern_renderers) == 1
+
+
+def test_registry_cache_invalidation(registry):
+    """测试注册、注销渲染器后缓存失效"""
+    assert isinstance(registry.get_renderer("clip.mp4"), CellVideoRenderer)
+    video = next(r for r in registry.get_renderers() if isinstance(r, CellVideoRenderer))
+
+    registry.unregister(video)
+    assert isinstance(registry.get_renderer("clip.mp4"), DefaultRenderer)
+
+    registry.register(video)
+    assert registry.get_renderer("clip.mp4") is video
+
+
+def test_base64_image_sniffing():
+    """测试按魔数识别 base64 图片并生成对应的 data URI"""
+    payloads = {
+        "jpeg": b"\xff\xd8\xff\xe0" + b"\x00" * 16,
+        "png": b"\x89PNG\r\n\x1a\n" + b"\x00" * 16,
+        "gif": b"GIF89a" + b"\x00" * 16,
+        "webp": b"RIFF\x24\x00\x00\x00WEBPVP8 " + b"\x00" * 16,
+    }
+    renderer = CellImageRenderer()
+    for subtype, payload in payloads.items():
+        encoded = base64.b64encode(payload).decode()
+        assert sniff_base64_image(encoded) == subtype
+        assert renderer.can_render(encoded)
+        assert f"data:image/{subtype};base64," in renderer.render(encoded)
+
+    assert sniff_base64_image(base64.b64encode(b"hello world").decode()) is None
+
+
+def test_media_detection_on_huge_strings(registry, monkeypatch):
+    """测试超长字符串的媒体检测只检查有界的首尾片段"""
+    size = 10 * 1024 * 1024
+    huge_text = "x" * size
+    huge_path = "a" * size + ".png"
+    huge_base64 = "iVBORw0KGgo" + "A" * size
+
+    assert isinstance(registry.get_renderer(huge_text), DefaultRenderer)
+    assert isinstance(registry.get_renderer(huge_path), CellImageRenderer)
+    assert isinstance(registry.get_renderer(huge_base64), CellImageRenderer)
+    image, video = CellImageRenderer(), CellVideoRenderer()
+    assert not video.can_render(huge_text)
+
+    class RecordingPattern:
+        def __init__(self, regex):
+            self.regex = regex
+            self.pattern = regex.pattern
+
+        def match(self, value):
+            probed.append(len(value))
+            return self.regex.match(value)
+
+    probed = []
+    registry.get_renderer("warm up")
+    for name in ("_head_matcher", "_tail_matcher"):
+        regex, groups = getattr(registry, name)
+        monkeypatch.setattr(registry, name, (RecordingPattern(regex), groups))
+    image.patterns = [RecordingPattern(p) for p in image.patterns]
+    image.base64_patterns = [RecordingPattern(p) for p in image.base64_patterns]
+    registry.get_renderer(huge_text)
+    image.can_render(huge_text)
+    # 正则只作用于有界的首尾片段，而不是整个 10MB 字符串
+    assert probed and max(probed) <= PROBE_SIZE
+
+
+def test_media_detection_on_long_multiline_text(registry):
+    """测试多行长文本即使最后一行以图片扩展名结尾，也不会被当作图片"""
+    # 首行和末行都比探测片段长，换行只在中间
+    log = "started " + "." * 300 + "\nsaved to " + "d/" * 150 + "out.png"
+    assert len(log) > 2 * PROBE_SIZE and "\n" not in log[:PROBE_SIZE] + log[-PROBE_SIZE:]
+    pattern = re.compile(r".*\.(?:png|jpg|jpeg|gif|webp|svg)$")
+    assert pattern.match(log) is None
+    assert isinstance(registry.get_renderer(log), DefaultRenderer)
+    assert not CellImageRenderer().can_render(log)
+    assert not CellVideoRenderer().can_render(log[:-4] + ".mp4")
+
+    # 只有结尾的换行时与整串匹配一致，仍然识别为图片
+    single_line = "a" * 1000 + ".png\n"
+    assert pattern.match(single_line) is not None
+    assert isinstance(registry.get_renderer(single_line), CellImageRenderer)
+    # 以 ^ 开头的模式只看开头
+    assert isinstance(registry.get_renderer("img://" + "x\n" * 1000), CellImageRenderer)
+
+
+def test_registry_render_many_preserves_order(registry):
+    """测试批量渲染按输入顺序返回，并与逐个渲染结果一致"""
+    values = ["a.png", "<b>", 3, None, True, "clip.mp4", ["x.png", "y.jpg"], {"k": "<v>"}, "a\x00b"]
+    assert registry.render_many(values) == [registry.render(v) for v in values]
+    assert registry.render_many([]) == []
+
+
+def test_renderers_render_batch():
+    """测试各渲染器的批量接口与单个渲染一致"""
+    for renderer, values in [
+        (DefaultRenderer(), ["<a>", "&", None, False, 1.5, [1, "<"]]),
+        (CellImageRenderer(), ["a.png", "a.png", ["b.gif", "/9j/4AAQ"]]),
+        (CellVideoRenderer(), ["a.mp4", "b.webm"]),
+    ]:
+        assert renderer.render_batch(values) == [renderer.render(v) for v in values]
+
+
+def test_image_renderer_thumbnails(tmp_path):
+    """测试本地图片生成缩略图并按 路径+mtime+大小 缓存"""
+    PIL = pytest.importorskip("PIL.Image")
+    from dataviewer.renderers.thumbnails import ThumbnailCache
+
+    source = tmp_path / "big.jpg"
+    PIL.new("RGB", (1600, 1200), (200, 10, 10)).save(source)
+    thumbs_dir = tmp_path / "thumbs"
+
+    renderer = CellImageRenderer(
+        thumbnails=ThumbnailCache(str(thumbs_dir), size=(100, 100), workers=2)
+    )
+    html = renderer.render_batch([str(source), [str(source), "remote://x.png"]])
+    thumb_files = list(thumbs_dir.iterdir())
+    assert len(thumb_files) == 1
+    with PIL.open(thumb_files[0]) as thumb:
+        assert max(thumb.size) == 100
+    assert f'data-full="{source}"' in html[0]
+    assert thumb_files[0].name in html[0] and thumb_files[0].name in html[1]
+    assert 'src="remote://x.png"' in html[1]
+
+    # 新实例直接复用磁盘缓存；源文件变化后生成新的缩略图
+    mtime = thumb_files[0].stat().st_mtime_ns
+    ThumbnailCache(str(thumbs_dir), size=(100, 100)).thumbnail(str(source))
+    assert thumb_files[0].stat().st_mtime_ns == mtime
+    os.utime(source, ns=(1, 1))
+    assert ThumbnailCache(str(thumbs_dir), size=(100, 100)).thumbnail(str(source))
+    assert len(list(thumbs_dir.iterdir())) == 2
+
+    # EXIF 方向为 6 的原图：缩略图按浏览器显示的方向旋转
+    exif = PIL.Exif()
+    exif[0x0112] = 6
+    rotated = tmp_path / "rotated.jpg"
+    PIL.new("RGB", (400, 200)).save(rotated, exif=exif)
+    src = ThumbnailCache(str(thumbs_dir), size=(100, 100)).thumbnail(str(rotated))
+    with PIL.open(thumbs_dir / os.path.basename(src)) as thumb:
+        assert thumb.size == (50, 100)
+
+
+def test_image_probe_reads_headers_only(tmp_path):
+    """测试只解析文件头即可得到各格式图片的尺寸"""
+    PIL = pytest.importorskip("PIL.Image")
+    import io
+
+    from dataviewer.renderers.image_probe import (image_size_from_base64,
+                                                  image_size_from_file,
+                                                  parse_image_size)
+
+    cases = [("PNG", {}), ("GIF", {}), ("JPEG", {}), ("JPEG", {"progressive": True})]
+    if "WEBP" in PIL.registered_extensions().values():
+        cases += [("WEBP", {}), ("WEBP", {"lossless": True})]
+    for fmt, options in cases:
+        buffer = io.BytesIO()
+        PIL.new("RGB", (321, 123)).save(buffer, format=fmt, **options)
+        data = buffer.getvalue()
+        path = tmp_path / f"image.{fmt.lower()}"
+        path.write_bytes(data)
+        assert image_size_from_file(str(path)) == (321, 123), fmt
+        assert image_size_from_base64(base64.b64encode(data).decode()) == (321, 123), fmt
+        # 只需要文件头，截断后的数据同样可以解析
+        assert parse_image_size(data[:1024]) == (321, 123), fmt
+
+    # 帧头位于大段元数据之后的 JPEG
+    buffer = io.BytesIO()
+    PIL.new("RGB", (40, 30)).save(buffer, format="JPEG")
+    data = buffer.getvalue()
+    app = b"\xff\xe1" + (65535).to_bytes(2, "big") + bytes(65533)
+    big = tmp_path / "exif.jpg"
+    big.write_bytes(data[:2] + app * 3 + data[2:])
+    assert image_size_from_file(str(big)) == (40, 30)
+
+    # EXIF 方向为 5-8 时浏览器会旋转显示，宽高互换
+    exif = PIL.Exif()
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    PIL.new("RGB", (400, 200)).save(buffer, format="JPEG", exif=exif)
+    rotated = tmp_path / "rotated.jpg"
+    rotated.write_bytes(buffer.getvalue())
+    assert image_size_from_file(str(rotated)) == (200, 400)
+    assert image_size_from_base64(base64.b64encode(buffer.getvalue()).decode()) == (200, 400)
+
+    # 长度和前 4KB 都相同、帧头在元数据之后的两张图片各自得到正确的尺寸
+    payloads = []
+    for size in ((40, 30), (30, 40)):
+        buffer = io.BytesIO()
+        PIL.new("RGB", size).save(buffer, format="JPEG")
+        payloads.append(buffer.getvalue())
+    padded = max(len(data) for data in payloads)
+    app = b"\xff\xe1" + (8192).to_bytes(2, "big") + bytes(8190)
+    payloads = [
+        base64.b64encode(data[:2] + app + data[2:] + bytes(padded - len(data))).decode()
+        for data in payloads
+    ]
+    assert len(payloads[0]) == len(payloads[1]) and payloads[0][:4096] == payloads[1][:4096]
+    assert [image_size_from_base64(payload) for payload in payloads] == [(40, 30), (30, 40)]
+
+    assert image_size_from_file(str(tmp_path / "missing.png")) is None
+    (tmp_path / "fake.png").write_bytes(b"fake image data")
+    assert image_size_from_file(str(tmp_path / "fake.png")) is None
+
+
+def test_image_renderer_emits_intrinsic_size(tmp_path):
+    """测试图片单元格输出固有尺寸，避免布局抖动"""
+    PIL = pytest.importorskip("PIL.Image")
+    import io
+
+    path = tmp_path / "photo.png"
+    PIL.new("RGB", (640, 480)).save(path)
+    buffer = io.BytesIO()
+    PIL.new("RGB", (20, 10)).save(buffer, format="GIF")
+    payload = base64.b64encode(buffer.getvalue()).decode()
+
+    html = CellImageRenderer().render_batch([str(path), payload, "missing.png"])
+    assert 'width="640" height="480"' in html[0]
+    assert "aspect-ratio: auto 640 / 480;" in html[0]
+    assert 'width="20" height="10"' in html[1]
+    assert "aspect-ratio" not in html[2]
+    assert "aspect-ratio" not in CellImageRenderer(probe_size=False).render(str(path))
+
+
+def test_render_json_html_elides_large_values(registry):
+    """测试 JSON 渲染截断长字符串、折叠长数字数组，并把 base64 图片显示为图片"""
+    from dataviewer.core.assets import AssetStore
+    from dataviewer.renderers.json_elision import render_json_html
+
+    image = base64.b64encode(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64).decode()
+    value = {"text": "<" * 1000, "vec": list(range(100)), "img": image, "short": "<b>"}
+    html = render_json_html(value, max_string_length=10, max_numeric_items=32)
+    assert '"&lt;&lt;&lt;&lt;&lt;&lt;&lt;&lt;&lt;&lt;…"' in html
+    assert "… 共 1,000 字符（1000 B）</span>" in html
+    assert "[0, 1, 2, 3, 4, 5, 6, 7, <span" in html and "… 共 100 个数字" in html
+    assert "<img" in html and "data:image/png;base64," in html
+    assert '"&lt;b&gt;"' in html
+    assert render_json_html([1, "a"], indent=None) == '[1, "a"]'
+    assert "<" * 20 in render_json_html("<" * 20, max_string_length=None).replace("&lt;", "<")
+
+    # 与占位符相同的用户数据原样输出
+    assert render_json_html(["\ue0000\ue000", "x" * 20], max_string_length=10).startswith(
+        '[\n    "\ue0000\ue000",\n    <span>"xxxxxxxxxx…"'
+    )
+
+    # 页面中完整内容作为文本资源登记，只编码一次，相同内容只输出一次，点击标记时才解析
+    import html as html_module
+    import io
+
+    text = 'say "hi" \\ <b>' * 1000
+    value = {"a": text, "b": text, "vec": list(range(1000))}
+    with AssetStore.collect() as store:
+        html = render_json_html(value)
+    buffer = io.StringIO()
+    store.write_html(buffer)
+    page = html + buffer.getvalue()
+    assert len(store) == 2 and "<script" not in html
+    assert html.count('onclick="DataViewerText.expand(this)"') == 3
+    scripts = dict(re.findall(r'<script type="application/json" id="dv-text-([0-9a-f]{32})">(.*?)</script>', page))
+    assert sorted(json.loads(script) for script in scripts.values() if script.startswith('"')) == [text]
+    assert [json.loads(script) for script in scripts.values() if script.startswith("[")] == [list(range(1000))]
+    assert page.count("window.DataViewerText = ") == 1 and "DataViewerAssets" not in page
+    # 完整内容只编码一次：截断后的单元格加上文本资源，比直接输出整个 JSON 小
+    plain = html_module.escape(json.dumps(value, indent=4, ensure_ascii=False), quote=False)
+    assert len(html) < len(plain) / 10 and len(page) < len(plain) * 0.6
+
+    # 页面之外没有资源表，标记只是文字
+    assert "<script" not in render_json_html({"text": "x" * 1000})
+
+
+def test_render_json_html_elided_content_in_assets_dir(registry, tmp_path):
+    """测试 assets_dir 模式下截断标记链接到写入目录的完整内容"""
+    from dataviewer.core.assets import AssetStore
+    from dataviewer.renderers.json_elision import render_json_html
+
+    with AssetStore.collect(AssetStore(str(tmp_path), "assets")) as store:
+        html = render_json_html({"text": "x" * 1000})
+    assert '<a class="json-elided"' in html and store.files_written == 1
+    assert "<script" not in html
+    (path,) = tmp_path.iterdir()
+    assert path.read_bytes() == b"x" * 1000
+    assert f'href="assets/{path.name}"' in html